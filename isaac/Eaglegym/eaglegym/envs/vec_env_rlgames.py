@@ -28,6 +28,8 @@
 
 
 from omni.isaac.gym.vec_env import VecEnvBase
+from eaglegym.utils.profiling.step_profiler import StepProfiler
+from eaglegym.utils.rollouts.rollout_recorder import RolloutRecorder
 
 import torch
 import numpy as np
@@ -38,6 +40,10 @@ from datetime import datetime
 # VecEnv Wrapper for RL training
 class VecEnvRLGames(VecEnvBase):
 
+    # Set by enable_profiling and enable_recording, step only checks them for None when they are off
+    profiler = None
+    recorder = None
+
     def _process_data(self):
         self._obs = torch.clamp(self._obs, -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device).clone()
         self._rew = self._rew.to(self._task.rl_device).clone()
@@ -53,26 +59,63 @@ class VecEnvRLGames(VecEnvBase):
         self.num_states = self._task.num_states
         self.state_space = self._task.state_space
 
+    def enable_profiling(self, window=100, use_cuda_events=None):
+        """ Times every phase of step over windows of `window` steps, see StepProfiler. Call after the task is set.
+            RLGPUAlgoObserver logs the report to TensorBoard under profile/.
+        """
+        self.profiler = StepProfiler(self.num_envs, window, self._task.device, use_cuda_events)
+        return self.profiler
+
+    def enable_recording(self, directory, env_ids, shard_steps=10000, flush_steps=64):
+        """ Records obs, actions, rewards and dones of env_ids to directory, see RolloutRecorder. Call after the task is set.
+        """
+        self.recorder = RolloutRecorder(directory, env_ids, self._task.rl_device, shard_steps, flush_steps)
+        return self.recorder
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        super().close()
+
     def step(self, actions):
+        profiler = self.profiler
+        if profiler:
+            profiler.begin()
+        # Observations the actions were computed from, _process_data replaces rather than overwrites them
+        policy_obs = self._obs if self.recorder else None
+        policy_actions = actions
+
         if self._task.randomize_actions:
             actions = self._task._dr_randomizer.apply_actions_randomization(actions=actions, reset_buf=self._task.reset_buf)
 
         actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device).clone()
+        if profiler:
+            profiler.mark("actions")
 
         self._task.pre_physics_step(actions)
+        if profiler:
+            profiler.mark("pre_physics_step")
         
         for _ in range(self._task.control_frequency_inv):
             self._world.step(render=self._render)
             self.sim_frame_count += 1
 
+        # post_physics_step marks physics, get_observations, calculate_metrics and is_done
         self._obs, self._rew, self._resets, self._extras = self._task.post_physics_step()
 
         if self._task.randomize_observations:
             self._obs = self._task._dr_randomizer.apply_observations_randomization(
                 observations=self._obs.to(device=self._task.rl_device), reset_buf=self._task.reset_buf)
+            if profiler:
+                profiler.mark("observation_dr")
 
         self._states = self._task.get_states()
         self._process_data()
+        if profiler:
+            profiler.mark("process_data")
+            profiler.end()
+        if policy_obs is not None:
+            self.recorder.record(policy_obs, policy_actions, self._rew, self._resets)
         
         obs_dict = {"obs": self._obs, "states": self._states}
 
@@ -84,6 +127,8 @@ class VecEnvRLGames(VecEnvBase):
         print(f"[{now}] Running RL reset")
 
         self._task.reset()
+        # No observations to record the first step from
+        self._obs = None
         actions = torch.zeros((self.num_envs, self._task.num_actions), device=self._task.rl_device)
         obs_dict, _, _, _ = self.step(actions)
 
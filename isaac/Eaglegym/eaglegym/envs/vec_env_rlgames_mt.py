@@ -31,6 +31,7 @@ from omni.isaac.gym.vec_env import VecEnvMT
 from omni.isaac.gym.vec_env import TaskStopException
 
 from .vec_env_rlgames import VecEnvRLGames
+from eaglegym.utils.rlgames.handoff import PingPongBuffers
 
 import torch
 import numpy as np
@@ -39,29 +40,58 @@ import numpy as np
 # VecEnv Wrapper for RL training
 class VecEnvRLGamesMT(VecEnvRLGames, VecEnvMT):
 
+    # Created on the first step, once the rl_device and the buffer shapes are known
+    _handoff = None
+
     def _parse_data(self, data):
-        self._obs = data["obs"].clone()
-        self._rew = data["rew"].to(self._task.rl_device).clone()
-        self._states = torch.clamp(data["states"], -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device).clone()
-        self._resets = data["reset"].to(self._task.rl_device).clone()
-        self._extras = data["extras"].copy()
+        if self._handoff is None:
+            self._handoff = PingPongBuffers(self._task.rl_device, self._task.clip_obs)
+        slot = self._handoff.receive(data)
+        self._obs = slot["obs"]
+        self._rew = slot["rew"]
+        self._states = slot["states"]
+        self._resets = slot["reset"]
+        self._extras = slot["extras"]
 
     def step(self, actions):
         if self._stop:
             raise TaskStopException()
 
+        # The sim thread runs while this thread waits in get_data, so its marks from
+        # post_physics_step land in order between ours. physics also covers the handoff
+        # and pre_physics_step there, both run inside the VecEnvMT sim loop.
+        profiler = self.profiler
+        if profiler:
+            profiler.begin()
+        # The previous ping-pong slot stays untouched until the step after this one
+        policy_obs = self._obs if self.recorder else None
+        policy_actions = actions
+
         if self._task.randomize_actions:
             actions = self._task._dr_randomizer.apply_actions_randomization(actions=actions, reset_buf=self._task.reset_buf)
 
-        actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device).clone()
+        # clamp already returns a new tensor, no clone needed before handing it to the sim thread
+        actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device)
+        if profiler:
+            profiler.mark("actions")
 
         self.send_actions(actions)
         data = self.get_data()
+        if profiler:
+            profiler.mark("data_handoff")
 
         if self._task.randomize_observations:
-            self._obs = self._task._dr_randomizer.apply_observations_randomization(observations=self._obs.to(self._task.rl_device), reset_buf=self._task.reset_buf)
+            # In place on the ping-pong slot, which is already on rl_device
+            self._task._dr_randomizer.apply_observations_randomization(observations=self._obs, reset_buf=self._task.reset_buf)
+            if profiler:
+                profiler.mark("observation_dr")
         
-        self._obs = torch.clamp(self._obs, -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device)
+        self._obs.clamp_(-self._task.clip_obs, self._task.clip_obs)
+        if profiler:
+            profiler.mark("process_data")
+            profiler.end()
+        if policy_obs is not None:
+            self.recorder.record(policy_obs, policy_actions, self._rew, self._resets)
         
         obs_dict = {}
         obs_dict["obs"] = self._obs
@@ -0,0 +1,150 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+from eaglegym.utils.profiling.step_profiler import StepProfiler
+from eaglegym.utils.rollouts.rollout_recorder import RolloutRecorder
+
+import random
+import torch
+import numpy as np
+
+from datetime import datetime
+
+
+def set_seed(seed, torch_deterministic=False):
+    """ Same as omni.isaac.core.utils.torch.maths.set_seed, which can't be imported without Isaac Sim. """
+    if seed == -1 and torch_deterministic:
+        seed = 42
+    elif seed == -1:
+        seed = np.random.randint(0, 10000)
+    print(f"Setting seed: {seed}")
+
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    torch.cuda.manual_seed_all(seed)
+    if torch_deterministic:
+        torch.backends.cudnn.benchmark = False
+        torch.backends.cudnn.deterministic = True
+        torch.use_deterministic_algorithms(True)
+    return seed
+
+
+# VecEnv Wrapper for RL training on TorchTasks, the same interface as VecEnvRLGames without Isaac Sim
+class VecEnvTorch:
+
+    profiler = None
+    recorder = None
+
+    def __init__(self, headless=True, sim_device=0, enable_livestream=False, enable_viewport=False):
+        # Same arguments as VecEnvRLGames so the train scripts can swap them, there is nothing to render
+        self._render = False
+        self.sim_frame_count = 0
+        self._task = None
+        self._obs = None
+
+    def set_task(self, task, backend="torch", sim_params=None, init_sim=True) -> None:
+        self._task = task
+        self._num_envs = task.num_envs
+        self.observation_space = task.observation_space
+        self.action_space = task.action_space
+        self.num_states = task.num_states
+        self.state_space = task.state_space
+        task.post_reset()
+
+    @property
+    def num_envs(self):
+        return self._num_envs
+
+    def get_number_of_agents(self):
+        return self._task.num_agents
+
+    def enable_profiling(self, window=100, use_cuda_events=None):
+        """ See VecEnvRLGames.enable_profiling. """
+        self.profiler = StepProfiler(self.num_envs, window, self._task.device, use_cuda_events)
+        return self.profiler
+
+    def enable_recording(self, directory, env_ids, shard_steps=10000, flush_steps=64):
+        """ See VecEnvRLGames.enable_recording. """
+        self.recorder = RolloutRecorder(directory, env_ids, self._task.rl_device, shard_steps, flush_steps)
+        return self.recorder
+
+    def step(self, actions):
+        profiler = self.profiler
+        if profiler:
+            profiler.begin()
+        policy_obs = self._obs if self.recorder else None
+        policy_actions = actions
+
+        actions = torch.clamp(actions, -self._task.clip_actions, self._task.clip_actions).to(self._task.device)
+        if profiler:
+            profiler.mark("actions")
+
+        self._task.pre_physics_step(actions)
+        if profiler:
+            profiler.mark("pre_physics_step")
+
+        for _ in range(self._task.control_frequency_inv):
+            self._task.physics_step(self._task.sim_dt)
+            self.sim_frame_count += 1
+
+        obs, rew, resets, extras = self._task.post_physics_step()
+
+        # The task overwrites its buffers next step, hand rl_games copies like VecEnvRLGames does
+        self._obs = torch.clamp(obs, -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device).clone()
+        self._rew = rew.to(self._task.rl_device).clone()
+        self._states = torch.clamp(self._task.get_states(), -self._task.clip_obs, self._task.clip_obs).to(self._task.rl_device).clone()
+        self._resets = resets.to(self._task.rl_device).clone()
+        self._extras = extras.copy()
+        if profiler:
+            profiler.mark("process_data")
+            profiler.end()
+        if policy_obs is not None:
+            self.recorder.record(policy_obs, policy_actions, self._rew, self._resets)
+
+        obs_dict = {"obs": self._obs, "states": self._states}
+
+        return obs_dict, self._rew, self._resets, self._extras
+
+    def reset(self):
+        """ Resets the task and applies default zero actions to recompute observations and states. """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{now}] Running RL reset")
+
+        self._task.reset()
+        self._obs = None
+        actions = torch.zeros((self.num_envs, self._task.num_actions), device=self._task.rl_device)
+        obs_dict, _, _, _ = self.step(actions)
+
+        return obs_dict
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
@@ -3,8 +3,8 @@ from typing import Optional
 
 from omni.isaac.core.articulations import ArticulationView
 from omni.isaac.core.prims import RigidPrimView
+from eaglegym.utils.rotations.rotations import quat_to_tilt
 
-import math
 import torch
 
 class ChargeStationView(ArticulationView):
@@ -44,6 +44,6 @@ class ChargeStationView(ArticulationView):
     def if_balanced(self, device):
         self.base_pose, self.base_orientation = self.chargestation_base.get_world_poses()
         tolerance = 0.03
-        output_roll = torch.tensor([1.0 if math.atan2(2*i[2]*i[0] - 2*i[1]*i[3], 1 - 2*i[2]*i[2] - 2*i[3]*i[3]) <= tolerance else 0.0 for i in self.base_orientation], device=device)
+        output_roll = (quat_to_tilt(self.base_orientation) <= tolerance).float().to(device)
         return output_roll
         
\ No newline at end of file
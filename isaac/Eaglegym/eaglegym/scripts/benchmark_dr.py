@@ -0,0 +1,60 @@
+# Times the observation and action noise of VecEnvRLGames.step with domain randomization on and off.
+# Runs without Isaac Sim, only the DR work is timed, e.g.
+#   python scripts/benchmark_dr.py --num_envs 4096 16384 65536 --num_obs 29 --num_actions 10
+
+import argparse
+import time
+import torch
+
+from eaglegym.utils.domain_randomization.noise_plan import NoisePlan
+
+OBS_PARAMS = {
+    "on_reset": {"operation": "additive", "distribution": "gaussian", "distribution_parameters": [0, 0.001]},
+    "on_interval": {"frequency_interval": 1, "operation": "additive", "distribution": "gaussian", "distribution_parameters": [0, 0.002]},
+}
+ACTION_PARAMS = {
+    "on_reset": {"operation": "additive", "distribution": "gaussian", "distribution_parameters": [0, 0.015]},
+    "on_interval": {"frequency_interval": 1, "operation": "additive", "distribution": "gaussian", "distribution_parameters": [0, 0.05]},
+}
+
+
+def run(num_envs, num_obs, num_actions, steps, device, randomize):
+    obs = torch.zeros((num_envs, num_obs), device=device)
+    actions = torch.zeros((num_envs, num_actions), device=device)
+    reset_buf = torch.zeros(num_envs, dtype=torch.long, device=device)
+    obs_plan = NoisePlan(OBS_PARAMS, num_envs, num_obs, device)
+    action_plan = NoisePlan(ACTION_PARAMS, num_envs, num_actions, device)
+
+    for step in range(steps + 10):
+        if step == 10:
+            if device != "cpu":
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+        # About one env in 500 resets every step, like a 500 step episode
+        torch.bernoulli(torch.full((num_envs,), 1 / 500, device=device), out=reset_buf)
+        if randomize:
+            action_plan.apply(actions, reset_buf)
+            obs_plan.apply(obs, reset_buf)
+    if device != "cpu":
+        torch.cuda.synchronize()
+    return steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_envs", type=int, nargs="+", default=[4096, 16384, 65536])
+    parser.add_argument("--num_obs", type=int, default=29)
+    parser.add_argument("--num_actions", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--device", default="cuda:0" if torch.cuda.is_available() else "cpu")
+    args = parser.parse_args()
+
+    for num_envs in args.num_envs:
+        off = run(num_envs, args.num_obs, args.num_actions, args.steps, args.device, False)
+        on = run(num_envs, args.num_obs, args.num_actions, args.steps, args.device, True)
+        print(f"{num_envs} envs: DR off {off:.0f} steps/s, DR on {on:.0f} steps/s "
+              f"({num_envs * on / 1e6:.1f}M env steps/s with DR)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# Times the sim thread -> PPO thread data handoff of VecEnvRLGamesMT, the old clone per step path against PingPongBuffers.
+# Runs without Isaac Sim, the sim thread only overwrites the task buffers in place, e.g.
+#   python scripts/benchmark_mt_handoff.py --num_envs 4096 16384 --num_obs 13
+
+import argparse
+import queue
+import threading
+import time
+import torch
+
+from eaglegym.utils.rlgames.handoff import PingPongBuffers
+
+CLIP_OBS = 5.0
+
+
+def clone_handoff(data, device):
+    # What VecEnvRLGamesMT._parse_data and step did before
+    obs = data["obs"].clone()
+    rew = data["rew"].to(device).clone()
+    states = torch.clamp(data["states"], -CLIP_OBS, CLIP_OBS).to(device).clone()
+    resets = data["reset"].to(device).clone()
+    extras = data["extras"].copy()
+    obs = torch.clamp(obs, -CLIP_OBS, CLIP_OBS).to(device)
+    return obs, rew, states, resets, extras
+
+
+def ping_pong_handoff(buffers):
+    def handoff(data, device):
+        slot = buffers.receive(data)
+        slot["obs"].clamp_(-CLIP_OBS, CLIP_OBS)
+        return slot["obs"], slot["rew"], slot["states"], slot["reset"], slot["extras"]
+    return handoff
+
+
+def sim_loop(action_queue, data_queue, num_envs, num_obs, num_states, device):
+    data = {
+        "obs": torch.zeros((num_envs, num_obs), device=device),
+        "rew": torch.zeros(num_envs, device=device),
+        "states": torch.zeros((num_envs, num_states), device=device),
+        "reset": torch.zeros(num_envs, dtype=torch.long, device=device),
+        "extras": {},
+    }
+    while True:
+        actions = action_queue.get()
+        action_queue.task_done()
+        if actions is None:
+            break
+        # Stands in for post_physics_step writing the task buffers
+        data["obs"].add_(actions[:, :1])
+        data["rew"].add_(1)
+        data["states"].add_(1)
+        data["reset"].add_(1)
+        data_queue.put(data)
+
+
+def run(handoff, num_envs, num_obs, num_states, steps, device):
+    action_queue, data_queue = queue.Queue(1), queue.Queue(1)
+    sim = threading.Thread(target=sim_loop, args=(action_queue, data_queue, num_envs, num_obs, num_states, device), daemon=True)
+    sim.start()
+
+    actions = torch.zeros((num_envs, 2), device=device)
+    for step in range(steps + 10):
+        if step == 10:
+            if device != "cpu":
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+        action_queue.put(torch.clamp(actions, -1, 1))
+        data = data_queue.get()
+        data_queue.task_done()
+        obs, rew, states, resets, extras = handoff(data, device)
+        # Something on the PPO side reads the observations
+        actions[:, 0] = obs[:, 0]
+    if device != "cpu":
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+
+    action_queue.put(None)
+    sim.join()
+    return steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_envs", type=int, nargs="+", default=[4096, 16384, 65536])
+    parser.add_argument("--num_obs", type=int, default=13)
+    parser.add_argument("--num_states", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--device", default="cuda:0" if torch.cuda.is_available() else "cpu")
+    args = parser.parse_args()
+
+    for num_envs in args.num_envs:
+        clone = run(clone_handoff, num_envs, args.num_obs, args.num_states, args.steps, args.device)
+        buffers = PingPongBuffers(args.device, CLIP_OBS)
+        ping_pong = run(ping_pong_handoff(buffers), num_envs, args.num_obs, args.num_states, args.steps, args.device)
+        print(f"{num_envs} envs: clone {clone:.0f} steps/s, ping-pong {ping_pong:.0f} steps/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# Evaluates rl_games checkpoints over several seeds (and tasks) in parallel worker processes and writes a results table.
+#   python scripts/evaluate_checkpoints.py --checkpoints "runs/Swerve*/nn/*.pth" --seeds 5 --backend torch --workers 8
+#   python scripts/evaluate_checkpoints.py --checkpoints runs/Swerve/nn/Swerve.pth --tasks Swerve SwerveF --backend isaac --workers 2
+# Every checkpoint is played deterministically (policy mean) on a batch of envs per seed. Every env contributes its
+# first --episodes episodes, so short episodes (early deaths) aren't over represented by stopping at a total count.
+# An episode counts as a success once the task's target_dist drops below --success_radius, time to target is
+# measured to the first time. Tasks without a torch backend are skipped with --backend torch, a job that fails
+# still gets a row with its error.
+# Without --tasks a checkpoint runs on the task in the config.yaml rlgames_train.py saved next to it.
+
+import argparse
+import csv
+import datetime
+import glob
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import yaml
+
+from eaglegym.utils.task_util import TORCH_TASKS
+
+CFG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../cfg"))
+FIELDS = ["checkpoint", "task", "seed", "episodes", "success_rate", "mean_reward", "mean_length", "mean_time_to_target", "error"]
+
+
+def run_config(checkpoint):
+    # The config rlgames_train.py dumped into runs/<name>/ when the checkpoint was trained, if it is there
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(checkpoint))), "config.yaml")
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def make_jobs(args):
+    checkpoints = sorted({path for pattern in args.checkpoints for path in glob.glob(pattern)})
+    if len(checkpoints) == 0:
+        raise FileNotFoundError(f"No checkpoints match {args.checkpoints}")
+    jobs = []
+    for checkpoint in checkpoints:
+        tasks = args.tasks
+        if not tasks:
+            config = run_config(checkpoint)
+            if config is None:
+                raise ValueError(f"No config.yaml next to {checkpoint}, pass --tasks")
+            # saved unresolved, task_name is only an interpolation of task.name
+            tasks = [config["task"]["name"]]
+        for task in tasks:
+            if args.backend == "torch" and task not in TORCH_TASKS:
+                print(f"Skipping {checkpoint} on {task}, it has no torch backend (use --backend isaac)")
+                continue
+            for seed in range(args.seed, args.seed + args.seeds):
+                jobs.append({
+                    "checkpoint": os.path.abspath(checkpoint), "task": task, "seed": seed,
+                    "backend": args.backend, "num_envs": args.num_envs, "episodes": args.episodes,
+                    "max_steps": args.max_steps, "success_radius": args.success_radius,
+                    "threads": args.threads, "overrides": args.overrides,
+                })
+    if len(jobs) == 0:
+        raise ValueError(f"Nothing to evaluate on the {args.backend} backend")
+    return jobs
+
+
+def empty_row(job):
+    return {"checkpoint": job["checkpoint"], "task": job["task"], "seed": job["seed"], "episodes": 0,
+            "success_rate": float("nan"), "mean_reward": float("nan"), "mean_length": float("nan"),
+            "mean_time_to_target": float("nan"), "error": ""}
+
+
+def compose_config(job):
+    from hydra import compose, initialize_config_dir
+    # registers the resolvers the configs use
+    import eaglegym.utils.hydra_cfg.hydra_utils
+    from eaglegym.utils.hydra_cfg.reformat import omegaconf_to_dict
+
+    overrides = [
+        f"task={job['task']}", f"backend={job['backend']}", f"seed={job['seed']}",
+        f"task.env.numEnvs={job['num_envs']}", "headless=True", "test=True",
+    ] + job["overrides"]
+    with initialize_config_dir(config_dir=CFG_DIR):
+        cfg = compose(config_name="config", overrides=overrides)
+    return cfg, omegaconf_to_dict(cfg)
+
+
+def load_model(checkpoint, train_params, num_obs, num_actions, num_envs, device):
+    import torch
+    from rl_games.algos_torch.model_builder import ModelBuilder
+    from rl_games.algos_torch.torch_ext import load_checkpoint
+
+    config = train_params["config"]
+    model = ModelBuilder().load(train_params)
+    model = model.build({
+        "actions_num": num_actions,
+        "input_shape": (num_obs,),
+        "num_seqs": num_envs,
+        "value_size": 1,
+        "normalize_value": config.get("normalize_value", False),
+        "normalize_input": config.get("normalize_input", False),
+    })
+    model.load_state_dict(load_checkpoint(checkpoint)["model"])
+    model.to(device)
+    model.eval()
+    return model
+
+
+def evaluate(job):
+    """ Plays one checkpoint on one task and seed, returns a row of the results table. """
+    try:
+        return play(job)
+    except Exception as e:
+        # One broken job shouldn't stop the others, imap_unordered would re-raise it in main
+        row = empty_row(job)
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row
+
+
+def play(job):
+    import torch
+    torch.set_num_threads(job["threads"])
+
+    cfg, cfg_dict = compose_config(job)
+    if job["backend"] == "torch":
+        from eaglegym.envs.vec_env_torch import VecEnvTorch, set_seed
+        from eaglegym.utils.task_util import initialize_torch_task
+        env = VecEnvTorch(headless=True)
+        set_seed(job["seed"], torch_deterministic=cfg.torch_deterministic)
+        task = initialize_torch_task(cfg_dict, env)
+    else:
+        from eaglegym.envs.vec_env_rlgames import VecEnvRLGames
+        env = VecEnvRLGames(headless=True, sim_device=cfg.device_id)
+        from omni.isaac.core.utils.torch.maths import set_seed
+        from eaglegym.utils.task_util import initialize_task
+        set_seed(job["seed"], torch_deterministic=cfg.torch_deterministic)
+        task = initialize_task(cfg_dict, env)
+
+    run = run_config(job["checkpoint"])
+    train_params = run["train"]["params"] if run is not None else cfg_dict["train"]["params"]
+    model = load_model(job["checkpoint"], train_params, task.num_observations, task.num_actions, env.num_envs, task.rl_device)
+
+    num_envs = env.num_envs
+    device = task.rl_device
+    step_dt = task.control_frequency_inv * cfg_dict["task"]["sim"]["dt"]
+    ep_return = torch.zeros(num_envs, device=device)
+    ep_length = torch.zeros(num_envs, device=device)
+    reach_step = torch.full((num_envs,), -1.0, device=device)
+    finished = torch.zeros(num_envs, dtype=torch.long, device=device)
+    returns, lengths, successes, reach_times = [], [], [], []
+
+    obs = env.reset()["obs"]
+    with torch.no_grad():
+        for _ in range(job["max_steps"]):
+            actions = model({"is_train": False, "obs": obs, "prev_actions": None})["mus"]
+            obs_dict, rew, dones, _ = env.step(actions)
+            obs = obs_dict["obs"]
+            ep_return += rew
+            ep_length += 1
+            target_dist = getattr(task, "target_dist", None)
+            if target_dist is not None:
+                reached = (target_dist.to(device) < job["success_radius"]) & (reach_step < 0)
+                reach_step[reached] = ep_length[reached]
+
+            done_ids = dones.nonzero(as_tuple=False).squeeze(-1)
+            if len(done_ids) > 0:
+                # Only the first episodes of every env count, envs that already have theirs keep running unrecorded
+                counted = done_ids[finished[done_ids] < job["episodes"]]
+                returns.append(ep_return[counted].cpu())
+                lengths.append(ep_length[counted].cpu())
+                successes.append((reach_step[counted] >= 0).cpu())
+                reach_times.append(reach_step[counted].cpu() * step_dt)
+                finished[done_ids] += 1
+                ep_return[done_ids] = 0
+                ep_length[done_ids] = 0
+                reach_step[done_ids] = -1
+                if bool((finished >= job["episodes"]).all()):
+                    break
+    env.close()
+
+    row = empty_row(job)
+    if returns:
+        successes = torch.cat(successes)
+        reach_times = torch.cat(reach_times)
+        row["episodes"] = len(successes)
+        row["mean_reward"] = torch.cat(returns).mean().item()
+        row["mean_length"] = torch.cat(lengths).mean().item() * step_dt
+        if getattr(task, "target_dist", None) is not None:
+            row["success_rate"] = successes.float().mean().item()
+            if successes.any():
+                row["mean_time_to_target"] = reach_times[successes].mean().item()
+    return row
+
+
+def summarize(rows):
+    # Mean and std over seeds for every checkpoint and task
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["checkpoint"], row["task"]), []).append(row)
+    print(f"{'checkpoint':60s} {'task':10s} {'success':>14s} {'reward':>18s} {'length [s]':>14s} {'to target [s]':>14s}")
+    for (checkpoint, task), group in sorted(groups.items()):
+        def stat(key):
+            values = np.array([row[key] for row in group], dtype=np.float64)
+            return f"{np.nanmean(values):.2f}+-{np.nanstd(values):.2f}" if not np.all(np.isnan(values)) else "nan"
+        name = os.path.relpath(checkpoint)
+        print(f"{name[-60:]:60s} {task:10s} {stat('success_rate'):>14s} {stat('mean_reward'):>18s} "
+              f"{stat('mean_length'):>14s} {stat('mean_time_to_target'):>14s}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checkpoints", nargs="+", default=["runs/*/nn/*.pth"], help="checkpoint paths or glob patterns")
+    parser.add_argument("--tasks", nargs="*", default=[], help="task configs to evaluate on, defaults to the task each checkpoint was trained on")
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds per checkpoint and task")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--backend", choices=["torch", "isaac"], default="torch")
+    parser.add_argument("--num_envs", type=int, default=512)
+    parser.add_argument("--episodes", type=int, default=1, help="finished episodes to collect per env")
+    parser.add_argument("--max_steps", type=int, default=5000)
+    parser.add_argument("--success_radius", type=float, default=0.3, help="target_dist counted as reaching the target [m]")
+    parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() // 4))
+    parser.add_argument("--threads", type=int, default=4, help="torch threads per worker")
+    parser.add_argument("--output", default=None, help="results csv, defaults to runs/eval_<time>.csv")
+    parser.add_argument("overrides", nargs="*", help="extra hydra overrides, e.g. pipeline=cpu rl_device=cpu")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args)
+    output = args.output or os.path.join("runs", datetime.datetime.now().strftime("eval_%Y-%m-%d_%H-%M-%S.csv"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    print(f"Evaluating {len(jobs)} jobs on {args.workers} workers")
+
+    start = time.perf_counter()
+    # Isaac Sim only starts once per process, so every isaac job gets a fresh worker
+    context = multiprocessing.get_context("spawn")
+    maxtasksperchild = 1 if args.backend == "isaac" else None
+    rows = []
+    with context.Pool(args.workers, maxtasksperchild=maxtasksperchild) as pool, open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in pool.imap_unordered(evaluate, jobs):
+            writer.writerow(row)
+            f.flush()
+            rows.append(row)
+            name = f"[{len(rows)}/{len(jobs)}] {os.path.relpath(row['checkpoint'])} {row['task']} seed {row['seed']}"
+            if row["error"]:
+                print(f"{name}: failed, {row['error']}")
+            else:
+                print(f"{name}: success {row['success_rate']:.2f}, reward {row['mean_reward']:.2f}")
+
+    summarize(rows)
+    print(f"Wrote {output} in {time.perf_counter() - start:.0f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -30,9 +30,7 @@
 from eaglegym.utils.hydra_cfg.hydra_utils import *
 from eaglegym.utils.hydra_cfg.reformat import omegaconf_to_dict, print_dict
 from eaglegym.utils.rlgames.rlgames_utils import RLGPUAlgoObserver, RLGPUEnv
-from eaglegym.utils.task_util import initialize_task
-from eaglegym.utils.config_utils.path_utils import retrieve_checkpoint_path
-from eaglegym.envs.vec_env_rlgames import VecEnvRLGames
+from eaglegym.utils.task_util import initialize_task, initialize_torch_task
 
 import hydra
 from omegaconf import DictConfig
@@ -95,11 +93,22 @@ def parse_hydra_configs(cfg: DictConfig):
         cfg.device_id = rank
         cfg.rl_device = f'cuda:{rank}'
     enable_viewport = "enable_cameras" in cfg.task.sim and cfg.task.sim.enable_cameras
-    env = VecEnvRLGames(headless=headless, sim_device=cfg.device_id, enable_livestream=cfg.enable_livestream, enable_viewport=enable_viewport)
+    # backend=torch trains on the tasks simulated in torch, nothing from omni gets imported
+    if cfg.backend == "torch":
+        from eaglegym.envs.vec_env_torch import VecEnvTorch, set_seed
+        env = VecEnvTorch(headless=headless, sim_device=cfg.device_id)
+    else:
+        from eaglegym.envs.vec_env_rlgames import VecEnvRLGames
+        env = VecEnvRLGames(headless=headless, sim_device=cfg.device_id, enable_livestream=cfg.enable_livestream, enable_viewport=enable_viewport)
 
     # ensure checkpoints can be specified as relative paths
     if cfg.checkpoint:
-        cfg.checkpoint = retrieve_checkpoint_path(cfg.checkpoint)
+        if cfg.backend == "torch":
+            from hydra.utils import to_absolute_path
+            cfg.checkpoint = to_absolute_path(cfg.checkpoint)
+        else:
+            from eaglegym.utils.config_utils.path_utils import retrieve_checkpoint_path
+            cfg.checkpoint = retrieve_checkpoint_path(cfg.checkpoint)
         if cfg.checkpoint is None:
             quit()
 
@@ -107,11 +116,19 @@ def parse_hydra_configs(cfg: DictConfig):
     print_dict(cfg_dict)
 
     # sets seed. if seed is -1 will pick a random one
-    from omni.isaac.core.utils.torch.maths import set_seed
+    if cfg.backend != "torch":
+        from omni.isaac.core.utils.torch.maths import set_seed
     cfg.seed = set_seed(cfg.seed, torch_deterministic=cfg.torch_deterministic)
     cfg_dict['seed'] = cfg.seed
 
-    task = initialize_task(cfg_dict, env)
+    if cfg.backend == "torch":
+        task = initialize_torch_task(cfg_dict, env)
+    else:
+        task = initialize_task(cfg_dict, env)
+    if cfg.profile_steps:
+        env.enable_profiling(cfg.profile_steps)
+    if cfg.record_dir:
+        env.enable_recording(cfg.record_dir, range(min(cfg.record_num_envs, env.num_envs)))
 
     if cfg.wandb_activate and rank == 0:
         # Make sure to install WandB if you actually use this.
@@ -128,6 +128,10 @@ class Trainer(TrainerMT):
         self.trainer.launch_rlg_hydra(self.env)
         task = initialize_task(self.trainer.cfg_dict, self.env, init_sim=False)
         self.task = task
+        if self.trainer.cfg.profile_steps:
+            self.env.enable_profiling(self.trainer.cfg.profile_steps)
+        if self.trainer.cfg.record_dir:
+            self.env.enable_recording(self.trainer.cfg.record_dir, range(min(self.trainer.cfg.record_num_envs, self.env.num_envs)))
 
     def run(self):
         self.is_running = True
@@ -177,6 +181,10 @@ class PPOTrainer(threading.Thread):
             self.env.stop = True
         except TaskStopException:
             print("Task Stopped!")
+        finally:
+            # Recording happens on this thread, write out what is still staged
+            if self.env.recorder is not None:
+                self.env.recorder.close()
 
 
 @hydra.main(config_name="config", config_path="../cfg")
@@ -0,0 +1,80 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+from eaglegym.utils.observations.history_buffer import HistoryBuffer
+
+
+class ObservationHistoryMixin:
+
+    """ Gives a task's policy the last historyLength frames instead of only the current one.
+
+        A frame is the task's own observation, plus its last actions if historyActions is set in
+        the task yaml. Mix in before RLTask (or TorchTask) and call init_history in __init__ to
+        get the observation size to use:
+
+            class Swerve_Task(ObservationHistoryMixin, RLTask):
+                ...
+                self._num_observations = self.init_history(29, self._num_actions)
+
+        get_observations keeps writing the current frame into obs_buf[:, :frame_size], after
+        post_physics_step obs_buf holds the stacked frames, oldest first. With historyLength 1 and
+        no actions nothing changes and no buffer is created.
+    """
+
+    def init_history(self, frame_size, action_size=0):
+        env_cfg = self._task_cfg["env"]
+        self.history_length = env_cfg.get("historyLength", 1)
+        self.history_frame_size = frame_size
+        self.history_action_size = action_size if env_cfg.get("historyActions", False) else 0
+        self.history = None
+        return self.history_length * (frame_size + self.history_action_size)
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        if self.history_length > 1 or self.history_action_size > 0:
+            self.history = HistoryBuffer(self._num_envs, self.history_length,
+                                         self.history_frame_size + self.history_action_size, self._device)
+
+    def apply_resets(self):
+        # Envs reset now get the first frame of their new episode as the whole history
+        if self.history is not None:
+            self.history.mark_reset(self.reset_buf)
+        super().apply_resets()
+
+    def post_physics_step(self):
+        obs_buf, rew_buf, reset_buf, extras = super().post_physics_step()
+        if self.history is not None:
+            if self.history_action_size > 0:
+                self.history.push(obs_buf[:, :self.history_frame_size], self.actions)
+            else:
+                self.history.push(obs_buf[:, :self.history_frame_size])
+            # Copied into obs_buf so observation noise applied in place never reaches the history
+            obs_buf.copy_(self.history.stacked())
+        return obs_buf, rew_buf, reset_buf, extras
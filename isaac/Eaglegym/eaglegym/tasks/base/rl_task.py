@@ -77,6 +77,9 @@ class RLTask(BaseTask):
         self.rl_device = self._cfg.get("rl_device", "cuda:0")
 
         self.control_frequency_inv = self._cfg["task"]["env"].get("controlFrequencyInv", 1)
+        # Steps between checks for pending resets and target resampling, see apply_resets
+        self.reset_check_interval = self._cfg["task"]["env"].get("resetCheckInterval", 1)
+        self.target_interval = self._cfg["task"]["env"].get("targetInterval", 500)
 
         print("RL device: ", self.rl_device)
 
@@ -112,6 +115,18 @@ class RLTask(BaseTask):
         self.progress_buf = torch.zeros(self._num_envs, device=self._device, dtype=torch.long)
         self.extras = {}
 
+        # reset/target flags are copied to pinned host memory after each step and read back in
+        # the next pre_physics_step, so the host only waits on the GPU when something needs doing
+        self.target_due = torch.zeros(self._num_envs, device=self._device, dtype=torch.bool)
+        self._flags = torch.zeros(2, device=self._device, dtype=torch.bool)
+        self._flags_event = None
+        if self._flags.is_cuda:
+            self._flags_host = torch.zeros(2, dtype=torch.bool, pin_memory=True)
+            self._flags_event = torch.cuda.Event()
+        self._flags_pending = False
+        self.reset_steps = 0
+        self.reset_syncs = 0
+
     def set_up_scene(self, scene, replicate_physics=True) -> None:
         """ Clones environments based on value provided in task config and applies collision filters to mask 
             collisions across environments.
@@ -228,6 +243,70 @@ class RLTask(BaseTask):
         """ Flags all environments for reset.
         """
         self.reset_buf = torch.ones_like(self.reset_buf)
+        self._flags_pending = False
+
+    def set_targets(self, env_ids):
+        """ Optionally implemented by individual task classes to resample targets.
+
+        Args:
+            env_ids (torch.Tensor): Environments that reset or reached targetInterval steps.
+        """
+        pass
+
+    def queue_reset_flags(self):
+        """ Starts an async copy of whether any env needs a reset or new target. Called at the end of post_physics_step.
+        """
+        torch.logical_or(self.target_due, self.progress_buf % self.target_interval == 0, out=self.target_due)
+        if self._flags_event is None:
+            return
+        self._flags[0] = self.reset_buf.any()
+        self._flags[1] = self.target_due.any()
+        self._flags_host.copy_(self._flags, non_blocking=True)
+        self._flags_event.record()
+        self._flags_pending = True
+
+    def apply_resets(self):
+        """ Resets envs flagged in reset_buf and resamples targets, replaces the per step nonzero() checks in pre_physics_step.
+
+            The flags queued by the last step are usually already on the host, so the GPU is only
+            synchronized (and counted in reset_syncs) when there is something to reset or the
+            flags are not there yet. Checks run every resetCheckInterval steps.
+        """
+        self.reset_steps += 1
+        if self.reset_steps % self.reset_check_interval != 0 and self._flags_pending:
+            return
+
+        if self._flags_event is None or not self._flags_pending:
+            # Nothing queued yet (first step or after reset()), check the buffers directly
+            torch.logical_or(self.target_due, self.progress_buf % self.target_interval == 0, out=self.target_due)
+            any_reset, any_target = True, True
+        else:
+            if not self._flags_event.query():
+                self._flags_event.synchronize()
+                self.reset_syncs += 1
+            any_reset, any_target = self._flags_host.tolist()
+        self._flags_pending = False
+
+        if any_reset:
+            env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
+            self.reset_syncs += 1
+            if len(env_ids) > 0:
+                self.reset_idx(env_ids)
+                # Envs start a new target with every episode
+                self.target_due[env_ids] = True
+                any_target = True
+        if any_target:
+            env_ids = self.target_due.nonzero(as_tuple=False).squeeze(-1)
+            self.reset_syncs += 1
+            if len(env_ids) > 0:
+                self.set_targets(env_ids)
+                self.target_due[env_ids] = False
+
+    @property
+    def reset_syncs_per_step(self):
+        """ Host syncs done by apply_resets per step, for profiling.
+        """
+        return self.reset_syncs / max(self.reset_steps, 1)
 
     def pre_physics_step(self, actions):
         """ Optionally implemented by individual task classes to process actions.
@@ -248,13 +327,24 @@ class RLTask(BaseTask):
             extras(dict): Dictionary of extras data.
         """
 
+        profiler = getattr(self._env, "profiler", None)
+        if profiler:
+            profiler.mark("physics")
+
         self.progress_buf[:] += 1
 
         if self._env._world.is_playing():
             self.get_observations()
             self.get_states()
+            if profiler:
+                profiler.mark("get_observations")
             self.calculate_metrics()
+            if profiler:
+                profiler.mark("calculate_metrics")
             self.is_done()
             self.get_extras()
+            self.queue_reset_flags()
+            if profiler:
+                profiler.mark("is_done")
 
         return self.obs_buf, self.rew_buf, self.reset_buf, self.extras
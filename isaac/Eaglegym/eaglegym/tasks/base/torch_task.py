@@ -0,0 +1,208 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+from abc import abstractmethod
+import numpy as np
+import torch
+from gym import spaces
+
+
+class TorchTask:
+
+    """ Counterpart of RLTask for tasks simulated directly in batched torch, run by VecEnvTorch.
+        Keeps the RLTask buffers, spaces and step flow so rl_games sees the same env, but needs
+        no Isaac Sim: the task integrates its own dynamics in physics_step instead of PhysX.
+    """
+
+    def __init__(self, name, config, env) -> None:
+
+        """ Initializes RL parameters and buffers.
+
+        Args:
+            name (str): name of the task.
+            config (dict): the full hydra config as a dict, like SimConfig.config.
+            env (VecEnvTorch): the environment wrapper to register the task with.
+        """
+
+        self._name = name
+        self._cfg = config
+        self._task_cfg = config["task"]
+        self.test = self._cfg["test"]
+        # Same device rule as SimConfig, the cpu pipeline runs the task on the cpu
+        self._device = "cpu" if self._cfg["pipeline"] == "cpu" else f"cuda:{self._cfg['device_id']}"
+        print("Task Device:", self._device)
+
+        self.randomize_actions = False
+        self.randomize_observations = False
+
+        self.clip_obs = self._task_cfg["env"].get("clipObservations", np.Inf)
+        self.clip_actions = self._task_cfg["env"].get("clipActions", np.Inf)
+        self.rl_device = self._cfg.get("rl_device", "cuda:0")
+
+        self.control_frequency_inv = self._task_cfg["env"].get("controlFrequencyInv", 1)
+        self.target_interval = self._task_cfg["env"].get("targetInterval", 500)
+        self.sim_dt = self._task_cfg["sim"]["dt"]
+
+        print("RL device: ", self.rl_device)
+
+        self._env = env
+
+        if not hasattr(self, "_num_agents"):
+            self._num_agents = 1
+        if not hasattr(self, "_num_states"):
+            self._num_states = 0
+
+        if not hasattr(self, "action_space"):
+            self.action_space = spaces.Box(np.ones(self.num_actions) * -1.0, np.ones(self.num_actions) * 1.0)
+        if not hasattr(self, "observation_space"):
+            self.observation_space = spaces.Box(np.ones(self.num_observations) * -np.Inf, np.ones(self.num_observations) * np.Inf)
+        if not hasattr(self, "state_space"):
+            self.state_space = spaces.Box(np.ones(self.num_states) * -np.Inf, np.ones(self.num_states) * np.Inf)
+
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        """ Prepares torch buffers for RL data collection."""
+
+        self.obs_buf = torch.zeros((self._num_envs, self.num_observations), device=self._device, dtype=torch.float)
+        self.states_buf = torch.zeros((self._num_envs, self.num_states), device=self._device, dtype=torch.float)
+        self.rew_buf = torch.zeros(self._num_envs, device=self._device, dtype=torch.float)
+        self.reset_buf = torch.ones(self._num_envs, device=self._device, dtype=torch.long)
+        self.progress_buf = torch.zeros(self._num_envs, device=self._device, dtype=torch.long)
+        self.target_due = torch.zeros(self._num_envs, device=self._device, dtype=torch.bool)
+        self.extras = {}
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def device(self):
+        return self._device
+
+    @property
+    def num_envs(self):
+        return self._num_envs
+
+    @property
+    def num_actions(self):
+        return self._num_actions
+
+    @property
+    def num_observations(self):
+        return self._num_observations
+
+    @property
+    def num_states(self):
+        return self._num_states
+
+    @property
+    def num_agents(self):
+        return self._num_agents
+
+    def get_states(self):
+        return self.states_buf
+
+    def get_extras(self):
+        return self.extras
+
+    def reset(self):
+        """ Flags all environments for reset.
+        """
+        self.reset_buf = torch.ones_like(self.reset_buf)
+
+    def set_targets(self, env_ids):
+        """ Optionally implemented by individual task classes to resample targets, see RLTask.set_targets.
+        """
+        pass
+
+    def apply_resets(self):
+        """ Resets envs flagged in reset_buf and resamples due targets, called at the start of pre_physics_step.
+            Same behavior as RLTask.apply_resets, checked every step since there is no GPU to wait on.
+        """
+        env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self.reset_idx(env_ids)
+            self.target_due[env_ids] = True
+        env_ids = self.target_due.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self.set_targets(env_ids)
+            self.target_due[env_ids] = False
+
+    @abstractmethod
+    def post_reset(self):
+        """ Called once by VecEnvTorch.set_task, like the world reset of an Isaac task.
+        """
+        pass
+
+    @abstractmethod
+    def reset_idx(self, env_ids):
+        pass
+
+    @abstractmethod
+    def pre_physics_step(self, actions):
+        pass
+
+    @abstractmethod
+    def physics_step(self, dt):
+        """ Advances the simulated state by dt seconds, called control_frequency_inv times per env step.
+        """
+        pass
+
+    def post_physics_step(self):
+        """ Processes RL required computations for observations, states, rewards, resets, and extras.
+
+        Returns:
+            obs_buf(torch.Tensor): Tensor of observation data.
+            rew_buf(torch.Tensor): Tensor of rewards data.
+            reset_buf(torch.Tensor): Tensor of resets/dones data.
+            extras(dict): Dictionary of extras data.
+        """
+
+        profiler = self._env.profiler
+        if profiler:
+            profiler.mark("physics")
+
+        self.progress_buf[:] += 1
+
+        self.get_observations()
+        self.get_states()
+        if profiler:
+            profiler.mark("get_observations")
+        self.calculate_metrics()
+        if profiler:
+            profiler.mark("calculate_metrics")
+        self.is_done()
+        self.get_extras()
+        torch.logical_or(self.target_due, self.progress_buf % self.target_interval == 0, out=self.target_due)
+        if profiler:
+            profiler.mark("is_done")
+
+        return self.obs_buf, self.rew_buf, self.reset_buf, self.extras
@@ -32,7 +32,8 @@ from eaglegym.robots.articulations.edna import Edna
 from eaglegym.robots.articulations.views.edna_view import EdnaView
 from eaglegym.tasks.utils.usd_utils import set_drive
 from eaglegym.inverse_kinematics.inverse_kinematics import InverseKinematics
-from squaternion import Quaternion
+from eaglegym.utils.observations.observation_spec import EDNA_KINEMATICS_OBS
+from eaglegym.utils.rotations.rotations import quat_to_euler, quat_to_yaw
 from omni.isaac.core.objects import DynamicSphere
 
 
@@ -77,7 +78,7 @@ class Edna_Kinematics_Task(RLTask):
         self._edna_translation = torch.tensor([0.0, 0.0, 0.0])
         self._env_spacing = self._task_cfg["env"]["envSpacing"]
         # Number of data points the policy is recieving
-        self._num_observations = 16
+        self._num_observations = EDNA_KINEMATICS_OBS.size
         # Number of data points the policy is producing
         self._num_actions = 3
         # starting position of the edna module
@@ -165,14 +166,13 @@ class Edna_Kinematics_Task(RLTask):
         # print(self.joint_positions)
         self.root_velocities = self._edna.get_velocities()
         root_positions = self.root_pos - self._env_pos
-        root_quats = self.root_rot
-        root_linvels = self.root_velocities[:, :3]
-        root_angvels = self.root_velocities[:, 3:]
-        self.obs_buf[..., 0:3] = self.target_positions
-        self.obs_buf[..., 3:6] = root_positions
-        self.obs_buf[..., 6:10] = root_quats
-        self.obs_buf[..., 10:13] = root_linvels
-        self.obs_buf[..., 13:16] = root_angvels / math.pi
+        EDNA_KINEMATICS_OBS.fill(
+            self.obs_buf,
+            target_pos=self.target_positions,
+            root_pos=root_positions,
+            root_quat=self.root_rot,
+            root_linvel=self.root_velocities[:, :3],
+            root_angvel=self.root_velocities[:, 3:])
         
         # Should not exceed observation ssize declared earlier
         # An observation is created for each edna in each environment
@@ -199,14 +199,8 @@ class Edna_Kinematics_Task(RLTask):
             # self.rew_buf[:] = pos_reward
         # This is what sets the action for edna
 
-        reset_env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(reset_env_ids) > 0:
-            self.reset_idx(reset_env_ids)
-
-        set_target_ids = (self.progress_buf % 500 == 0).nonzero(
-            as_tuple=False).squeeze(-1)
-        if len(set_target_ids) > 0:
-            self.set_targets(set_target_ids)
+        # Resets and new targets every targetInterval steps, without a GPU sync every step
+        self.apply_resets()
 
         self.actions[:] = actions.clone().to(self._device)
         # Sets velocity for each wheel and axle within the velocity limits
@@ -220,26 +214,25 @@ class Edna_Kinematics_Task(RLTask):
         x_offset = 0.7366
         radius = 0.1016
         actionlist = []
+        # Read the poses once and get every env's yaw in one batch instead of per env
+        joint_positions = self._edna.get_joint_positions()
+        pos, rot = self._edna.get_world_poses()
+        imu_yaws = quat_to_yaw(rot).tolist()
         for i in range(self.num_envs):
             action = []
 
             front_left_current_pos = (
-                (self._edna.get_joint_positions()[i][1]))
+                (joint_positions[i][1]))
             front_right_current_pos = (
-                (self._edna.get_joint_positions()[i][2]))
+                (joint_positions[i][2]))
             rear_left_current_pos = (
-                (self._edna.get_joint_positions()[i][3]))
+                (joint_positions[i][3]))
             rear_right_current_pos = (
-                (self._edna.get_joint_positions()[i][4]))
+                (joint_positions[i][4]))
             
             module_angles = [front_left_current_pos, front_right_current_pos, rear_left_current_pos, rear_right_current_pos]
             
-            pos, rot = self._edna.get_world_poses()
-            quat = rot[i]
-            imu_quat = Quaternion(quat[0], quat[1], quat[2], quat[3])
-            imu_euler = imu_quat.to_euler()
-            
-            velocity_cmds = self.inverse_kinematics.getDriveJointStates(linear_x_cmd[i], linear_y_cmd[i], angular_cmd[i], module_angles, imu_euler[2])
+            velocity_cmds = self.inverse_kinematics.getDriveJointStates(linear_x_cmd[i], linear_y_cmd[i], angular_cmd[i], module_angles, imu_yaws[i])
  
             front_left_velocity = velocity_cmds[0]
             front_right_velocity = velocity_cmds[1]
@@ -400,13 +393,7 @@ class Edna_Kinematics_Task(RLTask):
             
 
     def quaternion_to_euler(self, quat):
-        w, x, y, z = quat[0], quat[1], quat[2], quat[3]
-
-        roll = math.atan2(2*(w*x + y*z), 1 - 2*(x**2 + y**2))
-        pitch = math.asin(2*(w*y - z*x))
-        yaw = math.atan2(2*(w*z + x*y), 1 - 2*(y**2 + z**2))
-        
-        return roll, pitch, yaw
+        return quat_to_euler(quat)
 
     def calculate_metrics(self) -> None:
         self.current_position = self.root_pos - self._env_pos
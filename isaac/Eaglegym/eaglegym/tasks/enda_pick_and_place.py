@@ -31,6 +31,7 @@ from eaglegym.robots.articulations.edna import Edna
 from eaglegym.robots.articulations.views.edna_view import EdnaView
 from eaglegym.tasks.utils.usd_utils import set_drive
 from eaglegym.inverse_kinematics.inverse_kinematics import InverseKinematics
+from eaglegym.utils.observations.observation_spec import EDNA_OBS
 from omni.isaac.core.utils.stage import add_reference_to_stage
 from omni.isaac.core.objects import DynamicSphere
 
@@ -77,7 +78,7 @@ class Edna_Pick_And_Place_Task(RLTask):
         self._edna_translation = torch.tensor([0.0, 0.0, 0.0])
         self._env_spacing = self._task_cfg["env"]["envSpacing"]
         # Number of data points the policy is recieving
-        self._num_observations = 13
+        self._num_observations = EDNA_OBS.size
         # Number of data points the policy is producing
         self._num_actions = 10
         # starting position of the edna module
@@ -174,13 +175,14 @@ class Edna_Pick_And_Place_Task(RLTask):
         # print(self.joint_positions)
         self.root_velocities = self._edna.get_velocities(clone=False)
         root_positions = self.root_pos - self._env_pos
-        root_quats = self.root_rot
-        root_linvels = self.root_velocities[:, :3]
-        root_angvels = self.root_velocities[:, 3:]
-        self.obs_buf[..., 0:3] = (self.target_positions - root_positions) / 3
-        self.obs_buf[..., 3:7] = root_quats
-        self.obs_buf[..., 7:10] = root_linvels / 2
-        self.obs_buf[..., 10:13] = root_angvels / math.pi
+        # Layout and scaling are shared with the policy_runner on the robot
+        EDNA_OBS.fill(
+            self.obs_buf,
+            target_pos=self.target_positions,
+            root_pos=root_positions,
+            root_quat=self.root_rot,
+            root_linvel=self.root_velocities[:, :3],
+            root_angvel=self.root_velocities[:, 3:])
         # Should not exceed observation ssize declared earlier
         # An observation is created for each edna in each environment
         observations = {
@@ -193,14 +195,8 @@ class Edna_Pick_And_Place_Task(RLTask):
     def pre_physics_step(self, actions) -> None:
         # This is what sets the action for edna
 
-        reset_env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(reset_env_ids) > 0:
-            self.reset_idx(reset_env_ids)
-
-        set_target_ids = (self.progress_buf % 500 == 0).nonzero(
-            as_tuple=False).squeeze(-1)
-        if len(set_target_ids) > 0:
-            self.set_targets(set_target_ids)
+        # Resets and new targets every targetInterval steps, without a GPU sync every step
+        self.apply_resets()
 
         self.actions[:] = actions.clone().to(self._device)
         # Sets velocity for each wheel and axle within the velocity limits
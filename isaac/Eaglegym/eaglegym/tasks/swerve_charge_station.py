@@ -27,6 +27,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from eaglegym.tasks.base.rl_task import RLTask
+from eaglegym.utils.curriculum.curriculum import Curriculum
+from eaglegym.utils.rotations.rotations import quat_to_yaw
 from eaglegym.robots.articulations.swerve import Swerve
 from eaglegym.robots.articulations.views.swerve_view import SwerveView
 from eaglegym.robots.articulations.views.charge_station_view import ChargeStationView
@@ -93,6 +95,8 @@ class Swerve_Charge_Station_Task(RLTask):
 
         self.target_positions = torch.zeros(
             (self._num_envs, 3), device=self._device, dtype=torch.float32)  # xyx of target position
+        # Target distances by per env level when the task yaml enables it, uniform targets otherwise
+        self.curriculum = Curriculum.from_cfg(self._task_cfg["env"].get("curriculum"), self._num_envs, self._device)
         self.target_rotation = torch.zeros(
             (self._num_envs, 4), device=self._device, dtype=torch.float32) #ypr
         self.target_positions[:, 1] = 1
@@ -147,19 +151,11 @@ class Swerve_Charge_Station_Task(RLTask):
             (self._num_envs, 8), device=self._device, dtype=torch.float32) #ypr
         charge_station_pos = self.charge_station_pos - self._env_pos
 
-        for i in range(len(self.charge_station_pos)):
-            w=self.charge_station_rot[i][0]
-            x=self.charge_station_rot[i][1]
-            y=self.charge_station_rot[i][2]
-            z=self.charge_station_rot[i][3]
-            # print(f"x:{x} y:{y} z:{z} w:{w}")
-            siny_cosp = 2 * (w * z + x * y)
-            cosy_cosp = 1 - 2 * (y * y + z * z)
-            angle = math.atan2(siny_cosp, cosy_cosp)
-            self.chargestation_vertices[i][0] , self.chargestation_vertices[i][1] = findB(charge_station_pos[i][0],charge_station_pos[i][1],math.pi-angle) 
-            self.chargestation_vertices[i][2] , self.chargestation_vertices[i][3] = findB(charge_station_pos[i][0],charge_station_pos[i][1],angle) 
-            self.chargestation_vertices[i][4] , self.chargestation_vertices[i][5] = findB(charge_station_pos[i][0],charge_station_pos[i][1],(2*math.pi)-angle)  
-            self.chargestation_vertices[i][6] , self.chargestation_vertices[i][7] = findB(charge_station_pos[i][0],charge_station_pos[i][1],angle+math.pi) 
+        # Every env's charge station yaw in one batch, then its 4 corners
+        angle = quat_to_yaw(self.charge_station_rot).unsqueeze(-1)
+        corner_angles = torch.cat([math.pi - angle, angle, (2 * math.pi) - angle, angle + math.pi], dim=-1)
+        self.chargestation_vertices[:, 0::2], self.chargestation_vertices[:, 1::2] = findB(
+            charge_station_pos[:, 0:1], charge_station_pos[:, 1:2], corner_angles)
 
         self.root_velocities = self._swerve.get_velocities(clone=False)
         root_positions = self.root_pos - self._env_pos
@@ -187,14 +183,8 @@ class Swerve_Charge_Station_Task(RLTask):
     def pre_physics_step(self, actions) -> None:
         # This is what sets the action for swerve
 
-        reset_env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(reset_env_ids) > 0:
-            self.reset_idx(reset_env_ids)
-
-        set_target_ids = (self.progress_buf % 500 == 0).nonzero(
-            as_tuple=False).squeeze(-1)
-        if len(set_target_ids) > 0:
-            self.set_targets(set_target_ids)
+        # Resets and new targets every targetInterval steps, without a GPU sync every step
+        self.apply_resets()
 
         self.actions[:] = actions.clone().to(self._device)
         # Sets velocity for each wheel and axle within the velocity limits
@@ -352,10 +342,17 @@ class Swerve_Charge_Station_Task(RLTask):
         num_sets = len(env_ids)
         envs_long = env_ids.long()
         # set target position randomly with x, y in (-8, 8)
-        self.target_positions[envs_long, 0:2] = torch.rand(
-            (num_sets, 2), device=self._device) * 8 - 1
+        if self.curriculum is not None:
+            self.curriculum.end_attempts(envs_long)
+            self.target_positions[envs_long, 0:2] = self.curriculum.sample_offsets("targetDistance", envs_long)
+        else:
+            self.target_positions[envs_long, 0:2] = torch.rand(
+                (num_sets, 2), device=self._device) * 8 - 1
         self.target_rotation[envs_long, 0]= 0
         self.target_rotation[envs_long, 1]= torch.rand((num_sets), device=self._device) 
+        if self.curriculum is not None:
+            # easy levels keep the station in its default orientation
+            self.target_rotation[envs_long, 1] *= self.curriculum.value("chargeStationRotation", envs_long)
         # self.target_rotation = self.target_rotation[envs_long]+self.initial_charge_station_rot[envs_long]
         self.target_rotation[envs_long, 2]= 1
         self.target_rotation[envs_long, 3] = 0#
@@ -382,6 +379,9 @@ class Swerve_Charge_Station_Task(RLTask):
         # print(charge_station_score.tolist())
         pos_reward = 1.0 / (1.0 + 2.5 * target_dist * target_dist)
         self.target_dist = target_dist
+        if self.curriculum is not None:
+            self.curriculum.track(target_dist)
+            self.extras.update(self.curriculum.log_values)
         self.root_positions = root_positions
         self.root_position_reward = torch.zeros_like(self.rew_buf)
         # rewards for moving away form starting point
@@ -432,13 +432,10 @@ def calculate_turn_velocity(current_pos, turn_position):
             setspeed *= -1
     return setspeed
 def findB(Cx,Cy, angle_change,angle_init=0.463647609,r=1.363107039084):
-    L= angle_init*r
-    if(angle_change < 0):
-        angle_init -= angle_change
-    else:
-        angle_init += angle_change
-    Bx = Cx + r*math.cos(angle_init)
-    By = Cy + r*math.sin(angle_init)
+    # Works elementwise on tensors, the corner is angle_init + |angle_change| around the center
+    angle = angle_init + torch.abs(angle_change)
+    Bx = Cx + r*torch.cos(angle)
+    By = Cy + r*torch.sin(angle)
     return Bx, By
 def in_charge_station(charge_station_verticies,axle_position, device):
     if_in_chargestation = torch.tensor([check_point_2(i, j) for i, j in zip(charge_station_verticies, axle_position)], device=device)
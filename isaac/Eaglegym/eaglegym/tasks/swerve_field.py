@@ -27,6 +27,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from eaglegym.tasks.base.rl_task import RLTask
+from eaglegym.utils.curriculum.curriculum import Curriculum
 from eaglegym.robots.articulations.swerve import Swerve
 from eaglegym.robots.articulations.views.swerve_view import SwerveView
 from eaglegym.tasks.utils.usd_utils import set_drive
@@ -87,6 +88,8 @@ class Swerve_Field_Task(RLTask):
 
         self.target_positions = torch.zeros(
             (self._num_envs, 3), device=self._device, dtype=torch.float32)  # xyx of target position
+        # Target distances by per env level when the task yaml enables it, uniform targets otherwise
+        self.curriculum = Curriculum.from_cfg(self._task_cfg["env"].get("curriculum"), self._num_envs, self._device)
         self.target_positions[:, 1] = 1
 
         return
@@ -208,14 +211,8 @@ class Swerve_Field_Task(RLTask):
     def pre_physics_step(self, actions) -> None:
         # This is what sets the action for swerve
 
-        reset_env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(reset_env_ids) > 0:
-            self.reset_idx(reset_env_ids)
-
-        set_target_ids = (self.progress_buf % 500 == 0).nonzero(
-            as_tuple=False).squeeze(-1)
-        if len(set_target_ids) > 0:
-            self.set_targets(set_target_ids)
+        # Resets and new targets every targetInterval steps, without a GPU sync every step
+        self.apply_resets()
 
         self.actions[:] = actions.clone().to(self._device)
         # Sets velocity for each wheel and axle within the velocity limits
@@ -371,8 +368,12 @@ class Swerve_Field_Task(RLTask):
         num_sets = len(env_ids)
         envs_long = env_ids.long()
         # set target position randomly with x, y in (-20, 20)
-        self.target_positions[envs_long, 0:2] = torch.rand(
-            (num_sets, 2), device=self._device) * 20 - 1
+        if self.curriculum is not None:
+            self.curriculum.end_attempts(envs_long)
+            self.target_positions[envs_long, 0:2] = self.curriculum.sample_offsets("targetDistance", envs_long)
+        else:
+            self.target_positions[envs_long, 0:2] = torch.rand(
+                (num_sets, 2), device=self._device) * 20 - 1
         self.target_positions[envs_long, 2] = 0.1
         # print(self.target_positions)
 
@@ -390,6 +391,9 @@ class Swerve_Field_Task(RLTask):
 
         pos_reward = 1.0 / (1.0 + 2.5 * target_dist * target_dist)
         self.target_dist = target_dist
+        if self.curriculum is not None:
+            self.curriculum.track(target_dist)
+            self.extras.update(self.curriculum.log_values)
         self.root_positions = root_positions
         self.root_position_reward = self.rew_buf
         # rewards for moving away form starting point
@@ -0,0 +1,254 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+from eaglegym.tasks.base.torch_task import TorchTask
+from eaglegym.tasks.base.observation_history import ObservationHistoryMixin
+from eaglegym.utils.curriculum.curriculum import Curriculum
+
+import torch
+import math
+
+
+class Swerve_Torch_Task(ObservationHistoryMixin, TorchTask):
+    """ Swerve_Task simulated in batched torch, trains on the cpu with thousands of envs.
+
+        Same observations (29), actions (8), controller, rewards, resets and targets as Swerve_Task.
+        PhysX is replaced by a planar model: axles and wheels follow the controller's joint velocity
+        targets with first order lags, the chassis twist is the least squares fit of the module
+        velocities and follows it with another lag, then the pose is integrated.
+    """
+
+    def __init__(
+        self,
+        name,
+        config,
+        env
+    ) -> None:
+        self._cfg = config
+        self._task_cfg = config["task"]
+
+        # Same as Swerve_Task
+        self.velocity_limit = 10
+        self.dt = 1 / 60
+        self.max_episode_length_s = self._task_cfg["env"]["episodeLength_s"]
+        self._max_episode_length = int(
+            self.max_episode_length_s / self.dt + 0.5)
+        self._num_envs = self._task_cfg["env"]["numEnvs"]
+        self._num_actions = 8
+        self._num_observations = self.init_history(29, self._num_actions)
+
+        self.x_offset = 0.7366
+        self.radius = 0.1016
+        # Module positions in the chassis frame that match the wheel math in pre_physics_step,
+        # front left, front right, rear left, rear right
+        half = self.x_offset / 2
+        self.module_x = torch.tensor([half, -half, half, -half])
+        self.module_y = torch.tensor([-half, -half, half, half])
+
+        # Time constants of the joint drives and of the chassis following the modules
+        dynamics = self._task_cfg["env"].get("torchDynamics", {})
+        self.axle_time_constant = dynamics.get("axleTimeConstant", 0.02)
+        self.wheel_time_constant = dynamics.get("wheelTimeConstant", 0.05)
+        self.chassis_time_constant = dynamics.get("chassisTimeConstant", 0.1)
+
+        TorchTask.__init__(self, name, config, env)
+
+        self.module_x = self.module_x.to(self._device)
+        self.module_y = self.module_y.to(self._device)
+        self.target_positions = torch.zeros(
+            (self._num_envs, 3), device=self._device, dtype=torch.float32)
+        # Target distances by per env level when the task yaml enables it, uniform targets otherwise
+        self.curriculum = Curriculum.from_cfg(self._task_cfg["env"].get("curriculum"), self._num_envs, self._device)
+        self.target_positions[:, 1] = 1
+
+    def post_reset(self):
+        n = self._num_envs
+        # Env origins are all at zero, root_pos is relative to its env like root_pos - _env_pos in Swerve_Task
+        self.root_pos = torch.zeros((n, 3), device=self._device)
+        self.yaw = torch.zeros(n, device=self._device)
+        self.root_rot = torch.zeros((n, 4), device=self._device)
+        self.root_rot[:, 0] = 1
+        # linear xyz and angular xyz in the world frame, like get_velocities
+        self.root_velocities = torch.zeros((n, 6), device=self._device)
+        # axles are joints 0-3, wheels 4-7
+        self.dof_pos = torch.zeros((n, 8), device=self._device)
+        self.dof_vel = torch.zeros((n, 8), device=self._device)
+        self.dof_vel_targets = torch.zeros((n, 8), device=self._device)
+
+        self.initial_root_pos = self.root_pos.clone()
+        self.actions = torch.zeros(
+            n, self.num_actions, dtype=torch.float, device=self._device)
+        self.extras = {}
+
+        indices = torch.arange(n, dtype=torch.int64, device=self._device)
+        self.reset_idx(indices)
+
+    def get_observations(self) -> dict:
+        root_linvels = self.root_velocities[:, :3]
+        root_angvels = self.root_velocities[:, 3:]
+        self.obs_buf[..., 0:3] = (self.target_positions - self.root_pos) / 3
+        self.obs_buf[..., 3:7] = self.root_rot
+        self.obs_buf[..., 7:10] = root_linvels / 2
+        self.obs_buf[..., 10:13] = root_angvels / math.pi
+        self.obs_buf[..., 13:21] = self.dof_vel
+        self.obs_buf[..., 21:29] = self.dof_pos
+        return {"swerveview": {"obs_buf": self.obs_buf}}
+
+    def pre_physics_step(self, actions) -> None:
+        self.apply_resets()
+
+        self.actions[:] = actions
+        # The loop in Swerve_Task.pre_physics_step, for all envs at once
+        linear_x_cmd = torch.clamp(
+            actions[:, 0:1] * self.velocity_limit, -self.velocity_limit, self.velocity_limit)
+        linear_y_cmd = torch.clamp(
+            actions[:, 1:2] * self.velocity_limit, -self.velocity_limit, self.velocity_limit)
+        angular_cmd = torch.clamp(
+            actions[:, 2:3] * self.velocity_limit, -self.velocity_limit, self.velocity_limit)
+
+        a = linear_x_cmd - angular_cmd * self.x_offset / 2
+        b = linear_x_cmd + angular_cmd * self.x_offset / 2
+        c = linear_y_cmd - angular_cmd * self.x_offset / 2
+        d = linear_y_cmd + angular_cmd * self.x_offset / 2
+        # front left, front right, rear left, rear right
+        sin_part = torch.cat((b, b, a, a), dim=1)
+        cos_part = torch.cat((d, c, d, c), dim=1)
+
+        wheel_velocity = torch.sqrt(sin_part ** 2 + cos_part ** 2) / (self.radius * math.pi)
+        turn_position = torch.atan2(sin_part, cos_part)
+        turn_position, wheel_velocity = simplify_angle(self.dof_pos[:, 0:4], turn_position, wheel_velocity)
+
+        self.dof_vel_targets[:, 0:4] = calculate_turn_velocity(self.dof_pos[:, 0:4], turn_position)
+
+        maxs = wheel_velocity.abs().max(dim=1, keepdim=True).values
+        wheel_velocity = torch.where(maxs > 10, wheel_velocity / maxs * 10, wheel_velocity)
+        self.dof_vel_targets[:, 4:8] = torch.where(maxs < 0.5, torch.zeros_like(wheel_velocity), wheel_velocity)
+
+    def physics_step(self, dt):
+        # Joint drives
+        self.dof_vel[:, 0:4] += (self.dof_vel_targets[:, 0:4] - self.dof_vel[:, 0:4]) * min(dt / self.axle_time_constant, 1.0)
+        self.dof_vel[:, 4:8] += (self.dof_vel_targets[:, 4:8] - self.dof_vel[:, 4:8]) * min(dt / self.wheel_time_constant, 1.0)
+        self.dof_pos += self.dof_vel * dt
+
+        # Module ground velocities in the chassis frame, the inverse of the wheel math in pre_physics_step
+        speed = self.dof_vel[:, 4:8] * (self.radius * math.pi)
+        module_vx = speed * torch.sin(self.dof_pos[:, 0:4])
+        module_vy = speed * torch.cos(self.dof_pos[:, 0:4])
+
+        # Least squares chassis twist, the layout is symmetric so the fit separates per axis
+        vx = module_vx.mean(dim=1)
+        vy = module_vy.mean(dim=1)
+        omega = (self.module_x * module_vy - self.module_y * module_vx).sum(dim=1) / (self.module_x ** 2 + self.module_y ** 2).sum()
+
+        cos_yaw = torch.cos(self.yaw)
+        sin_yaw = torch.sin(self.yaw)
+        world_vx = vx * cos_yaw - vy * sin_yaw
+        world_vy = vx * sin_yaw + vy * cos_yaw
+
+        alpha = min(dt / self.chassis_time_constant, 1.0)
+        self.root_velocities[:, 0] += (world_vx - self.root_velocities[:, 0]) * alpha
+        self.root_velocities[:, 1] += (world_vy - self.root_velocities[:, 1]) * alpha
+        self.root_velocities[:, 5] += (omega - self.root_velocities[:, 5]) * alpha
+
+        self.root_pos[:, 0:2] += self.root_velocities[:, 0:2] * dt
+        self.yaw += self.root_velocities[:, 5] * dt
+        self.root_rot[:, 0] = torch.cos(self.yaw / 2)
+        self.root_rot[:, 3] = torch.sin(self.yaw / 2)
+
+    def reset_idx(self, env_ids):
+        num_resets = len(env_ids)
+        # Turns the wheels and axles -pi to pi radians, same joints as Swerve_Task
+        self.dof_pos[env_ids, 1] = torch.rand(num_resets, device=self._device) * 2 * math.pi - math.pi
+        self.dof_pos[env_ids, 3] = torch.rand(num_resets, device=self._device) * 2 * math.pi - math.pi
+        self.dof_vel[env_ids, :] = 0
+        self.dof_vel_targets[env_ids, :] = 0
+
+        self.root_pos[env_ids] = self.initial_root_pos[env_ids]
+        self.root_pos[env_ids, 0:2] += torch.rand((num_resets, 2), device=self._device) - 0.5
+        self.yaw[env_ids] = 0
+        self.root_rot[env_ids] = 0
+        self.root_rot[env_ids, 0] = 1
+        self.root_velocities[env_ids] = 0
+
+        # bookkeeping
+        self.reset_buf[env_ids] = 0
+        self.progress_buf[env_ids] = 0
+
+    def set_targets(self, env_ids):
+        num_sets = len(env_ids)
+        envs_long = env_ids.long()
+        # set target position randomly with x, y in (-20, 20)
+        if self.curriculum is not None:
+            self.curriculum.end_attempts(envs_long)
+            self.target_positions[envs_long, 0:2] = self.curriculum.sample_offsets("targetDistance", envs_long)
+        else:
+            self.target_positions[envs_long, 0:2] = torch.rand(
+                (num_sets, 2), device=self._device) * 20 - 1
+        self.target_positions[envs_long, 2] = 0.1
+
+    def calculate_metrics(self) -> None:
+        root_positions = self.root_pos
+        target_dist = torch.sqrt(torch.square(
+            self.target_positions - root_positions).sum(-1))
+
+        pos_reward = 1.0 / (1.0 + 2.5 * target_dist * target_dist)
+        self.target_dist = target_dist
+        if self.curriculum is not None:
+            self.curriculum.track(target_dist)
+            self.extras.update(self.curriculum.log_values)
+        self.root_positions = root_positions
+        # rewards for moving away form starting point, Swerve_Task's per env loop
+        self.rew_buf[:] = root_positions[:, 0:2].sum(-1) * pos_reward
+
+    def is_done(self) -> None:
+        ones = torch.ones_like(self.reset_buf)
+        die = torch.zeros_like(self.reset_buf)
+        die = torch.where(self.target_dist > 20.0, ones, die)
+        die = torch.where(self.root_positions[..., 2] > 0.5, ones, die)
+
+        # resets due to episode length
+        self.reset_buf[:] = torch.where(
+            self.progress_buf >= self._max_episode_length - 1, ones, die)
+
+
+@torch.jit.script
+def simplify_angle(current_pos, turn_pos, velocity):
+    # simplifiy_angle from swerve.py: flip the target by pi (and the wheel direction) until it is within pi/2
+    flips = torch.round((turn_pos - current_pos) / math.pi)
+    turn_pos = turn_pos - flips * math.pi
+    velocity = torch.where(torch.remainder(flips, 2) == 1, -velocity, velocity)
+    return turn_pos, velocity
+
+
+@torch.jit.script
+def calculate_turn_velocity(current_pos, turn_position):
+    # calculate_turn_velocity from swerve.py, 1 degree tolerance and at most 5 rad/s
+    error = turn_position - current_pos
+    setspeed = torch.clamp(error.abs() / (math.pi / 9), max=5.0) * torch.sign(error)
+    return torch.where(error.abs() > math.pi / 90, setspeed, torch.zeros_like(setspeed))
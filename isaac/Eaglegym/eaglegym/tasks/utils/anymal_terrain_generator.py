@@ -31,11 +31,14 @@ import torch
 import math
 
 from eaglegym.utils.terrain_utils.terrain_utils import *
+from eaglegym.utils.terrain_utils.terrain_cache import TerrainCache, terrain_key
+
+CACHED_ARRAYS = ("height_field_raw", "env_origins", "vertices", "triangles")
 
 
 # terrain generator
 class Terrain:
-    def __init__(self, cfg, num_robots) -> None:
+    def __init__(self, cfg, num_robots, seed=None, cache_dir=None) -> None:
         self.horizontal_scale = 0.1
         self.vertical_scale = 0.005
         self.border_size = 20
@@ -57,13 +60,39 @@ class Terrain:
         self.tot_cols = int(self.env_cols * self.width_per_env_pixels) + 2 * self.border
         self.tot_rows = int(self.env_rows * self.length_per_env_pixels) + 2 * self.border
 
-        self.height_field_raw = np.zeros((self.tot_rows , self.tot_cols), dtype=np.int16)
-        if cfg["curriculum"]:
-            self.curiculum(num_robots, num_terrains=self.env_cols, num_levels=self.env_rows)
-        else:
-            self.randomized_terrain()   
+        # Generated terrains are only cached when seeded, otherwise they are different every run
+        seed = seed if seed is not None else cfg.get("seed", None)
+        cache_dir = cache_dir or cfg.get("cacheDir", None)
+        cache, key = None, None
+        if seed is not None and cache_dir:
+            cache = TerrainCache(cache_dir)
+            key = terrain_key({k: v for k, v in cfg.items() if k != "cacheDir"}, num_robots, seed, self.horizontal_scale, self.vertical_scale, self.border_size)
+            cached = cache.load(key, CACHED_ARRAYS)
+            if cached is not None:
+                for name, array in cached.items():
+                    setattr(self, name, array)
+                self.heightsamples = self.height_field_raw
+                return
+
+        # terrain_utils draws from the global numpy RNG. A seed makes the terrain reproducible with or without
+        # a cache, and the global state is restored so the rest of the run doesn't depend on a cache hit
+        rng_state = None
+        if seed is not None:
+            rng_state = np.random.get_state()
+            np.random.seed(seed)
+        try:
+            self.height_field_raw = np.zeros((self.tot_rows , self.tot_cols), dtype=np.int16)
+            if cfg["curriculum"]:
+                self.curiculum(num_robots, num_terrains=self.env_cols, num_levels=self.env_rows)
+            else:
+                self.randomized_terrain()
+        finally:
+            if rng_state is not None:
+                np.random.set_state(rng_state)
         self.heightsamples = self.height_field_raw
         self.vertices, self.triangles = convert_heightfield_to_trimesh(self.height_field_raw, self.horizontal_scale, self.vertical_scale, cfg["slopeTreshold"])
+        if cache is not None:
+            cache.save(key, {name: getattr(self, name) for name in CACHED_ARRAYS})
     
     def randomized_terrain(self):
         for k in range(self.num_maps):
@@ -0,0 +1,109 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import math
+import torch
+
+
+class Curriculum:
+    """ Per env difficulty levels driven by each env's own success rate, all kept on the device.
+
+        An attempt is one target: it starts when set_targets samples the target and ends when the
+        next one is sampled (target interval or reset). `track(target_dist)` runs every step and
+        remembers whether the target got within successRadius, `end_attempts(env_ids)` folds the
+        finished attempts into an exponential moving average of success and moves the env one level
+        up above upThreshold or down below downThreshold. Every entry of `ranges` is an [easy, hard]
+        pair interpolated by level, `value(name, env_ids)` returns it for the given envs.
+
+        `log_values` holds 0-dim tensors updated in place, tasks put them into extras and
+        RLGPUAlgoObserver writes them to TensorBoard with the other scalar extras.
+    """
+
+    def __init__(self, cfg, num_envs, device):
+        self.num_levels = cfg.get("numLevels", 10)
+        self.success_radius = cfg.get("successRadius", 0.3)
+        self.up_threshold = cfg.get("upThreshold", 0.8)
+        self.down_threshold = cfg.get("downThreshold", 0.3)
+        self.smoothing = cfg.get("smoothing", 0.25)
+        self.ranges = {name: (float(easy), float(hard)) for name, (easy, hard) in cfg.get("ranges", {}).items()}
+        self.device = device
+
+        self.levels = torch.randint(0, cfg.get("initLevel", 0) + 1, (num_envs,), device=device)
+        # Starts between the thresholds so the first attempts decide the direction
+        self.success_rate = torch.full((num_envs,), 0.5 * (self.up_threshold + self.down_threshold), device=device)
+        self.reached = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        # False until an env got its first target, the initial set_targets ends no attempt
+        self.active = torch.zeros(num_envs, dtype=torch.bool, device=device)
+
+        self.log_values = {
+            "curriculum/mean_level": torch.zeros((), device=device),
+            "curriculum/max_level_fraction": torch.zeros((), device=device),
+            "curriculum/success_rate": torch.zeros((), device=device),
+        }
+
+    @staticmethod
+    def from_cfg(cfg, num_envs, device):
+        # None unless the task yaml has an enabled curriculum section
+        if cfg is None or not cfg.get("enabled", False):
+            return None
+        return Curriculum(cfg, num_envs, device)
+
+    def track(self, target_dist):
+        torch.logical_or(self.reached, target_dist < self.success_radius, out=self.reached)
+
+    def end_attempts(self, env_ids):
+        active = self.active[env_ids]
+        success = self.reached[env_ids].float()
+        rate = self.success_rate[env_ids]
+        rate += active.float() * self.smoothing * (success - rate)
+
+        up = active & (rate > self.up_threshold)
+        down = active & (rate < self.down_threshold)
+        self.levels[env_ids] = (self.levels[env_ids] + up.long() - down.long()).clamp(0, self.num_levels - 1)
+        # New level, collect new evidence before moving again. torch.where keeps it free of the sync a mask index costs
+        rate = torch.where(up | down, 0.5 * (self.up_threshold + self.down_threshold), rate)
+        self.success_rate[env_ids] = rate
+
+        self.reached[env_ids] = False
+        self.active[env_ids] = True
+
+        self.log_values["curriculum/mean_level"].copy_(self.levels.float().mean())
+        self.log_values["curriculum/max_level_fraction"].copy_((self.levels == self.num_levels - 1).float().mean())
+        self.log_values["curriculum/success_rate"].copy_(self.success_rate.mean())
+
+    def value(self, name, env_ids):
+        easy, hard = self.ranges[name]
+        return easy + (hard - easy) * self.levels[env_ids].float() / max(self.num_levels - 1, 1)
+
+    def sample_offsets(self, name, env_ids):
+        """ (len(env_ids), 2) xy offsets in a random direction at a distance between half and all of value(name). """
+        distance = self.value(name, env_ids) * (0.5 + 0.5 * torch.rand(len(env_ids), device=self.device))
+        angle = torch.rand(len(env_ids), device=self.device) * 2 * math.pi - math.pi
+        return torch.stack((distance * torch.cos(angle), distance * torch.sin(angle)), dim=-1)
@@ -0,0 +1,85 @@
+import math
+import torch
+
+
+def make_sampler(distribution, distribution_parameters):
+    # Returns a function that fills a tensor in place with samples from the distribution
+    low, high = float(distribution_parameters[0]), float(distribution_parameters[1])
+    if distribution == "gaussian" or distribution == "normal":
+        return lambda out: out.normal_(mean=low, std=high)
+    elif distribution == "uniform":
+        return lambda out: out.uniform_(low, high)
+    elif distribution == "loguniform" or distribution == "log_uniform":
+        log_low, log_high = math.log(low), math.log(high)
+        return lambda out: out.uniform_(log_low, log_high).exp_()
+    raise ValueError(f"The specified {distribution} distribution is not supported.")
+
+
+class NoisePlan:
+    """Observation or action noise compiled once from the domain randomization config.
+
+    All buffers are allocated up front and the samplers are bound to their distribution, so
+    `apply` only runs masked in-place tensor ops. It never looks at which envs reset on the
+    host, envs that did not reset or are not due just get an identity noise value.
+    """
+
+    def __init__(self, params, num_envs, dim, device):
+        for key in params.keys():
+            if key not in ("on_reset", "on_interval"):
+                raise ValueError(f"The specified {key} randomization type is not supported.")
+            if params[key]["operation"] not in ("additive", "scaling"):
+                raise ValueError(f"The specified {params[key]['operation']} operation type is not supported.")
+
+        self.params = params
+        self.on_reset = "on_reset" in params.keys()
+        self.on_interval = "on_interval" in params.keys()
+        self.bind()
+
+        self.counter = torch.zeros(num_envs, dtype=torch.int, device=device)
+        self.reset_mask = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self.interval_mask = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        self.mask = torch.zeros((num_envs, 1), device=device)
+        self.sample = torch.zeros((num_envs, dim), device=device)
+        self.correlated_noise = torch.zeros((num_envs, dim), device=device)
+        if self.on_reset and params["on_reset"]["operation"] == "scaling":
+            self.correlated_noise.fill_(1.0)
+
+    def bind(self):
+        # Call again after changing distribution_parameters in params
+        if self.on_reset:
+            self.reset_sampler = make_sampler(self.params["on_reset"]["distribution"], self.params["on_reset"]["distribution_parameters"])
+            self.reset_additive = self.params["on_reset"]["operation"] == "additive"
+        if self.on_interval:
+            self.interval_sampler = make_sampler(self.params["on_interval"]["distribution"], self.params["on_interval"]["distribution_parameters"])
+            self.interval_additive = self.params["on_interval"]["operation"] == "additive"
+            self.frequency_interval = self.params["on_interval"]["frequency_interval"]
+
+    def apply(self, buffer, reset_buf):
+        torch.ne(reset_buf, 0, out=self.reset_mask)
+        self.counter.masked_fill_(self.reset_mask, 0)
+        self.counter += 1
+
+        if self.on_reset:
+            # Correlated noise, redrawn for envs that just reset and held until their next reset
+            # noise += mask * (sample - noise) only replaces the rows of envs that reset
+            self.mask.copy_(self.reset_mask.unsqueeze(-1))
+            self.reset_sampler(self.sample)
+            self.correlated_noise.addcmul_(self.sample.sub_(self.correlated_noise), self.mask)
+            if self.reset_additive:
+                buffer += self.correlated_noise
+            else:
+                buffer *= self.correlated_noise
+
+        if self.on_interval:
+            # Uncorrelated noise for the envs whose interval is up
+            torch.ge(self.counter, self.frequency_interval, out=self.interval_mask)
+            self.counter.masked_fill_(self.interval_mask, 0)
+            self.mask.copy_(self.interval_mask.unsqueeze(-1))
+            self.interval_sampler(self.sample)
+            if self.interval_additive:
+                buffer.addcmul_(self.sample, self.mask)
+            else:
+                # 1 + mask * (sample - 1) leaves envs that are not due unscaled
+                self.sample.sub_(1.0).mul_(self.mask).add_(1.0)
+                buffer *= self.sample
+        return buffer
@@ -0,0 +1,83 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import torch
+
+
+class HistoryBuffer:
+    """ Per env ring buffer of the last `length` frames, kept on the device.
+
+        Every frame is written twice, at head and head + length of a (num_envs, 2 * length, frame_size)
+        tensor, so the last `length` frames (oldest first) are always one contiguous slice of it.
+        `window()` and `stacked()` are views of that slice, nothing is concatenated or allocated per step.
+        Envs flagged with `mark_reset` get their next frame copied into the whole window, with masked
+        in place ops instead of indexing so there is no host sync.
+    """
+
+    def __init__(self, num_envs, length, frame_size, device):
+        self.num_envs = num_envs
+        self.length = length
+        self.frame_size = frame_size
+        self.storage = torch.zeros((num_envs, 2 * length, frame_size), device=device)
+        self.frame = torch.zeros((num_envs, frame_size), device=device)
+        # newest frame is at head + length
+        self.head = length - 1
+        # every env starts with an empty history
+        self.fresh = torch.ones((num_envs, 1, 1), device=device)
+        self.keep = torch.zeros_like(self.fresh)
+
+    def mark_reset(self, reset_buf):
+        # reset_buf is 1 for envs whose history should restart with the next frame
+        self.fresh.view(-1).copy_(reset_buf)
+
+    def push(self, *parts):
+        """ Appends a frame made of the (num_envs, width) parts side by side. """
+        col = 0
+        for part in parts:
+            width = part.shape[1]
+            self.frame[:, col:col + width] = part
+            col += width
+
+        self.head = (self.head + 1) % self.length
+        self.storage[:, self.head] = self.frame
+        self.storage[:, self.head + self.length] = self.frame
+
+        # storage = fresh ? frame : storage
+        self.keep.copy_(self.fresh).neg_().add_(1.0)
+        self.storage.mul_(self.keep).addcmul_(self.frame.unsqueeze(1), self.fresh)
+        self.fresh.zero_()
+
+    def window(self):
+        """ (num_envs, length, frame_size) view, oldest frame first. """
+        return self.storage[:, self.head + 1:self.head + 1 + self.length]
+
+    def stacked(self):
+        """ (num_envs, length * frame_size) view of window(). """
+        return self.window().view(self.num_envs, self.length * self.frame_size)
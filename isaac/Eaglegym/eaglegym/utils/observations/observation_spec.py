@@ -0,0 +1,98 @@
+import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class ObsField(NamedTuple):
+    name: str
+    size: int
+    # Name of the value the field is read from, e.g. 'root_pos'
+    source: str
+    scale: float = 1.0
+    # Source subtracted before scaling, e.g. target relative to the robot
+    relative_to: Optional[str] = None
+
+
+class ObservationSpec:
+    """Declares the layout of an observation vector once for the sim task and the real robot.
+
+    Each field takes `size` values from a named source, optionally subtracts another source,
+    then scales them. `fill` writes a batch of observations into an existing torch obs_buf,
+    `numpy_builder` gives a preallocated single observation builder for the ROS runners.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.slices = {}
+        start = 0
+        for field in self.fields:
+            self.slices[field.name] = slice(start, start + field.size)
+            start += field.size
+        self.size = start
+        self.sources = sorted({f.source for f in self.fields} | {f.relative_to for f in self.fields if f.relative_to})
+
+    def fill(self, obs_buf, **sources):
+        # obs_buf is (num_envs, size), every source is (num_envs, field size), all on the same device
+        for field in self.fields:
+            view = obs_buf[..., self.slices[field.name]]
+            view.copy_(sources[field.source])
+            if field.relative_to is not None:
+                view.sub_(sources[field.relative_to])
+            if field.scale != 1.0:
+                view.mul_(field.scale)
+        return obs_buf
+
+    def numpy_builder(self):
+        return NumpyObservationBuilder(self)
+
+
+class NumpyObservationBuilder:
+    """Single observation builder that never allocates after construction.
+
+    Write the latest values into `sources[name]` (preallocated float32 arrays), then `build()`
+    fills and returns `obs`. The same `obs` array is returned every call, copy it to keep it.
+    """
+
+    def __init__(self, spec: ObservationSpec):
+        self.spec = spec
+        sizes = {}
+        for field in spec.fields:
+            sizes[field.source] = field.size
+            if field.relative_to is not None:
+                sizes[field.relative_to] = field.size
+        self.sources = {name: np.zeros(size, dtype=np.float32) for name, size in sizes.items()}
+        self.obs = np.zeros(spec.size, dtype=np.float32)
+        self.steps = [(self.obs[spec.slices[f.name]], self.sources[f.source],
+                       self.sources[f.relative_to] if f.relative_to is not None else None, np.float32(f.scale))
+                      for f in spec.fields]
+
+    def build(self):
+        for view, source, relative_to, scale in self.steps:
+            if relative_to is not None:
+                np.subtract(source, relative_to, out=view)
+            else:
+                view[:] = source
+            if scale != 1.0:
+                view *= scale
+        return self.obs
+
+
+# Quaternions are w, x, y, z like Isaac Sim returns them
+
+# Edna_Pick_And_Place_Task and the policy_runner on the robot
+EDNA_OBS = ObservationSpec([
+    ObsField('target', 3, 'target_pos', scale=1 / 3, relative_to='root_pos'),
+    ObsField('root_quat', 4, 'root_quat'),
+    ObsField('root_linvel', 3, 'root_linvel', scale=1 / 2),
+    ObsField('root_angvel', 3, 'root_angvel', scale=1 / math.pi),
+])
+
+# Edna_Kinematics_Task
+EDNA_KINEMATICS_OBS = ObservationSpec([
+    ObsField('target_pos', 3, 'target_pos'),
+    ObsField('root_pos', 3, 'root_pos'),
+    ObsField('root_quat', 4, 'root_quat'),
+    ObsField('root_linvel', 3, 'root_linvel'),
+    ObsField('root_angvel', 3, 'root_angvel', scale=1 / math.pi),
+])
@@ -0,0 +1,132 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import time
+import torch
+
+
+class CpuEvent:
+    """ perf_counter stand in for torch.cuda.Event, used for the cpu pipeline. """
+
+    __slots__ = ("t",)
+
+    def __init__(self):
+        self.t = 0.0
+
+    def record(self):
+        self.t = time.perf_counter()
+
+    def synchronize(self):
+        pass
+
+    def elapsed_time(self, end):
+        return (end.t - self.t) * 1000.0
+
+
+class StepProfiler:
+    """ Times the phases of each env step and averages them over a window of steps.
+
+        Every step is `begin()`, one `mark(phase)` at the end of each phase and `end()`. With
+        CUDA events the marks are only recorded on the stream, the host waits on the GPU once
+        per window when the timings are read back. Events are created during the first window
+        and reused after that, so a profiled step allocates nothing.
+
+        `report` holds the averages of the last full window: `<phase>_ms` per phase, `step_ms`
+        for their sum, `env_steps_per_sec` measured over wall time (including whatever runs
+        between steps, e.g. the PPO update) and `sim_env_steps_per_sec` from step_ms alone.
+    """
+
+    def __init__(self, num_envs, window=100, device="cuda:0", use_cuda_events=None):
+        if use_cuda_events is None:
+            use_cuda_events = "cuda" in str(device) and torch.cuda.is_available()
+        self.num_envs = num_envs
+        self.window = window
+        self.use_cuda_events = use_cuda_events
+        self.event_type = torch.cuda.Event if use_cuda_events else CpuEvent
+
+        # Per step in the window: recorded events, the phase each one closes and how many were used
+        self.events = [[] for _ in range(window)]
+        self.phases = [[] for _ in range(window)]
+        self.lengths = [0] * window
+
+        self.step = 0
+        self.count = 0
+        self.totals = {}
+        self.report = {}
+        self.window_start = None
+
+    def record(self, phase):
+        events = self.events[self.step]
+        if self.count == len(events):
+            events.append(self.event_type(enable_timing=True) if self.use_cuda_events else self.event_type())
+            self.phases[self.step].append(phase)
+        else:
+            self.phases[self.step][self.count] = phase
+        events[self.count].record()
+        self.count += 1
+
+    def begin(self):
+        if self.window_start is None:
+            self.window_start = time.perf_counter()
+        self.count = 0
+        self.record(None)
+
+    def mark(self, phase):
+        self.record(phase)
+
+    def end(self):
+        self.lengths[self.step] = self.count
+        self.step += 1
+        if self.step == self.window:
+            self.flush()
+
+    def flush(self):
+        # Only sync of the window, everything before the last event is done once it is
+        last = self.events[self.step - 1][self.lengths[self.step - 1] - 1]
+        last.synchronize()
+        wall_time = time.perf_counter() - self.window_start
+
+        totals = self.totals
+        for phase in totals:
+            totals[phase] = 0.0
+        for step in range(self.step):
+            events, phases = self.events[step], self.phases[step]
+            for k in range(1, self.lengths[step]):
+                totals[phases[k]] = totals.get(phases[k], 0.0) + events[k - 1].elapsed_time(events[k])
+
+        report = {f"{phase}_ms": total / self.step for phase, total in totals.items()}
+        step_ms = sum(totals.values()) / self.step
+        report["step_ms"] = step_ms
+        report["env_steps_per_sec"] = self.num_envs * self.step / wall_time
+        report["sim_env_steps_per_sec"] = self.num_envs * 1000.0 / step_ms if step_ms > 0 else 0.0
+        self.report = report
+
+        self.step = 0
+        self.window_start = time.perf_counter()
@@ -0,0 +1,72 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import torch
+
+
+class PingPongBuffers:
+    """ Two preallocated sets of rl_device tensors the sim thread data is copied into, alternating every step.
+
+        The task reuses obs_buf, rew_buf, reset_buf and states_buf every step, so VecEnvRLGamesMT
+        used to clone them. `receive(data)` copies them into the next slot instead (the sim thread
+        is blocked on the action queue while that happens), so the tensors handed to the PPO thread
+        stay valid until the step after next without allocating anything. States are clamped in place,
+        observations are left for the caller to clamp after observation DR.
+    """
+
+    KEYS = ("obs", "rew", "states", "reset")
+
+    def __init__(self, device, clip_obs):
+        self.device = device
+        self.clip_obs = clip_obs
+        self.slots = None
+        self.index = 0
+
+    def allocate(self, data):
+        self.slots = []
+        for _ in range(2):
+            slot = {key: torch.empty_like(data[key], device=self.device) for key in self.KEYS}
+            slot["extras"] = {}
+            self.slots.append(slot)
+
+    def receive(self, data):
+        if self.slots is None:
+            self.allocate(data)
+        slot = self.slots[self.index]
+        self.index ^= 1
+
+        for key in self.KEYS:
+            slot[key].copy_(data[key], non_blocking=True)
+        slot["states"].clamp_(-self.clip_obs, self.clip_obs)
+        # Same dict object every other step, only its entries change
+        extras = slot["extras"]
+        extras.clear()
+        extras.update(data["extras"])
+        return slot
@@ -47,6 +47,9 @@ class RLGPUAlgoObserver(AlgoObserver):
         self.ep_infos = []
         self.direct_info = {}
         self.writer = self.algo.writer
+        # VecEnvRLGames step profiler, only set when profiling is enabled
+        self.env = getattr(self.algo.vec_env, 'env', None)
+        self.profiler = getattr(self.env, 'profiler', None)
 
     def process_infos(self, infos, done_indices):
         assert isinstance(infos, dict), "RLGPUAlgoObserver expects dict info"
@@ -84,6 +87,13 @@ class RLGPUAlgoObserver(AlgoObserver):
             self.writer.add_scalar(f'{k}/iter', v, epoch_num)
             self.writer.add_scalar(f'{k}/time', v, total_time)
 
+        if self.profiler is not None and self.profiler.report:
+            for k, v in self.profiler.report.items():
+                self.writer.add_scalar(f'profile/{k}', v, frame)
+            task = getattr(self.env, '_task', None)
+            if hasattr(task, 'reset_syncs_per_step'):
+                self.writer.add_scalar('profile/reset_syncs_per_step', task.reset_syncs_per_step, frame)
+
         if self.mean_scores.current_size > 0:
             mean_scores = self.mean_scores.get_mean()
             self.writer.add_scalar('scores/mean', mean_scores, frame)
@@ -0,0 +1,92 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import json
+import os
+
+import numpy as np
+
+KEYS = ("obs", "actions", "rewards", "dones")
+
+
+class RolloutDataset:
+    """ Random minibatches from the shards a RolloutRecorder wrote, without loading them into memory.
+
+        The shards are opened as read only memory maps, `sample` only reads the pages of the rows
+        it picks. With next_obs=True the batch also has the observation one step later of every
+        row, rows where dones is set have the first observation of the next episode there.
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "index.json"), "r") as f:
+            self.index = json.load(f)
+        self.num_envs = self.index["num_envs"]
+        self.shards = []
+        for entry in self.index["shards"]:
+            if entry["rows"] == 0:
+                continue
+            arrays = {key: np.load(os.path.join(directory, entry["name"], f"{key}.npy"), mmap_mode="r") for key in KEYS}
+            self.shards.append((entry["rows"], arrays))
+        self.rows = np.array([rows for rows, _ in self.shards], dtype=np.int64)
+
+    def __len__(self):
+        return int(self.rows.sum())
+
+    def sample(self, batch_size, rng=None, next_obs=False):
+        """ Returns a dict of (batch_size, ...) arrays for obs, actions, rewards, dones (and next_obs). """
+        rng = np.random.default_rng() if rng is None else rng
+        # The last step of a shard has no next observation in it
+        rows = self.rows - self.num_envs if next_obs else self.rows
+        rows = np.maximum(rows, 0)
+        ends = np.cumsum(rows)
+        if ends[-1] == 0:
+            raise ValueError("Not enough recorded steps to sample from")
+
+        picks = rng.integers(0, ends[-1], batch_size)
+        shard_ids = np.searchsorted(ends, picks, side="right")
+        local = picks - (ends - rows)[shard_ids]
+
+        batch = {}
+        for shard_id in np.unique(shard_ids):
+            mask = shard_ids == shard_id
+            # Sorted reads go through the memory map front to back
+            order = np.argsort(local[mask])
+            positions = np.flatnonzero(mask)[order]
+            idx = local[mask][order]
+            arrays = self.shards[shard_id][1]
+            for key in KEYS:
+                if key not in batch:
+                    batch[key] = np.empty((batch_size,) + arrays[key].shape[1:], dtype=arrays[key].dtype)
+                batch[key][positions] = arrays[key][idx]
+            if next_obs:
+                if "next_obs" not in batch:
+                    batch["next_obs"] = np.empty((batch_size,) + arrays["obs"].shape[1:], dtype=arrays["obs"].dtype)
+                batch["next_obs"][positions] = arrays["obs"][idx + self.num_envs]
+        return batch
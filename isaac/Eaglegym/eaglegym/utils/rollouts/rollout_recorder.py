@@ -0,0 +1,140 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import json
+import os
+
+import numpy as np
+import torch
+
+KEYS = ("obs", "actions", "rewards", "dones")
+
+
+def write_index(directory, index):
+    # Written next to the shards and swapped in, a reader never sees half an index
+    path = os.path.join(directory, "index.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+class RolloutRecorder:
+    """ Streams obs, actions, rewards and dones of selected envs into memory mapped .npy shards.
+
+        Every step is gathered on the device into a staging buffer, the host copy and the disk
+        write only happen every `flush_steps` steps. Shards are directories shard_<n>/ with one
+        .npy per key and room for `shard_steps` steps, rows are step major (row = step * num_envs
+        + env), so the next observation of a row is num_envs rows later. index.json lists the
+        shards and their filled rows and is rewritten after every flush, recording into an
+        existing directory appends new shards. Read them back with RolloutDataset.
+    """
+
+    def __init__(self, directory, env_ids, device, shard_steps=10000, flush_steps=64):
+        self.directory = directory
+        self.env_ids = torch.as_tensor(list(env_ids), dtype=torch.long, device=device)
+        self.num_envs = len(self.env_ids)
+        self.shard_rows = shard_steps * self.num_envs
+        self.flush_steps = flush_steps
+        self.staging = None
+        self.staged = 0
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "index.json")
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                self.index = json.load(f)
+            if self.index["num_envs"] != self.num_envs:
+                raise ValueError(f"{directory} was recorded with {self.index['num_envs']} envs, not {self.num_envs}")
+        else:
+            self.index = {"num_envs": self.num_envs, "env_ids": self.env_ids.tolist(), "shards": []}
+        self.shard = None
+        self.shard_entry = None
+
+    def allocate(self, obs, actions, rewards, dones):
+        def staging(tensor):
+            return torch.zeros((self.flush_steps, self.num_envs) + tuple(tensor.shape[1:]), dtype=tensor.dtype, device=self.env_ids.device)
+        # Appending to a directory has to keep its widths, RolloutDataset stacks rows of every shard into one batch
+        for key, tensor in (("obs_dim", obs), ("action_dim", actions)):
+            dim = int(tensor.shape[1])
+            if self.index.get(key, dim) != dim:
+                raise ValueError(f"{self.directory} was recorded with {key} {self.index[key]}, not {dim}")
+            self.index[key] = dim
+        self.staging = {"obs": staging(obs), "actions": staging(actions), "rewards": staging(rewards), "dones": staging(dones)}
+
+    def record(self, obs, actions, rewards, dones):
+        """ Stages one step, obs are the observations the actions were taken from. """
+        if self.staging is None:
+            self.allocate(obs, actions, rewards, dones)
+        k = self.staged
+        for key, tensor in zip(KEYS, (obs, actions, rewards, dones)):
+            torch.index_select(tensor.to(self.env_ids.device), 0, self.env_ids, out=self.staging[key][k])
+        self.staged += 1
+        if self.staged == self.flush_steps:
+            self.flush()
+
+    def open_shard(self):
+        name = f"shard_{len(self.index['shards']):05d}"
+        os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+        shapes = {
+            "obs": (self.shard_rows, self.index["obs_dim"]),
+            "actions": (self.shard_rows, self.index["action_dim"]),
+            "rewards": (self.shard_rows,),
+            "dones": (self.shard_rows,),
+        }
+        dtypes = {"obs": np.float32, "actions": np.float32, "rewards": np.float32, "dones": np.bool_}
+        self.shard = {key: np.lib.format.open_memmap(os.path.join(self.directory, name, f"{key}.npy"), mode="w+",
+                                                     dtype=dtypes[key], shape=shapes[key]) for key in KEYS}
+        self.shard_entry = {"name": name, "rows": 0}
+        self.index["shards"].append(self.shard_entry)
+
+    def flush(self):
+        if self.staged == 0:
+            return
+        rows = self.staged * self.num_envs
+        host = {key: self.staging[key][:self.staged].reshape((rows,) + tuple(self.staging[key].shape[2:])).cpu().numpy() for key in KEYS}
+        self.staged = 0
+
+        offset = 0
+        while offset < rows:
+            if self.shard is None or self.shard_entry["rows"] == self.shard_rows:
+                self.open_shard()
+            start = self.shard_entry["rows"]
+            count = min(rows - offset, self.shard_rows - start)
+            for key in KEYS:
+                self.shard[key][start:start + count] = host[key][offset:offset + count]
+            self.shard_entry["rows"] = start + count
+            offset += count
+        for array in self.shard.values():
+            array.flush()
+        write_index(self.directory, self.index)
+
+    def close(self):
+        self.flush()
+        self.shard = None
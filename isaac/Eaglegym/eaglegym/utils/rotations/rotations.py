@@ -0,0 +1,102 @@
+# Copyright (c) 2018-2022, NVIDIA Corporation
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import math
+from collections import namedtuple
+
+import numpy as np
+import torch
+
+
+# Quaternions are (..., 4) in w, x, y, z order like Isaac Sim's get_world_poses. Every function
+# works on torch tensors and on numpy arrays, angles come back with the quaternion's leading shape.
+_Ops = namedtuple("_Ops", ["atan2", "asin", "clip", "sin", "cos", "stack"])
+
+_TORCH = _Ops(torch.atan2, torch.asin, torch.clamp, torch.sin, torch.cos, lambda parts: torch.stack(parts, dim=-1))
+_NUMPY = _Ops(np.arctan2, np.arcsin, np.clip, np.sin, np.cos, lambda parts: np.stack(parts, axis=-1))
+
+
+def _ops(value):
+    return _TORCH if isinstance(value, torch.Tensor) else _NUMPY
+
+
+def quat_to_euler(quat):
+    """ Roll, pitch and yaw (x, y, z intrinsic), the same angles as squaternion's to_euler. """
+    ops = _ops(quat)
+    w, x, y, z = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    roll = ops.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    # Clipped so rounding on a normalized quaternion can't push asin out of its domain
+    pitch = ops.asin(ops.clip(2 * (w * y - z * x), -1.0, 1.0))
+    yaw = quat_to_yaw(quat)
+    return roll, pitch, yaw
+
+
+def quat_to_yaw(quat):
+    ops = _ops(quat)
+    w, x, y, z = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    return ops.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+
+
+def quat_to_tilt(quat):
+    """ Rotation about y in atan2 form, equal to the pitch while there is no yaw. """
+    ops = _ops(quat)
+    w, x, y, z = quat[..., 0], quat[..., 1], quat[..., 2], quat[..., 3]
+    return ops.atan2(2 * (w * y - x * z), 1 - 2 * (y * y + z * z))
+
+
+def euler_to_quat(roll, pitch, yaw):
+    ops = _ops(yaw)
+    cr, sr = ops.cos(roll * 0.5), ops.sin(roll * 0.5)
+    cp, sp = ops.cos(pitch * 0.5), ops.sin(pitch * 0.5)
+    cy, sy = ops.cos(yaw * 0.5), ops.sin(yaw * 0.5)
+    return ops.stack([
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    ])
+
+
+def wrap_angle(angle):
+    # Into [-pi, pi)
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def world_to_heading(x, y, yaw):
+    # World frame x/y components into the robot's heading frame (rotation by -yaw)
+    ops = _ops(yaw)
+    cos, sin = ops.cos(yaw), ops.sin(yaw)
+    return cos * x + sin * y, cos * y - sin * x
+
+
+def heading_to_world(x, y, yaw):
+    ops = _ops(yaw)
+    cos, sin = ops.cos(yaw), ops.sin(yaw)
+    return cos * x - sin * y, sin * x + cos * y
@@ -27,6 +27,10 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
+# Tasks initialize_torch_task can build, without importing them
+TORCH_TASKS = ("Swerve",)
+
+
 def initialize_task(config, env, init_sim=True):
     # from eaglegym.tasks.swerve import Swerve_Task
     from .config_utils.sim_config import SimConfig
@@ -56,4 +60,23 @@ def initialize_task(config, env, init_sim=True):
 
     env.set_task(task=task, sim_params=sim_config.get_physics_params(), backend="torch", init_sim=init_sim)
 
-    return task
\ No newline at end of file
+    return task
+
+
+def initialize_torch_task(config, env):
+    # Tasks simulated in torch instead of Isaac Sim, picked with backend=torch
+    from eaglegym.tasks.swerve_torch import Swerve_Torch_Task
+
+    task_map = {
+        "Swerve": Swerve_Torch_Task,
+    }
+
+    if config["task_name"] not in task_map:
+        raise ValueError(f"Task {config['task_name']} has no torch backend, available: {list(task_map.keys())}")
+    task = task_map[config["task_name"]](
+        name=config["task_name"], config=config, env=env
+    )
+
+    env.set_task(task=task, backend="torch")
+
+    return task
@@ -0,0 +1,87 @@
+# Compares the single terrain mesh against tiled terrain meshes: stage load time and physics step time.
+#   python benchmark_terrain.py --tile_size 64 --simplify_flat
+# Run it once per layout, --tile_size 0 uses the single mesh.
+
+import os, sys
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SCRIPT_DIR)
+
+import argparse
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--tile_size", type=int, default=64, help="grid cells per tile side, 0 for a single mesh")
+parser.add_argument("--simplify_flat", action="store_true")
+parser.add_argument("--num_terrains", type=int, default=8)
+parser.add_argument("--num_levels", type=int, default=10)
+parser.add_argument("--num_balls", type=int, default=256)
+parser.add_argument("--steps", type=int, default=500)
+args = parser.parse_args()
+
+from omni.isaac.kit import SimulationApp
+simulation_app = SimulationApp({"headless": True})
+
+import numpy as np
+from omni.isaac.core import World
+from omni.isaac.core.objects import DynamicSphere
+from omni.isaac.core.utils.stage import get_current_stage
+
+from terrain_utils import *
+
+
+def build_heightfield(num_terrains, num_levels, size=8., horizontal_scale=0.1, vertical_scale=0.005):
+    # A grid of terrain patches like the curriculum terrains, with flat borders between them
+    np.random.seed(0)
+    pixels = int(size / horizontal_scale)
+    border = pixels // 2
+    heightfield = np.zeros((num_levels * pixels + 2 * border, num_terrains * pixels + 2 * border), dtype=np.int16)
+    for i in range(num_levels):
+        for j in range(num_terrains):
+            terrain = SubTerrain(width=pixels, length=pixels, vertical_scale=vertical_scale, horizontal_scale=horizontal_scale)
+            difficulty = i / num_levels
+            if j % 3 == 0:
+                pyramid_sloped_terrain(terrain, slope=difficulty * 0.4, platform_size=3.)
+            elif j % 3 == 1:
+                pyramid_stairs_terrain(terrain, step_width=0.31, step_height=0.05 + 0.175 * difficulty, platform_size=3.)
+            else:
+                discrete_obstacles_terrain(terrain, 0.025 + difficulty * 0.15, 1., 2., 40, platform_size=3.)
+            heightfield[border + i * pixels:border + (i + 1) * pixels, border + j * pixels:border + (j + 1) * pixels] = terrain.height_field_raw
+    return heightfield, horizontal_scale, vertical_scale
+
+
+world = World(stage_units_in_meters=1.0)
+stage = get_current_stage()
+
+heightfield, horizontal_scale, vertical_scale = build_heightfield(args.num_terrains, args.num_levels)
+start = time.perf_counter()
+vertices, triangles = convert_heightfield_to_trimesh(heightfield, horizontal_scale, vertical_scale, slope_threshold=0.75)
+mesh_time = time.perf_counter() - start
+
+start = time.perf_counter()
+if args.tile_size > 0:
+    add_tiled_terrain_to_stage(stage, vertices, heightfield.shape, tile_size=args.tile_size, simplify_flat=args.simplify_flat)
+else:
+    add_terrain_to_stage(stage, vertices, triangles)
+stage_time = time.perf_counter() - start
+
+# Balls dropped all over the terrain so the broadphase has work to do
+extent = np.array(heightfield.shape) * horizontal_scale
+for k in range(args.num_balls):
+    x, y = np.random.uniform(0, 1, 2) * extent
+    DynamicSphere(prim_path=f"/World/balls/ball_{k}", name=f"ball_{k}", translation=np.array([x, y, 1.0]), radius=0.1)
+
+start = time.perf_counter()
+world.reset()
+reset_time = time.perf_counter() - start
+
+start = time.perf_counter()
+for _ in range(args.steps):
+    world.step(render=False)
+step_time = (time.perf_counter() - start) / args.steps
+
+layout = f"{args.tile_size}x{args.tile_size} tiles" if args.tile_size > 0 else "single mesh"
+print(f"{layout}{' (flat tiles simplified)' if args.simplify_flat else ''}: {heightfield.shape} heightfield, {len(triangles)} triangles")
+print(f"mesh build {mesh_time * 1000:.0f} ms, stage load {stage_time * 1000:.0f} ms, "
+      f"reset {reset_time * 1000:.0f} ms, step {step_time * 1000:.2f} ms")
+
+simulation_app.close()
@@ -119,7 +119,8 @@ class TerrainCreation(BaseTask):
 
         position = np.array([-6.0, 48.0, 0])
         orientation = np.array([0.70711, 0.0, 0.0, -0.70711])
-        add_terrain_to_stage(stage=self._stage, vertices=vertices, triangles=triangles, position=position, orientation=orientation)
+        # One collision mesh per 64x64 cell tile, add_terrain_to_stage builds a single mesh instead
+        add_tiled_terrain_to_stage(stage=self._stage, vertices=vertices, grid_shape=heightfield.shape, tile_size=64, position=position, orientation=orientation)
 
     def get_ball(self):
         ball = DynamicSphere(prim_path=self.default_zero_env_path + "/ball",
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+def terrain_key(*parts):
+    """
+    Content address of a terrain, a hash of everything that changes the generated arrays
+    (terrain config, seed, number of robots, scales, ...). Parts must be json serializable.
+    """
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+class TerrainCache:
+    """
+    Stores generated terrain arrays as .npy files in cache_dir/<key>/ and memory maps them back,
+    so a large terrain is loaded without regenerating the heightfield or the triangle mesh.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key, names):
+        # Returns {name: read only memory mapped array} or None if the terrain is not cached
+        path = self.path(key)
+        files = [os.path.join(path, f"{name}.npy") for name in names]
+        if not all(os.path.isfile(f) for f in files):
+            return None
+        return {name: np.load(f, mmap_mode="r") for name, f in zip(names, files)}
+
+    def save(self, key, arrays):
+        # Written to a temporary directory first and renamed, so a killed run never leaves half a terrain
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}-")
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(array))
+        try:
+            os.rename(tmp, self.path(key))
+        except OSError:
+            # Another run cached the same terrain first
+            shutil.rmtree(tmp, ignore_errors=True)
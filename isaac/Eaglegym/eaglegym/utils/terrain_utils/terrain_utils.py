@@ -347,29 +347,63 @@ def convert_heightfield_to_trimesh(height_field_raw, horizontal_scale, vertical_
     vertices[:, 0] = xx.flatten()
     vertices[:, 1] = yy.flatten()
     vertices[:, 2] = hf.flatten() * vertical_scale
-    triangles = -np.ones((2*(num_rows-1)*(num_cols-1), 3), dtype=np.uint32)
-    for i in range(num_rows - 1):
-        ind0 = np.arange(0, num_cols-1) + i*num_cols
-        ind1 = ind0 + 1
-        ind2 = ind0 + num_cols
-        ind3 = ind2 + 1
-        start = 2*i*(num_cols-1)
-        stop = start + 2*(num_cols-1)
-        triangles[start:stop:2, 0] = ind0
-        triangles[start:stop:2, 1] = ind3
-        triangles[start:stop:2, 2] = ind1
-        triangles[start+1:stop:2, 0] = ind0
-        triangles[start+1:stop:2, 1] = ind2
-        triangles[start+1:stop:2, 2] = ind3
+    triangles = grid_triangles(num_rows, num_cols)
 
     return vertices, triangles
+
+def grid_triangles(num_rows, num_cols):
+    """
+    Triangles of a num_rows x num_cols vertex grid stored in row major order.
+    Two triangles per grid cell, (ind0, ind3, ind1) then (ind0, ind2, ind3), cells in row major order.
+    """
+    ind0 = (np.arange(num_rows-1, dtype=np.uint32)[:, None] * num_cols + np.arange(num_cols-1, dtype=np.uint32)[None, :])
+    ind1 = ind0 + 1
+    ind2 = ind0 + num_cols
+    ind3 = ind2 + 1
+    return np.stack((ind0, ind3, ind1, ind0, ind2, ind3), axis=-1).reshape(-1, 3)
+
+def split_trimesh_into_tiles(vertices, grid_shape, tile_size, simplify_flat=False):
+    """
+    Split the mesh of convert_heightfield_to_trimesh into tiles of tile_size x tile_size grid cells.
+    Neighbouring tiles share their border vertices, so there are no gaps between them.
+
+    Parameters:
+        vertices (np.array(float)): vertices returned by convert_heightfield_to_trimesh
+        grid_shape (tuple): shape of the heightfield the vertices were built from
+        tile_size (int): number of grid cells along each side of a tile
+        simplify_flat (bool): replace tiles that are completely flat by two triangles
+    Returns:
+        list of (row, col, vertices, triangles), row and col are the tile coordinates
+    """
+    num_rows, num_cols = grid_shape
+    grid = vertices.reshape(num_rows, num_cols, 3)
+    tiles = []
+    for i, r0 in enumerate(range(0, num_rows - 1, tile_size)):
+        r1 = min(r0 + tile_size, num_rows - 1)
+        for j, c0 in enumerate(range(0, num_cols - 1, tile_size)):
+            c1 = min(c0 + tile_size, num_cols - 1)
+            tile = grid[r0:r1+1, c0:c1+1]
+            if simplify_flat and is_flat_tile(tile):
+                corners = tile[[0, 0, -1, -1], [0, -1, 0, -1]]
+                tiles.append((i, j, np.ascontiguousarray(corners), grid_triangles(2, 2)))
+            else:
+                tiles.append((i, j, tile.reshape(-1, 3), grid_triangles(tile.shape[0], tile.shape[1])))
+    return tiles
+
+def is_flat_tile(tile):
+    # Same height everywhere and no vertex moved by the slope correction, so the corners describe it exactly
+    if np.ptp(tile[..., 2]) != 0:
+        return False
+    x = np.linspace(tile[0, 0, 0], tile[-1, 0, 0], tile.shape[0])
+    y = np.linspace(tile[0, 0, 1], tile[0, -1, 1], tile.shape[1])
+    return np.allclose(tile[..., 0], x[:, None]) and np.allclose(tile[..., 1], y[None, :])
     
 def add_terrain_to_stage(stage, vertices, triangles, position=None, orientation=None):
     num_faces = triangles.shape[0]
     terrain_mesh = stage.DefinePrim("/World/terrain", "Mesh")
     terrain_mesh.GetAttribute("points").Set(vertices)
     terrain_mesh.GetAttribute("faceVertexIndices").Set(triangles.flatten())
-    terrain_mesh.GetAttribute("faceVertexCounts").Set(np.asarray([3]*num_faces))
+    terrain_mesh.GetAttribute("faceVertexCounts").Set(np.full(num_faces, 3, dtype=np.int32))
 
     terrain = XFormPrim(prim_path="/World/terrain",
                         name="terrain",
@@ -383,6 +417,29 @@ def add_terrain_to_stage(stage, vertices, triangles, position=None, orientation=
     physx_collision_api.GetContactOffsetAttr().Set(0.02)
     physx_collision_api.GetRestOffsetAttr().Set(0.00)
 
+def add_tiled_terrain_to_stage(stage, vertices, grid_shape, tile_size=64, position=None, orientation=None, simplify_flat=False):
+    """
+    Same as add_terrain_to_stage but emits one collision mesh per tile under a /World/terrain xform,
+    which keeps the PhysX meshes small for large terrains. See split_trimesh_into_tiles for the parameters.
+    """
+    stage.DefinePrim("/World/terrain", "Xform")
+    terrain = XFormPrim(prim_path="/World/terrain",
+                        name="terrain",
+                        position=position,
+                        orientation=orientation)
+
+    for i, j, tile_vertices, tile_triangles in split_trimesh_into_tiles(vertices, grid_shape, tile_size, simplify_flat):
+        tile_mesh = stage.DefinePrim(f"/World/terrain/tile_{i}_{j}", "Mesh")
+        tile_mesh.GetAttribute("points").Set(tile_vertices)
+        tile_mesh.GetAttribute("faceVertexIndices").Set(tile_triangles.flatten())
+        tile_mesh.GetAttribute("faceVertexCounts").Set(np.full(tile_triangles.shape[0], 3, dtype=np.int32))
+
+        UsdPhysics.CollisionAPI.Apply(tile_mesh)
+        physx_collision_api = PhysxSchema.PhysxCollisionAPI.Apply(tile_mesh)
+        physx_collision_api.GetContactOffsetAttr().Set(0.02)
+        physx_collision_api.GetRestOffsetAttr().Set(0.00)
+    return terrain
+
 
 class SubTerrain:
     def __init__(self, terrain_name="terrain", width=256, length=256, vertical_scale=1.0, horizontal_scale=1.0):
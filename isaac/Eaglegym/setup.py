@@ -18,7 +18,6 @@ INSTALL_REQUIRES = [
     "redis==3.5.3", # needed by Ray on Windows
     "rl-games==1.6.0",
     "shapely",
-    "squaternion",
     "torchgeometry",
     "robotpy==2022.4.8",
     "wpilib==2022.4.1.6"
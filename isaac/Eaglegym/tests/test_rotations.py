@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from eaglegym.utils.rotations.rotations import (
+    euler_to_quat, heading_to_world, quat_to_euler, quat_to_tilt, quat_to_yaw, wrap_angle, world_to_heading)
+
+
+# The scalar versions these replaced: squaternion's to_euler and the atan2 in ChargeStationView.if_balanced
+def scalar_euler(w, x, y, z):
+    roll = math.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    pitch = math.asin(max(-1.0, min(1.0, 2 * (w * y - z * x))))
+    yaw = math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    return roll, pitch, yaw
+
+
+def scalar_tilt(w, x, y, z):
+    return math.atan2(2 * y * w - 2 * x * z, 1 - 2 * y * y - 2 * z * z)
+
+
+@pytest.fixture
+def quats():
+    quats = np.random.default_rng(0).normal(size=(1000, 4))
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("as_tensor", [False, True])
+def test_quat_to_euler(quats, as_tensor):
+    expected = np.array([scalar_euler(*quat) for quat in quats.tolist()])
+    batch = torch.from_numpy(quats) if as_tensor else quats
+    euler = np.stack([np.asarray(angle) for angle in quat_to_euler(batch)], axis=-1)
+    assert np.allclose(euler, expected, atol=1e-12)
+    assert np.allclose(np.asarray(quat_to_yaw(batch)), expected[:, 2], atol=1e-12)
+
+
+@pytest.mark.parametrize("as_tensor", [False, True])
+def test_quat_to_tilt(quats, as_tensor):
+    expected = np.array([scalar_tilt(*quat) for quat in quats.tolist()])
+    batch = torch.from_numpy(quats) if as_tensor else quats
+    assert np.allclose(np.asarray(quat_to_tilt(batch)), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("as_tensor", [False, True])
+def test_euler_round_trip(quats, as_tensor):
+    batch = torch.from_numpy(quats) if as_tensor else quats
+    roll, pitch, yaw = quat_to_euler(batch)
+    again = quat_to_euler(euler_to_quat(roll, pitch, yaw))
+    for angle, expected in zip(again, (roll, pitch, yaw)):
+        assert np.allclose(np.asarray(angle), np.asarray(expected), atol=1e-9)
+
+
+def test_single_quaternion():
+    quat = torch.tensor([math.cos(0.3), 0.0, 0.0, math.sin(0.3)], dtype=torch.float64)
+    assert math.isclose(float(quat_to_yaw(quat)), 0.6, abs_tol=1e-12)
+
+
+def test_wrap_angle():
+    angles = np.linspace(-20, 20, 101)
+    expected = np.arctan2(np.sin(angles), np.cos(angles))
+    assert np.allclose(wrap_angle(angles), expected, atol=1e-12)
+    assert np.allclose(wrap_angle(torch.from_numpy(angles)).numpy(), expected, atol=1e-12)
+
+
+def test_heading_frame_round_trip():
+    rng = np.random.default_rng(1)
+    x, y, yaw = (torch.from_numpy(rng.uniform(-5, 5, 100)) for _ in range(3))
+    hx, hy = world_to_heading(x, y, yaw)
+    # Rotating back by the heading recovers the world components, and length is kept
+    wx, wy = heading_to_world(hx, hy, yaw)
+    assert torch.allclose(wx, x) and torch.allclose(wy, y)
+    assert torch.allclose(hx * hx + hy * hy, x * x + y * y)
+    hx, hy = world_to_heading(1.0, 0.0, np.float64(math.pi / 2))
+    assert math.isclose(hx, 0.0, abs_tol=1e-12) and math.isclose(hy, -1.0, abs_tol=1e-12)
@@ -1,5 +1,5 @@
 import math
-from squaternion import Quaternion
+from hardware_interface.rotations import quat_to_euler
 
 from wpimath.geometry import Rotation2d
 class NavxSim:
@@ -16,14 +16,11 @@ class NavxSim:
         
         self.offset = 0
         
-        self.quat = Quaternion()
+        self.quat = [1.0, 0.0, 0.0, 0.0]
 
     def update(self, w, x, y, z, angular_velocity_x, angular_velocity_y, angular_velocity_z, linear_acceleration_x, linear_acceleration_y, linear_acceleration_z):
-        self.quat = Quaternion(w, x, y, z)
-        euler = self.quat.to_euler()
-        self.roll = euler[0]
-        self.pitch = euler[1]
-        self.yaw = euler[2]
+        self.quat = [w, x, y, z]
+        self.roll, self.pitch, self.yaw = quat_to_euler(w, x, y, z)
         self.angular_velocity_x = angular_velocity_x
         self.angular_velocity_y = angular_velocity_y
         self.angular_velocity_z = angular_velocity_z
@@ -56,7 +53,7 @@ class NavxSim:
         return Rotation2d.fromDegrees(self.getYawDegrees())
     
     def getQuaternionWXYZ(self):
-        return [self.quat.w, self.quat.x, self.quat.y, self.quat.z]
+        return list(self.quat)
     
     def getAngularVelocityXYZ(self):
         return [self.angular_velocity_x, self.angular_velocity_y, self.angular_velocity_z]
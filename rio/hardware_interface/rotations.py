@@ -0,0 +1,47 @@
+import math
+
+# Quaternion/euler math for the navX. Every function takes separate w, x, y, z components (or
+# yaw/vector components). Plain floats use math. Equally shaped numpy arrays of components, e.g. the
+# columns of a logged run, use numpy, which is only imported when one is passed so the RIO doesn't
+# need it. Same angles as eaglegym's utils/rotations/rotations.py.
+
+
+def _lib(value):
+    if type(value).__module__ == "numpy":
+        import numpy
+        return numpy
+    return None
+
+
+def _atan2(lib, y, x):
+    return math.atan2(y, x) if lib is None else lib.arctan2(y, x)
+
+
+def quat_to_euler(w, x, y, z):
+    # Roll, pitch, yaw (x, y, z intrinsic), the same angles as squaternion's to_euler
+    lib = _lib(w)
+    roll = _atan2(lib, 2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    # Clipped so rounding on a normalized quaternion can't push asin out of its domain
+    sinp = 2 * (w * y - z * x)
+    if lib is None:
+        pitch = math.asin(max(-1.0, min(1.0, sinp)))
+    else:
+        pitch = lib.arcsin(lib.clip(sinp, -1.0, 1.0))
+    yaw = quat_to_yaw(w, x, y, z)
+    return roll, pitch, yaw
+
+
+def quat_to_yaw(w, x, y, z):
+    return _atan2(_lib(w), 2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+
+
+def wrap_angle(angle):
+    # Into [-pi, pi)
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def world_to_heading(x, y, yaw):
+    # World frame x/y components into the robot's heading frame (rotation by -yaw)
+    lib = _lib(yaw)
+    cos, sin = (math.cos(yaw), math.sin(yaw)) if lib is None else (lib.cos(yaw), lib.sin(yaw))
+    return cos * x + sin * y, cos * y - sin * x
@@ -154,16 +154,35 @@ def serviceAction(publisher : DDS_Publisher):
 STAGE_PARTICIPANT_NAME = "ROS2_PARTICIPANT_LIB::stage_broadcaster"
 STAGE_WRITER_NAME = "stage_publisher::stage_writer"
 
+STAGE_HEARTBEAT_PERIOD = 1.0 # seconds
+
+# Last stage sample written and when, so we only publish on change (plus a slow heartbeat)
+last_stage_sample : dict = None
+last_stage_time = 0.0
+
 def stageBroadcasterThread():
+    global last_stage_sample
     stage_publisher = initDDS(DDS_Publisher, STAGE_PARTICIPANT_NAME, STAGE_WRITER_NAME)
+    # A new writer has no history, so always send the current stage first
+    last_stage_sample = None
     threadLoop('stage-broadcaster', stage_publisher, stageBroadcasterAction)
 
 def stageBroadcasterAction(publisher : DDS_Publisher):
     global frc_stage
     global fms_attached
-    is_disabled = wpilib.DriverStation.isDisabled()
-    
-    publisher.write({ "data": f"{frc_stage}|{fms_attached}|{is_disabled}" })
+    global last_stage_sample
+    global last_stage_time
+    sample = {
+        "stage": frc_stage,
+        "fms_attached": bool(fms_attached),
+        "is_disabled": wpilib.DriverStation.isDisabled()
+    }
+
+    now = time.monotonic()
+    if sample != last_stage_sample or now - last_stage_time >= STAGE_HEARTBEAT_PERIOD:
+        publisher.write(sample)
+        last_stage_sample = sample
+        last_stage_time = now
 ############################################
 
 ################## IMU #####################   
@@ -0,0 +1,52 @@
+'''
+    Checks hardware_interface.rotations against the scalar formulas squaternion's
+    to_euler uses, for single floats and for numpy arrays of components.
+'''
+
+import math
+
+import numpy as np
+
+from hardware_interface.rotations import quat_to_euler, quat_to_yaw, wrap_angle, world_to_heading
+
+
+def scalar_euler(w, x, y, z):
+    # squaternion Quaternion.to_euler
+    roll = math.atan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    pitch = math.asin(max(-1.0, min(1.0, 2 * (w * y - z * x))))
+    yaw = math.atan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    return roll, pitch, yaw
+
+
+def random_quats(count=1000):
+    quats = np.random.default_rng(0).normal(size=(count, 4))
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
+
+
+def test_quat_to_euler_floats():
+    for w, x, y, z in random_quats().tolist():
+        expected = scalar_euler(w, x, y, z)
+        assert np.allclose(quat_to_euler(w, x, y, z), expected, atol=1e-12)
+        assert math.isclose(quat_to_yaw(w, x, y, z), expected[2], abs_tol=1e-12)
+
+
+def test_quat_to_euler_arrays():
+    quats = random_quats()
+    expected = np.array([scalar_euler(*quat) for quat in quats.tolist()])
+    assert np.allclose(np.stack(quat_to_euler(*quats.T), axis=-1), expected, atol=1e-12)
+
+
+def test_quat_to_euler_gimbal_lock():
+    # Rounding can push the asin argument just past 1 at +-90 degrees pitch
+    half = math.sqrt(0.5) + 1e-12
+    assert math.isclose(quat_to_euler(half, 0.0, half, 0.0)[1], math.pi / 2, abs_tol=1e-5)
+
+
+def test_wrap_angle():
+    for angle in np.linspace(-20, 20, 101).tolist():
+        assert math.isclose(wrap_angle(angle), math.atan2(math.sin(angle), math.cos(angle)), abs_tol=1e-12)
+
+
+def test_world_to_heading():
+    x, y = world_to_heading(1.0, 0.0, math.pi / 2)
+    assert math.isclose(x, 0.0, abs_tol=1e-12) and math.isclose(y, -1.0, abs_tol=1e-12)
@@ -5,7 +5,7 @@ from launch.actions import RegisterEventHandler, DeclareLaunchArgument, SetEnvir
 from launch.substitutions import LaunchConfiguration, Command, PythonExpression, TextSubstitution
 from launch.event_handlers import OnProcessExit
 from launch_ros.actions import Node
-from launch.conditions import IfCondition
+from launch.conditions import IfCondition, UnlessCondition
 from launch.events import Shutdown
 
 # Easy use of namespace since args are not strings
@@ -18,6 +18,7 @@ def generate_launch_description():
     forward_command_controllers = LaunchConfiguration('forward_command_controller')
     namespace = LaunchConfiguration('namespace')
     hardware_plugin = LaunchConfiguration('hardware_plugin')
+    python_container = LaunchConfiguration('python_container')
 
     # Process the URDF file
     description_pkg_path = os.path.join(get_package_share_directory('edna_description'))
@@ -133,7 +134,8 @@ def generate_launch_description():
         executable='zed_conversion',
         name='zed_object_conversion',
         output='screen',
-        parameters=[{}]
+        parameters=[{}],
+        condition=UnlessCondition(python_container),
     )
 
 
@@ -165,6 +167,10 @@ def generate_launch_description():
             'forward_command_controller',
             default_value='false',
             description='Forward commands for ros2 control'),
+        DeclareLaunchArgument(
+            'python_container',
+            default_value='false',
+            description='Leave the Python nodes to pythonContainer.launch.py'),
         node_robot_state_publisher,
         control_node,
         joint_state_broadcaster_spawner,
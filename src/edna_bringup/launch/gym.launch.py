@@ -4,13 +4,14 @@ from launch import LaunchDescription
 from launch.actions import RegisterEventHandler, DeclareLaunchArgument
 from launch.substitutions import LaunchConfiguration, Command, PythonExpression
 from launch_ros.actions import Node
-from launch.conditions import IfCondition
+from launch.conditions import IfCondition, UnlessCondition
 
 # Easy use of namespace since args are not strings
 # NAMESPACE = os.environ.get('ROS_NAMESPACE') if 'ROS_NAMESPACE' in os.environ else 'default'
 
 def generate_launch_description():
     use_sim_time = LaunchConfiguration('use_sim_time')
+    python_container = LaunchConfiguration('python_container')
     
     policy = Node(
         package='policy_runner',
@@ -20,7 +21,8 @@ def generate_launch_description():
             'use_sim_time': use_sim_time,
             'odom_topic': '/saranga/zed/odom',
             'target_topic': '/real/obj_det_pose',
-        }]
+        }],
+        condition=UnlessCondition(python_container),
     )
     
     # Launch!
@@ -29,5 +31,9 @@ def generate_launch_description():
             'use_sim_time',
             default_value='false',
             description='Use sim time if true'),
+        DeclareLaunchArgument(
+            'python_container',
+            default_value='false',
+            description='Leave the Python nodes to pythonContainer.launch.py'),
         policy
     ])
\ No newline at end of file
@@ -0,0 +1,49 @@
+from launch import LaunchDescription
+from launch.actions import DeclareLaunchArgument, OpaqueFunction
+from launch.substitutions import LaunchConfiguration
+from launch_ros.actions import Node
+
+# Runs the Python nodes in one process instead of one process each.
+# Start the layers with python_container:=true so they skip their own copies of these nodes.
+
+def launch_container(context):
+    use_sim_time = LaunchConfiguration('use_sim_time')
+    namespace = LaunchConfiguration('namespace')
+    nodes = LaunchConfiguration('nodes').perform(context).split()
+
+    container = Node(
+        package='python_container',
+        namespace=namespace,
+        executable='container',
+        output='screen',
+        arguments=nodes,
+        # Parameters are shared by every node in the process
+        parameters=[{
+            'use_sim_time': use_sim_time,
+            # frc_auton reader
+            'auton_timeline': 'cone',
+            'auton_mode': 'timeline',
+            # policy runner
+            'odom_topic': '/saranga/zed/odom',
+            'target_topic': '/real/obj_det_pose',
+        }],
+    )
+    return [container]
+
+def generate_launch_description():
+    # Launch!
+    return LaunchDescription([
+        DeclareLaunchArgument(
+            'use_sim_time',
+            default_value='false',
+            description='Use sim time if true'),
+        DeclareLaunchArgument(
+            'namespace',
+            default_value='default',
+            description='The namespace of nodes and links'),
+        DeclareLaunchArgument(
+            'nodes',
+            default_value='zed_conversion joint_trajectory_teleop frc_auton_reader policy_runner',
+            description='Space separated nodes to load, see python_container.container.NODES'),
+        OpaqueFunction(function=launch_container),
+    ])
@@ -4,7 +4,7 @@ from launch import LaunchDescription
 from launch.actions import RegisterEventHandler, DeclareLaunchArgument
 from launch.substitutions import LaunchConfiguration, Command, PythonExpression
 from launch_ros.actions import Node
-from launch.conditions import IfCondition
+from launch.conditions import IfCondition, UnlessCondition
 
 # Easy use of namespace since args are not strings
 # NAMESPACE = os.environ.get('ROS_NAMESPACE') if 'ROS_NAMESPACE' in os.environ else 'default'
@@ -14,6 +14,7 @@ def generate_launch_description():
     namespace = LaunchConfiguration('namespace')
     joystick_file = LaunchConfiguration('joystick_file')
     enable_joy = LaunchConfiguration('enable_joy')
+    python_container = LaunchConfiguration('python_container')
     
     frc_auton_reader = Node(
         package = "frc_auton",
@@ -22,7 +23,10 @@ def generate_launch_description():
         name = "frc_auton_node",
         parameters=[{
             "auton_name": "24",   
-        }]
+            "auton_timeline": "cone",
+            "auton_mode": "timeline",
+        }],
+        condition=UnlessCondition(python_container),
     )
     frc_teleop_writer = Node(
         package = "frc_auton",
@@ -62,7 +66,8 @@ def generate_launch_description():
         namespace=namespace,
         executable='joint_trajectory_teleop',
         name='joint_trajectory_teleop',
-        parameters=[{'use_sim_time': use_sim_time}]
+        parameters=[{'use_sim_time': use_sim_time}],
+        condition=UnlessCondition(python_container),
     )
     
     # Launch!
@@ -83,6 +88,10 @@ def generate_launch_description():
             'enable_joy',
             default_value='true',
             description='Enables joystick teleop'),
+        DeclareLaunchArgument(
+            'python_container',
+            default_value='false',
+            description='Leave the Python nodes to pythonContainer.launch.py'),
         joy,
         joy_teleop_twist,
         joint_trajectory_teleop,
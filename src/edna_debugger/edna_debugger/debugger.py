@@ -6,10 +6,12 @@ import sys
 import threading
 
 import rclpy
+from rclpy.executors import SingleThreadedExecutor
 
 from python_qt_binding.QtCore import pyqtSlot
 from python_qt_binding.QtCore import Qt
 from python_qt_binding.QtCore import Signal
+from python_qt_binding.QtCore import QTimer
 from python_qt_binding.QtGui import QFont
 from python_qt_binding.QtWidgets import QApplication
 from python_qt_binding.QtWidgets import QFormLayout
@@ -31,6 +33,7 @@ RANGE = 10000
 LINE_EDIT_WIDTH = 45
 SLIDER_WIDTH = 200
 INIT_NUM_SLIDERS = 7  # Initial number of sliders to show in window
+GUI_UPDATE_RATE = 20  # Hz, joint states can come in much faster than this
 
 # Defined by style - currently using the default style
 DEFAULT_WINDOW_MARGIN = 11
@@ -202,10 +205,8 @@ class JointStatePublisherGui(QMainWindow):
         self.setCentralWidget(self.central_widget)
 
         self.jsp = jsp
-        self.jsp.set_source_update_cb(self.sliderUpdateCb)
         self.jsp.set_robot_description_update_cb(self.initializeCb)
 
-        self.running = True
         self.sliders = {}
         self.buttons = {}
 
@@ -214,6 +215,11 @@ class JointStatePublisherGui(QMainWindow):
         # Set up a signal for updating the sliders based on external joint info
         self.sliderUpdateTrigger.connect(self.updateSliders)
 
+        # Refresh the subscribed values at a fixed rate instead of on every joint_states message
+        self.update_timer = QTimer(self)
+        self.update_timer.timeout.connect(self.updateSliders)
+        self.update_timer.start(int(1000 / GUI_UPDATE_RATE))
+
         # Tell self to draw sliders in case the JointStatePublisher already has a robot_description
         self.initialize.emit()
 
@@ -236,7 +242,7 @@ class JointStatePublisherGui(QMainWindow):
             if (name in PNEUMATICS_JOINTS):
                 button = Button(name)
 
-                self.joint_map[name] = {'button': button.button, 'joint': joint}
+                self.joint_map[name] = {'button': button.button, 'joint': joint, 'index': self.jsp.free_index[name], 'shown': None}
 
                 self.scroll_layout.addWidget(button)
                 button.button.toggled.connect(lambda event,name=name: self.onInputValueChanged(name))
@@ -245,7 +251,7 @@ class JointStatePublisherGui(QMainWindow):
             else:
                 slider = Slider(name)
 
-                self.joint_map[name] = {'display_sub': slider.display_sub, 'slider_sub': slider.slider_sub, 'display_pub': slider.display_pub, 'slider_pub': slider.slider_pub, 'joint': joint}
+                self.joint_map[name] = {'display_sub': slider.display_sub, 'slider_sub': slider.slider_sub, 'display_pub': slider.display_pub, 'slider_pub': slider.slider_pub, 'joint': joint, 'index': self.jsp.free_index[name], 'shown': None}
 
                 self.scroll_layout.addWidget(slider)
                 slider.display_pub.textEdited.connect(lambda event,name=name: self.makeSliderEqualToText(name))
@@ -267,9 +273,6 @@ class JointStatePublisherGui(QMainWindow):
 
         self.sliderUpdateTrigger.emit()
 
-    def sliderUpdateCb(self):
-        self.sliderUpdateTrigger.emit()
-
     def initializeCb(self):
         self.initialize.emit()
 
@@ -308,27 +311,38 @@ class JointStatePublisherGui(QMainWindow):
             slidervalue = joint_info['slider_pub'].value()
             joint = joint_info['joint']
             if 'wheel' in name:
-                self.jsp.free_joints_pub[name]['velocity'] = self.sliderToValue(slidervalue, joint)
+                self.jsp.set_pub_velocity(name, self.sliderToValue(slidervalue, joint))
             else:
-                self.jsp.free_joints_pub[name]['position'] = self.sliderToValue(slidervalue, joint)
+                self.jsp.set_pub_position(name, self.sliderToValue(slidervalue, joint))
         elif ('button' in joint_info):
             buttonValue = joint_info['joint']['max'] if joint_info['button'].isChecked() == True else joint_info['joint']['min']
-            self.jsp.free_joints_pub[name]['position'] = buttonValue
+            self.jsp.set_pub_position(name, buttonValue)
             
     @pyqtSlot()
     def updateSliders(self):
+        # Only touch the widgets whose shown value actually changed, 'shown' holds what they display
         for name, joint_info in self.joint_map.items():
             joint = joint_info['joint']
+            index = joint_info['index']
             if ('slider_sub' in joint_info):
                 if 'wheel' in name:
-                    slidervalue = self.valueToSlider(joint['velocity'], joint)
+                    slidervalue = self.valueToSlider(self.jsp.sub_velocities[index], joint)
                 else:
-                    slidervalue = self.valueToSlider(joint['position'], joint)
+                    slidervalue = self.valueToSlider(self.jsp.sub_positions[index], joint)
+                if slidervalue == joint_info['shown']:
+                    continue
+                joint_info['shown'] = slidervalue
                 joint_info['slider_sub'].setValue(slidervalue)
-                joint_info['display_sub'].setText(str(round(self.sliderToValue(slidervalue, joint), 2)))
+                text = str(round(self.sliderToValue(slidervalue, joint), 2))
+                if text != joint_info['display_sub'].text():
+                    joint_info['display_sub'].setText(text)
             elif ('button' in joint_info):
-                buttonvalue = True if joint['position'] == joint['max'] else False
-                if (joint_info['button'].isChecked() == buttonvalue):
+                buttonvalue = True if self.jsp.sub_positions[index] == joint['max'] else False
+                matches = joint_info['button'].isChecked() == buttonvalue
+                if matches == joint_info['shown']:
+                    continue
+                joint_info['shown'] = matches
+                if matches:
                     joint_info['button'].setStyleSheet('background-color: green')
                 else:
                     joint_info['button'].setStyleSheet('background-color: yellow')
@@ -365,13 +379,6 @@ class JointStatePublisherGui(QMainWindow):
         pctvalue = slider / float(RANGE)
         return joint['min'] + (joint['max']-joint['min']) * pctvalue
 
-    def closeEvent(self, event):
-        self.running = False
-
-    def loop(self):
-        while self.running:
-            rclpy.spin_once(self.jsp, timeout_sec=0.1)
-
 
 def main():
     # Initialize rclpy with the command-line arguments
@@ -387,14 +394,23 @@ def main():
     parsed_args = parser.parse_args(args=stripped_args[1:])
 
     app = QApplication(sys.argv)
-    jsp_gui = JointStatePublisherGui('Debugger',
-                                     JointStatePublisher(parsed_args.urdf_file))
+    jsp = JointStatePublisher(parsed_args.urdf_file)
+    jsp_gui = JointStatePublisherGui('Debugger', jsp)
 
     jsp_gui.show()
 
-    threading.Thread(target=jsp_gui.loop).start()
+    # The executor gets its own thread so the publisher timer never waits on the Qt event loop.
+    # Qt only talks to the node through its command queue, the flat joint arrays and signals.
+    executor = SingleThreadedExecutor()
+    executor.add_node(jsp)
+    threading.Thread(target=executor.spin, daemon=True).start()
     signal.signal(signal.SIGINT, signal.SIG_DFL)
-    sys.exit(app.exec_())
+    result = app.exec_()
+
+    executor.shutdown()
+    jsp.destroy_node()
+    rclpy.try_shutdown()
+    sys.exit(result)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -32,11 +32,15 @@
 
 # Standard Python imports
 import argparse
+import array
+import collections
 import math
 import sys
 import time
 import xml.dom.minidom
 
+import numpy as np
+
 # ROS 2 imports
 import rclpy
 import rclpy.node
@@ -194,9 +198,91 @@ class JointStatePublisher(rclpy.node.Node):
         else:
             self.init_urdf(robot)
 
+        self.compile_joints()
+
         if self.robot_description_update_cb is not None:
             self.robot_description_update_cb()
 
+    def resolve_mimic(self, name):
+        # Follow the mimic chain of a joint down to the free joint that drives it,
+        # returning (free joint name, factor, offset) or None if nothing drives it
+        if name in self.free_joints_pub:
+            return name, 1.0, 0.0
+        if name not in self.dependent_joints:
+            return None
+
+        param = self.dependent_joints[name]
+        parent = param['parent']
+        factor = param.get('factor', 1.0)
+        offset = param.get('offset', 0.0)
+        # Handle recursive mimic chain
+        recursive_mimic_chain_joints = [name]
+        while parent in self.dependent_joints:
+            if parent in recursive_mimic_chain_joints:
+                error_message = 'Found an infinite recursive mimic chain'
+                self.get_logger().error(f'{error_message}: {recursive_mimic_chain_joints + [parent]}')
+                sys.exit(1)
+            recursive_mimic_chain_joints.append(parent)
+            param = self.dependent_joints[parent]
+            parent = param['parent']
+            offset += factor * param.get('offset', 0)
+            factor *= param.get('factor', 1)
+        if parent not in self.free_joints_pub:
+            return None
+        return parent, factor, offset
+
+    def compile_joints(self):
+        # Flatten the free joints and the mimic graph into parent index, factor and offset arrays
+        # once per robot description, so every timer tick is a single gather into the command buffers.
+        self.free_index = {name: i for i, name in enumerate(self.free_joints_pub)}
+        self.sub_positions = np.array([joint.get('position', joint['zero']) for joint in self.free_joints_sub.values()], dtype=np.float64)
+        self.sub_velocities = np.array([joint.get('velocity', 0.0) for joint in self.free_joints_sub.values()], dtype=np.float64)
+        self.sub_efforts = np.array([joint.get('effort', 0.0) for joint in self.free_joints_sub.values()], dtype=np.float64)
+        # incoming joint_states name layout -> (free joint indices, message indices)
+        self.source_layouts = {}
+        self.pub_positions = np.array([joint.get('position', joint['zero']) for joint in self.free_joints_pub.values()], dtype=np.float64)
+        self.pub_velocities = np.array([joint.get('velocity', 0.0) for joint in self.free_joints_pub.values()], dtype=np.float64)
+
+        pos_parent, pos_factor, pos_offset = [], [], []
+        vel_parent, vel_factor = [], []
+        for name in self.joint_list:
+            if name not in POSITION_JOINTS and name not in VELOCITY_JOINTS:
+                continue
+            resolved = self.resolve_mimic(name)
+            if resolved is None:
+                self.get_logger().warn(f'{name} is not driven by any free joint, not publishing it')
+                continue
+            parent, factor, offset = resolved
+            if name in POSITION_JOINTS:
+                pos_parent.append(self.free_index[parent])
+                pos_factor.append(factor)
+                pos_offset.append(offset)
+            if name in VELOCITY_JOINTS:
+                vel_parent.append(self.free_index[parent])
+                vel_factor.append(factor)
+
+        self.pos_parent = np.array(pos_parent, dtype=np.intp)
+        self.pos_factor = np.array(pos_factor, dtype=np.float64)
+        self.pos_offset = np.array(pos_offset, dtype=np.float64)
+        self.vel_parent = np.array(vel_parent, dtype=np.intp)
+        self.vel_factor = np.array(vel_factor, dtype=np.float64)
+
+        # The message data are array.array buffers, the numpy views write straight into them
+        self.pos_msg = std_msgs.msg.Float64MultiArray()
+        self.pos_msg.data = array.array('d', bytes(8 * len(pos_parent)))
+        self.pos_data = np.frombuffer(self.pos_msg.data, dtype=np.float64)
+        self.vel_msg = std_msgs.msg.Float64MultiArray()
+        self.vel_msg.data = array.array('d', bytes(8 * len(vel_parent)))
+        self.vel_data = np.frombuffer(self.vel_msg.data, dtype=np.float64)
+
+    # The setters are called from the GUI thread. They only queue the command (deque appends and
+    # pops are atomic) and the timer applies them on the executor thread right before publishing.
+    def set_pub_position(self, name, value):
+        self.pending_commands.append((self.pub_positions, self.free_index[name], value))
+
+    def set_pub_velocity(self, name, value):
+        self.pending_commands.append((self.pub_velocities, self.free_index[name], value))
+
     def parse_dependent_joints(self):
         dj = {}
         dependent_joints = self.get_parameters_by_prefix('dependent_joints')
@@ -252,6 +338,7 @@ class JointStatePublisher(rclpy.node.Node):
         self.declare_ros_parameter('use_mimic_tags', True, ParameterDescriptor(type=ParameterType.PARAMETER_BOOL))
         self.declare_ros_parameter('use_smallest_joint_limits', True, ParameterDescriptor(type=ParameterType.PARAMETER_BOOL))
         self.declare_ros_parameter('delta', 0.0, ParameterDescriptor(type=ParameterType.PARAMETER_DOUBLE))
+        self.declare_ros_parameter('publish_stats_period', 0.0, ParameterDescriptor(type=ParameterType.PARAMETER_DOUBLE))
         # In theory we would also declare 'dependent_joints' and 'zeros' here.
         # Since rclpy doesn't support maps natively, though, we just end up
         # letting 'automatically_declare_parameters_from_overrides' declare
@@ -259,9 +346,11 @@ class JointStatePublisher(rclpy.node.Node):
 
         self.free_joints_sub = {}
         self.free_joints_pub = {}
+        self.pending_commands = collections.deque()
 
         self.joint_list = [] # for maintaining the original order of the joints
         self.dependent_joints = self.parse_dependent_joints()
+        self.compile_joints()
         self.use_mimic = self.get_param('use_mimic_tags')
         self.use_small = self.get_param('use_smallest_joint_limits')
 
@@ -310,35 +399,34 @@ class JointStatePublisher(rclpy.node.Node):
         self.create_subscription(sensor_msgs.msg.JointState, 'joint_states', self.source_cb, 10)
         self.timer = self.create_timer(1.0 / self.get_param('rate'), self.timer_callback)
 
-    def source_cb(self, msg):
-        # self.get_logger().info("ran source callback")
-        for i in range(len(msg.name)):
-            name = msg.name[i]
-            if name not in self.free_joints_sub:
-                continue
+        # Publish rate stability, logged every publish_stats_period seconds when it is > 0
+        self.stats_period = self.get_param('publish_stats_period')
+        self.stats_periods = []
+        self.stats_last_publish = None
+        self.stats_last_report = time.monotonic()
 
-            if msg.position:
-                position = msg.position[i]
-            else:
-                position = None
-            if msg.velocity:
-                velocity = msg.velocity[i]
-            else:
-                velocity = None
-            if msg.effort:
-                effort = msg.effort[i]
-            else:
-                effort = None
+    def compile_source_layout(self, names):
+        # Which of the incoming joints we track and where they go, built once per name order
+        free = [(self.free_index[name], i) for i, name in enumerate(names) if name in self.free_index]
+        layout = (np.array([f for f, _ in free], dtype=np.intp), np.array([i for _, i in free], dtype=np.intp))
+        self.source_layouts[names] = layout
+        return layout
 
-            joint = self.free_joints_sub[name]
-            if position is not None:
-                joint['position'] = position
-            if velocity is not None:
-                joint['velocity'] = velocity
-            if effort is not None:
-                joint['effort'] = effort
+    def source_cb(self, msg):
+        # self.get_logger().info("ran source callback")
+        names = tuple(msg.name)
+        layout = self.source_layouts.get(names)
+        if layout is None:
+            layout = self.compile_source_layout(names)
+        dst, src = layout
+
+        if msg.position:
+            self.sub_positions[dst] = np.asarray(msg.position)[src]
+        if msg.velocity:
+            self.sub_velocities[dst] = np.asarray(msg.velocity)[src]
+        if msg.effort:
+            self.sub_efforts[dst] = np.asarray(msg.effort)[src]
 
-        
         if self.source_update_cb is not None:
             self.source_update_cb()
 
@@ -349,100 +437,59 @@ class JointStatePublisher(rclpy.node.Node):
         self.robot_description_update_cb = user_cb
 
     def timer_callback(self):
-        # Publish Joint States
-        msg = sensor_msgs.msg.JointState()
-        msg.header.stamp = self.get_clock().now().to_msg()
         if self.delta > 0:
             self.update(self.delta)
+        if self.stats_period > 0:
+            self.record_publish_stats()
 
-        # Initialize msg.position, msg.velocity, and msg.effort.
-        has_position = False
-        has_velocity = False
-        has_effort = False
-        for name, joint in self.free_joints_pub.items():
-            if not has_position and 'position' in joint:
-                has_position = True
-            if not has_velocity and 'velocity' in joint:
-                has_velocity = True
-            if not has_effort and 'effort' in joint:
-                has_effort = True
-        num_joints = (len(self.free_joints_pub.items()) +
-                      len(self.dependent_joints.items()))
-        if has_position:
-            msg.position = []
-        if has_velocity:
-            msg.velocity = []
-        if has_effort:
-            msg.effort = num_joints * [0.0]
-        
-        for i, name in enumerate(self.joint_list):
-            msg.name.append(str(name))
-            joint = None
-
-            # Add Free Joint
-            if name in self.free_joints_pub:
-                joint = self.free_joints_pub[name]
-                factor = 1
-                offset = 0
-            # Add Dependent Joint
-            elif name in self.dependent_joints:
-                param = self.dependent_joints[name]
-                parent = param['parent']
-                factor = param.get('factor', 1.0)
-                offset = param.get('offset', 0.0)
-                # Handle recursive mimic chain
-                recursive_mimic_chain_joints = [name]
-                while parent in self.dependent_joints:
-                    if parent in recursive_mimic_chain_joints:
-                        error_message = 'Found an infinite recursive mimic chain'
-                        self.get_logger().error(f'{error_message}: {recursive_mimic_chain_joints + [parent]}')
-                        sys.exit(1)
-                    recursive_mimic_chain_joints.append(parent)
-                    param = self.dependent_joints[parent]
-                    parent = param['parent']
-                    offset += factor * param.get('offset', 0)
-                    factor *= param.get('factor', 1)
-                joint = self.free_joints_pub[parent]
-
-            # the issue here is that its setting [i] either to the joint, or its skipping i in the list when we need it to be the next value.
-            # For some reason, [list].append() ends up putting way too many empty values that come from nowhere into the list.
-            # The best thing to do here would be having two separate iterators which only increment if the variable has a position or a velocity.
-            if has_position and 'position' in joint and name in POSITION_JOINTS:
-                msg.position.append(float(joint['position']) * factor + offset)
-            if has_velocity and 'velocity' in joint and name in VELOCITY_JOINTS:
-                msg.velocity.append(float(joint['velocity']) * factor)
-            if has_effort and 'effort' in joint:
-                msg.effort[i] = float(joint['effort'])
-            
-
-        # Only publish non-empty messages
-        if not (msg.name or msg.position or msg.velocity or msg.effort):
-            return
-
-        pos_msg = std_msgs.msg.Float64MultiArray()
-        vel_msg = std_msgs.msg.Float64MultiArray()
+        while self.pending_commands:
+            values, index, value = self.pending_commands.popleft()
+            values[index] = value
 
-        pos_msg.data = msg.position
-        vel_msg.data = msg.velocity
+        # Only publish once we have a robot
+        if not self.joint_list:
+            return
 
-        self.pub_pos.publish(pos_msg)
-        self.pub_vel.publish(vel_msg)
+        np.take(self.pub_positions, self.pos_parent, out=self.pos_data)
+        self.pos_data *= self.pos_factor
+        self.pos_data += self.pos_offset
+        np.take(self.pub_velocities, self.vel_parent, out=self.vel_data)
+        self.vel_data *= self.vel_factor
+
+        self.pub_pos.publish(self.pos_msg)
+        self.pub_vel.publish(self.vel_msg)
+
+    def record_publish_stats(self):
+        now = time.monotonic()
+        if self.stats_last_publish is not None:
+            self.stats_periods.append(now - self.stats_last_publish)
+        self.stats_last_publish = now
+
+        if now - self.stats_last_report >= self.stats_period and self.stats_periods:
+            periods = np.array(self.stats_periods) * 1000.0
+            target = 1000.0 / self.get_param('rate')
+            self.get_logger().info(
+                f'Publish period over {len(periods)} ticks: mean {periods.mean():.2f} ms (target {target:.2f} ms), '
+                f'std {periods.std():.2f} ms, max {periods.max():.2f} ms')
+            self.stats_periods = []
+            self.stats_last_report = now
 
     def update(self, delta):
         for name, joint in self.free_joints_sub.items():
+            i = self.free_index[name]
             forward = joint.get('forward', True)
             if forward:
-                joint['position'] += delta
-                if joint['position'] > joint['max']:
+                self.sub_positions[i] += delta
+                if self.sub_positions[i] > joint['max']:
                     if joint.get('continuous', False):
-                        joint['position'] = joint['min']
+                        self.sub_positions[i] = joint['min']
                     else:
-                        joint['position'] = joint['max']
+                        self.sub_positions[i] = joint['max']
                         joint['forward'] = not forward
             else:
-                joint['position'] -= delta
-                if joint['position'] < joint['min']:
-                    joint['position'] = joint['min']
+                self.sub_positions[i] -= delta
+                if self.sub_positions[i] < joint['min']:
+                    self.sub_positions[i] = joint['min']
                     joint['forward'] = not forward
 
 
@@ -13,6 +13,9 @@ from time import time
 import yaml
 import math
 from edna_interfaces.srv import SetBool
+from frc_auton.stage import StageCache
+from frc_auton.timeline import AutonTimeline
+from frc_auton.replay import BagReplay, find_bag
 
 
 
@@ -48,28 +51,19 @@ class StageSubscriber(Node):
         # rclpy.spin_once(minimal_client)
         # minimal_client.destroy_node()
         file_counter= int(len(os.listdir(f'{self.package_root}/frc_auton/Auto_ros_bag')))-1
-        # self.reader = rosbag2_py.SequentialReader()
-        # self.converter_options = rosbag2_py.ConverterOptions(input_serialization_format='cdr',output_serialization_format='cdr')
-        # self.reader.open(self.storage_options,self.converter_options)
         if file_counter != -1:
             
-            self.subscription = self.create_subscription(String,'frc_stage',self.listener_callback,10)
+            self.stage_cache = StageCache(self)
+            self.stage_cache.add_listener(self.stage_changed)
             self.publish_twist = self.create_publisher(Twist,'swerve_controller/cmd_vel_unstamped',10)
             self.publish_trajectory = self.create_publisher(JointTrajectory,'joint_trajectory_controller/joint_trajectory',10)
             
-            self.changed_stage = False
-            self.stage= ""
-            self.fms = "False"
-            self.isdisabled = "True"
             self.doAuton = False
             
             self.cmd = Twist()
             self.cmd.linear.x = 0.0
             self.cmd.linear.y = 0.0
             self.cmd.angular.z = 0.0
-            self.timeInSeconds = 2.0
-
-            self.taxiTimeDuration = 2.0
 
 
             # joint trajectory msg stuff
@@ -99,31 +93,37 @@ class StageSubscriber(Node):
             self.joint_map = self.yaml['joint_mapping']
             self.joint_limits = self.yaml["joint_limits"]
 
-            # task times
-            self.tasks = [
-                { 'dur': 0.25, 'task': self.gripperManager, 'arg': 0 },
-                { 'dur': 0.5, 'task': self.armHeightManager, 'arg': 1 },
-                { 'dur': 3.5, 'task': self.armExtensionManager, 'arg': 1 },
-                { 'dur': 0.5, 'task': self.gripperManager, 'arg': 1 },
-                { 'dur': 2.5, 'task': self.armExtensionManager, 'arg': 0 },
-                { 'dur': 0.5, 'task': self.armHeightManager, 'arg': 0 },
-                { 'dur': 3.0, 'task': self.goBackwards, 'arg': -1.5 },
-                { 'dur': 0.1, 'task': self.stop, 'arg': 0 },
-                { 'dur': 2.1, 'task': self.turnAround, 'arg': math.pi / 2 },
-                { 'dur': 0.1, 'task': self.stop, 'arg': 0 },
-            ]
-
-            self.conePlacementDuration = 0
-            for task in self.tasks:
-                self.conePlacementDuration += task['dur']
-
-
-            # TURN AROUND STUFF
-            self.turnCmd = Twist()
-            self.turnCmd.linear.x = 0.0
-            self.turnCmd.linear.y = 0.0
-            self.turnCmd.angular.z = 0.0
-            self.turnTimeDuration = 2.0
+            # Last published setpoints, we only publish when these change
+            self.last_twist = None
+            self.last_positions = None
+
+            # task timeline
+            self.declare_parameter('auton_timeline', 'cone')
+            self.declare_parameter('auton_tasks_file', os.path.join(self.project_root_path, 'src/edna_bringup/config/auton-tasks.yaml'))
+            self.declare_parameter('auton_rate', 50.0)
+            self.timeline = AutonTimeline.from_yaml(
+                self.get_parameter('auton_tasks_file').value,
+                self.get_parameter('auton_timeline').value,
+                {
+                    'gripper': self.gripperManager,
+                    'arm_height': self.armHeightManager,
+                    'arm_extension': self.armExtensionManager,
+                    'drive': self.drive,
+                    'turn': self.turnAround,
+                    'stop': self.stop,
+                })
+
+            # Replay a recorded bag instead of the task timeline
+            self.declare_parameter('auton_mode', 'timeline') # timeline or replay
+            self.declare_parameter('auton_bag', '') # bag in Auto_ros_bag to replay, newest when empty
+            self.replay = None
+            if self.get_parameter('auton_mode').value == 'replay':
+                self.replay_path = find_bag(f'{self.package_root}/frc_auton/Auto_ros_bag', self.get_parameter('auton_bag').value)
+                self.get_logger().info(f"Replaying auton from {self.replay_path}")
+                self.startReplay()
+
+            # Auton runs off its own timer so its timing does not depend on stage traffic
+            self.auton_timer = self.create_timer(1.0 / self.get_parameter('auton_rate').value, self.auton_timer_callback)
 
 
 
@@ -134,8 +134,9 @@ class StageSubscriber(Node):
 
     def initAuton(self):
         self.startTime = time()
-        self.turnStartTime = self.startTime + self.conePlacementDuration + 2
-        self.changed_stage = False
+        self.timeline.reset()
+        self.last_twist = None
+        self.last_positions = None
         self.doAuton = True
         self.flip_camera()
 
@@ -143,15 +144,41 @@ class StageSubscriber(Node):
 
     
     def loopAuton(self):
-        # self.taxiAuton()
-        self.coneAuton()
-        #self.turnAuton()
+        if self.replay is not None:
+            self.publishReplay()
+        else:
+            # Publish even once the timeline has finished, the tick that finishes it can still run the final stop
+            self.timeline.update(time() - self.startTime)
+            self.publishChanged()
+
+
+    # BAG REPLAY STUFF
+    def startReplay(self):
+        # Starts prefetching right away so the first messages are ready when auton starts
+        self.replay = BagReplay(self.replay_path, ['cmd_vel_unstamped', 'joint_trajectory'], logger=self.get_logger())
+        self.replay.start()
+
+    def publishReplay(self):
+        for topic, msg in self.replay.pop_due(time() - self.startTime):
+            if topic.endswith('cmd_vel_unstamped'):
+                self.publish_twist.publish(msg)
+            else:
+                self.publish_trajectory.publish(msg)
 
 
     # CONE AUTOMATION STUFF
-    def publishCurrent(self):
-        self.cmds.points = [self.position_cmds]
-        self.publish_trajectory.publish(self.cmds)
+    def publishChanged(self):
+        # Tasks only set setpoints, publish them when a transition actually changed something
+        twist = (self.cmd.linear.x, self.cmd.linear.y, self.cmd.angular.z)
+        if twist != self.last_twist:
+            self.publish_twist.publish(self.cmd)
+            self.last_twist = twist
+
+        positions = tuple(self.position_cmds.positions)
+        if positions != self.last_positions:
+            self.cmds.points = [self.position_cmds]
+            self.publish_trajectory.publish(self.cmds)
+            self.last_positions = positions
 
     def armExtensionManager(self, pos):
         value = ''
@@ -167,7 +194,6 @@ class StageSubscriber(Node):
         self.position_cmds.positions[int(self.joint_map['elevator_center_joint'])] = self.joint_limits["elevator_center_joint"][value]
         self.position_cmds.positions[int(self.joint_map['elevator_outer_2_joint'])] = self.joint_limits["elevator_outer_2_joint"][value]
         self.position_cmds.positions[int(self.joint_map['top_slider_joint'])] = self.joint_limits["top_slider_joint"][value]
-        self.publishCurrent()
         
 
     def armHeightManager(self, pos):
@@ -183,7 +209,6 @@ class StageSubscriber(Node):
         
         self.position_cmds.positions[int(self.joint_map['arm_roller_bar_joint'])] = self.joint_limits["arm_roller_bar_joint"][value]
         self.position_cmds.positions[int(self.joint_map['elevator_outer_1_joint'])] = self.joint_limits["elevator_outer_1_joint"][value]
-        self.publishCurrent()
 
     
     def gripperManager(self, pos):
@@ -199,78 +224,54 @@ class StageSubscriber(Node):
 
         self.position_cmds.positions[int(self.joint_map['top_gripper_left_arm_joint'])] = self.joint_limits["top_gripper_right_arm_joint"][value]
         self.position_cmds.positions[int(self.joint_map['top_gripper_right_arm_joint'])] = self.joint_limits["top_gripper_right_arm_joint"][value]
-        self.publishCurrent()
 
-    def coneAuton(self):
-        elapsedTime = time() - self.startTime
-
-        totalDur = 0.0
-        for task in self.tasks:
-            totalDur += task['dur']
-            if elapsedTime < totalDur:
-                task['task'](task['arg'])
-                return
-    
-    def taxiAuton(self):
-        elapsedTime = time() - self.startTime
-        if elapsedTime < self.taxiTimeDuration:
-            self.cmd.linear.x = 0.5
-            self.publish_twist.publish(self.cmd)
-        else:
-            return
-        
     def stop(self, x):
         self.cmd.linear.x = 0.0
         self.cmd.linear.y = 0.0
         self.cmd.angular.z = 0.0
-        self.publish_twist.publish(self.cmd)
         
-    def goBackwards(self, speed):
-        self.cmd.linear.x = speed
-        self.publish_twist.publish(self.cmd)
-        self.get_logger().warn("GOING BACKWARDS")
+    def drive(self, speed):
+        self.cmd.linear.x = float(speed)
+        self.get_logger().warn("GOING BACKWARDS" if speed < 0 else "GOING FORWARDS")
 
     def turnAround(self, angVel):
-        self.turnCmd.angular.z = angVel
-        self.publish_twist.publish(self.turnCmd)
+        self.cmd.linear.x = 0.0
+        self.cmd.linear.y = 0.0
+        self.cmd.angular.z = float(angVel)
         self.get_logger().warn("TURNING")
 
         
     
     
     def stopAuton(self):
-        self.cmd.linear.x = 0.0
+        # Clears any turn or strafe too, not just driving
+        self.stop(0)
         # Publish twice to just to be safe
         self.publish_twist.publish(self.cmd)
         self.publish_twist.publish(self.cmd)
         self.get_logger().info(f"STOPPED AUTON AT {time()}"),
         self.doAuton = False
+        # Get the bag ready for the next run
+        if self.replay is not None:
+            self.replay.stop()
+            self.startReplay()
 
 
-    def listener_callback(self, msg):
-        
+    def stage_changed(self, stage: StageCache):
         # Check when any state has changed, enabled, disabled, auton, teleop, etc.
-        stage = str(msg.data).split("|")[0]
-        isdisabled = str(msg.data).split("|")[2]
-        if stage != self.stage or isdisabled != self.isdisabled:
-            self.changed_stage = True
-            self.stage = stage
-            self.isdisabled = isdisabled
-        # fms = str(msg.data).split("|")[1]
-
-        # Execute auton actions
-        if(stage.lower() == 'auton' and self.isdisabled == "False"):# and fms == 'True' ):
-            if self.changed_stage:
+        if stage.is_auton_enabled():# and stage.fms_attached ):
+            # Only the fms flag changed, keep the running auton going
+            if not self.doAuton:
                 self.initAuton()
-            
-            if self.doAuton:
-                self.loopAuton()
         # We have moved out of auton enabled mode so stop if we are still running
-        else:
-            if self.doAuton:
-                self.stopAuton()
+        elif self.doAuton:
+            self.stopAuton()
+
+    def auton_timer_callback(self):
+        # Execute auton actions
+        if self.doAuton:
+            self.loopAuton()
 
-                
 
 
 
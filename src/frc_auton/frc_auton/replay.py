@@ -0,0 +1,110 @@
+import os
+import queue
+import threading
+import yaml
+import rosbag2_py
+from rclpy.serialization import deserialize_message
+from rosidl_runtime_py.utilities import get_message
+
+
+def find_bag(bag_root, name=''):
+    # Returns the selected bag directory, or the newest bag_<n> recorded by the BagWriter when no name is given
+    if name:
+        path = os.path.join(bag_root, name)
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"No auton bag '{name}' in {bag_root}")
+        return path
+
+    bags = [d for d in os.listdir(bag_root) if d.startswith('bag_') and d[4:].isdigit()]
+    if len(bags) == 0:
+        raise FileNotFoundError(f"No auton bags in {bag_root}")
+    return os.path.join(bag_root, max(bags, key=lambda d: int(d[4:])))
+
+
+class BagReplay:
+    """Streams the messages of a recorded bag with their original relative timing.
+
+    A background thread reads and deserializes messages ahead of time into a bounded queue,
+    so the auton timer only has to pop the messages that are due and publish them.
+    `topics` is the list of topic name suffixes to replay, e.g. 'cmd_vel_unstamped'.
+    """
+
+    def __init__(self, path, topics, prefetch=256, logger=None):
+        self.path = path
+        self.topics = topics
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=prefetch)
+        self.next_msg = None
+        self.finished = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.prefetch, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def open_reader(self):
+        with open(os.path.join(self.path, 'metadata.yaml'), 'r') as f:
+            metadata = yaml.safe_load(f)['rosbag2_bagfile_information']
+        reader = rosbag2_py.SequentialReader()
+        storage_options = rosbag2_py.StorageOptions(uri=self.path, storage_id=metadata['storage_identifier'])
+        converter_options = rosbag2_py.ConverterOptions(input_serialization_format='cdr', output_serialization_format='cdr')
+        reader.open(storage_options, converter_options)
+        return reader
+
+    def put(self, item):
+        # Block while the queue is full, but keep checking if we were stopped
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def prefetch(self):
+        try:
+            self.read_bag()
+        except Exception as e:
+            # A bad bag would otherwise end the thread silently and replay would publish nothing
+            message = f"Auton replay of {self.path} failed: {e}"
+            if self.logger is not None:
+                self.logger.error(message)
+            else:
+                print(message)
+        # Marks the end of the bag
+        self.put(None)
+
+    def read_bag(self):
+        reader = self.open_reader()
+        msg_types = {}
+        for topic in reader.get_all_topics_and_types():
+            if topic.name.endswith(tuple(self.topics)):
+                msg_types[topic.name] = get_message(topic.type)
+        reader.set_filter(rosbag2_py.StorageFilter(topics=list(msg_types.keys())))
+
+        start_time = None
+        while reader.has_next() and not self.stop_event.is_set():
+            topic, data, timestamp = reader.read_next()
+            if start_time is None:
+                start_time = timestamp
+            self.put(((timestamp - start_time) / 1e9, topic, deserialize_message(data, msg_types[topic])))
+
+    def pop_due(self, elapsed):
+        # Returns the (topic, msg) pairs whose relative time is at or before elapsed seconds
+        due = []
+        while not self.finished:
+            if self.next_msg is None:
+                try:
+                    self.next_msg = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if self.next_msg is None:
+                    self.finished = True
+                    break
+            if self.next_msg[0] > elapsed:
+                break
+            due.append(self.next_msg[1:])
+            self.next_msg = None
+        return due
@@ -0,0 +1,44 @@
+from rclpy.node import Node
+from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSDurabilityPolicy, QoSHistoryPolicy
+from edna_interfaces.msg import FrcStage
+
+# The RIO only writes the stage when it changes (plus a slow heartbeat) with transient local
+# durability, so a late joining node still gets the current stage as soon as it subscribes
+STAGE_QOS = QoSProfile(
+    history=QoSHistoryPolicy.KEEP_LAST,
+    depth=1,
+    reliability=QoSReliabilityPolicy.RELIABLE,
+    durability=QoSDurabilityPolicy.TRANSIENT_LOCAL,
+)
+
+
+class StageCache:
+    """Keeps the latest FRC stage from the RIO and notifies listeners when it changes."""
+
+    def __init__(self, node: Node, topic='frc_stage'):
+        self.stage = "DISABLED"
+        self.fms_attached = False
+        self.is_disabled = True
+        self.listeners = []
+        self.subscription = node.create_subscription(FrcStage, topic, self.stage_callback, STAGE_QOS)
+
+    def add_listener(self, callback):
+        # callback(stage_cache) is called every time the stage, fms or disabled state changes
+        self.listeners.append(callback)
+
+    def is_auton_enabled(self) -> bool:
+        return self.stage.lower() == 'auton' and not self.is_disabled
+
+    def is_teleop_enabled(self) -> bool:
+        return self.stage.lower() == 'teleop' and not self.is_disabled
+
+    def stage_callback(self, msg: FrcStage):
+        # Heartbeats carry the same state, nothing to do for them
+        if msg.stage == self.stage and msg.fms_attached == self.fms_attached and msg.is_disabled == self.is_disabled:
+            return
+
+        self.stage = msg.stage
+        self.fms_attached = msg.fms_attached
+        self.is_disabled = msg.is_disabled
+        for callback in self.listeners:
+            callback(self)
@@ -1,23 +1,26 @@
 import rclpy
 from rclpy.node import Node
 
-from std_msgs.msg import Bool, String
+from edna_interfaces.msg import FrcStage
+from frc_auton.stage import STAGE_QOS
 
 
 class StagePublisher(Node):
 
     def __init__(self):
         super().__init__('stage_publisher')
-        self.publisher_ = self.create_publisher(String, '/real/frc_stage', 10)
+        self.publisher_ = self.create_publisher(FrcStage, '/real/frc_stage', STAGE_QOS)
         timer_period = 0.5  # seconds
         self.timer = self.create_timer(timer_period, self.timer_callback)
         self.i = 0
 
     def timer_callback(self):
-        msg = String()
-        msg.data = "AUTON|False|False"
+        msg = FrcStage()
+        msg.stage = "AUTON"
+        msg.fms_attached = False
+        msg.is_disabled = False
         self.publisher_.publish(msg)
-        self.get_logger().info('Publishing: %s' % msg.data)
+        self.get_logger().info('Publishing: %s|%s|%s' % (msg.stage, msg.fms_attached, msg.is_disabled))
         self.i += 1
 
 
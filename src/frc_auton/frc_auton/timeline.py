@@ -0,0 +1,48 @@
+from bisect import bisect_right
+import yaml
+
+
+class AutonTimeline:
+    """An auton task list compiled once into cumulative start times.
+
+    Each task is a dict with its duration `dur` in seconds, the `task` name and an optional `arg`.
+    `handlers` maps task names to the functions that set the matching setpoints.
+    """
+
+    def __init__(self, tasks, handlers):
+        self.start_times = []
+        self.tasks = []
+        self.duration = 0.0
+        for task in tasks:
+            if task['task'] not in handlers:
+                raise ValueError(f"Unknown auton task '{task['task']}'")
+            self.start_times.append(self.duration)
+            self.tasks.append((handlers[task['task']], task.get('arg', 0)))
+            self.duration += float(task['dur'])
+        self.active = -1
+
+    @classmethod
+    def from_yaml(cls, path, name, handlers):
+        with open(path, 'r') as f:
+            timelines = yaml.safe_load(f)
+        if name not in timelines:
+            raise KeyError(f"No auton timeline '{name}' in {path}")
+        return cls(timelines[name], handlers)
+
+    def reset(self):
+        self.active = -1
+
+    def update(self, elapsed) -> bool:
+        # Returns False once the timeline has finished
+        finished = elapsed >= self.duration
+        if finished:
+            # A late tick still has to run the last tasks, e.g. the final stop
+            index = len(self.tasks) - 1
+        else:
+            index = bisect_right(self.start_times, elapsed) - 1
+        # Also run any task we jumped over so their setpoints are still applied in order
+        while self.active < index:
+            self.active += 1
+            handler, arg = self.tasks[self.active]
+            handler(arg)
+        return not finished
@@ -1,95 +1,156 @@
-from std_msgs.msg import String
-from trajectory_msgs.msg import JointTrajectory, JointTrajectoryPoint
-from geometry_msgs.msg import Twist
-import rclpy
-from rclpy.node import Node
 import os
+import queue
+import threading
 import rclpy
 from rclpy.node import Node
-from rclpy.serialization import serialize_message
-from std_msgs.msg import String
+from rclpy.executors import MultiThreadedExecutor
+from rosidl_runtime_py.utilities import get_message
 from edna_interfaces.srv import SetBool
+from frc_auton.stage import StageCache
 
 import rosbag2_py
-# create writer instance and open for writing
+
+
+# Starts and stops the BagWriter from the set_bool service (true starts, false stops)
 class StartWriting(Node):
     def __init__(self):
         super().__init__('start_writer')
-        self.subscription_stage =self.create_subscription(String, 'frc_stage', self.stage_callback, 10)
+        self.stage_cache = StageCache(self)
+        self.stage_cache.add_listener(self.stage_changed)
         self.srv = self.create_service(SetBool, 'set_bool', self.service_callback)
-        
-        self.stage = ""
-        self.fms = "False"
-        self.is_disabled = "True"
+
+        # topic:type pairs to record
+        self.declare_parameter('topics', [
+            'joint_trajectory_controller/joint_trajectory:trajectory_msgs/msg/JointTrajectory',
+            'swerve_controller/cmd_vel_unstamped:geometry_msgs/msg/Twist',
+        ])
+        self.declare_parameter('storage_id', 'mcap')
+        # mcap chunk compression, use '' for sqlite3
+        self.declare_parameter('storage_preset_profile', 'zstd_fast')
+        self.declare_parameter('queue_size', 1000)
+
         self.service_enabled = False
+        self.bag_writer = None
 
     def service_callback(self, request, response):
-        self.bag_writer = BagWriter()
         self.service_enabled = request.data
-        if(self.service_enabled):
+        if self.service_enabled:
             self.start_bag_writer()
+        else:
+            self.stop_bag_writer()
         self.get_logger().info(f'Service Enabled: {self.service_enabled}')
-        response.sucess = True
-        response.message = self.bag_writer.path
+        response.success = True
+        response.message = self.bag_writer.path if self.bag_writer is not None else ''
         return response
+
+    def stage_changed(self, stage: StageCache):
+        if stage.is_teleop_enabled() or stage.is_auton_enabled():
+            self.start_bag_writer()
+        else:
+            self.stop_bag_writer()
+
     def start_bag_writer(self):
-        
-        if (self.stage.lower() == "teleop" or self.stage.lower() == "auton") and (self.fms=='True' or self.service_enabled) and self.is_disabled=='False':
-            rclpy.spin(self.bag_writer)
-            self.bag_writer.destroy_node()
-            rclpy.shutdown()
-    def stage_callback(self, msg):
-        data = str(msg.data).split('|')
-        self.stage = (data[0])
-        self.fms = str(data[1])
-        self.is_disabled = str(data[2])
-      
-
-class BagWriter(Node): 
-    def __init__(self):
+        stage = self.stage_cache
+        if self.bag_writer is not None:
+            return
+        if (stage.is_teleop_enabled() or stage.is_auton_enabled()) and (stage.fms_attached or self.service_enabled):
+            self.bag_writer = BagWriter(
+                self.get_parameter('topics').value,
+                self.get_parameter('storage_id').value,
+                self.get_parameter('storage_preset_profile').value,
+                self.get_parameter('queue_size').value)
+            # Runs alongside this node in the multi threaded executor instead of blocking the service
+            self.executor.add_node(self.bag_writer)
+            self.get_logger().info(f'Recording to {self.bag_writer.path}')
+
+    def stop_bag_writer(self):
+        if self.bag_writer is None:
+            return
+        self.executor.remove_node(self.bag_writer)
+        self.close_bag_writer()
+
+    def stop(self):
+        # Shutdown from a container, its executor is already shut down so only finalize the bag
+        if self.bag_writer is not None:
+            self.close_bag_writer()
+
+    def close_bag_writer(self):
+        self.bag_writer.close()
+        self.get_logger().info(f'Stopped recording {self.bag_writer.path}, dropped {self.bag_writer.dropped} messages')
+        self.bag_writer.destroy_node()
+        self.bag_writer = None
+
+
+class BagWriter(Node):
+    """Records topics to a bag without doing any disk io in the subscription callbacks.
+
+    Subscriptions take the already serialized messages and hand them to a bounded queue,
+    a background thread writes them to the bag. If the queue fills up messages are dropped
+    and counted instead of stalling the executor.
+    """
+
+    def __init__(self, topics, storage_id='mcap', storage_preset_profile='zstd_fast', queue_size=1000):
         super().__init__('bag_writer')
         self.curr_file_path = os.path.abspath(__file__)
         self.project_root_path = os.path.abspath(os.path.join(self.curr_file_path, "../../../.."))
         self.package_root = os.path.join(self.project_root_path, 'src/frc_auton')
 
-        self.subscription_arm = self.create_subscription(JointTrajectory,'joint_trajectory_controller/joint_trajectory',self.arm_callback,10)
-        self.subscription_swerve = self.create_subscription(Twist,'swerve_controller/cmd_vel_unstamped',self.swerve_callback,10)
-
         file_counter= int(len(os.listdir(f'{self.package_root}/frc_auton/Auto_ros_bag')))
         self.path = f'{self.package_root}/frc_auton/Auto_ros_bag/bag_'+str(file_counter)
-       
+
         self.writer = rosbag2_py.SequentialWriter()
-        storage_options = rosbag2_py._storage.StorageOptions(uri=self.path,storage_id='sqlite3')
+        storage_options = rosbag2_py._storage.StorageOptions(uri=self.path, storage_id=storage_id, storage_preset_profile=storage_preset_profile)
         converter_options = rosbag2_py._storage.ConverterOptions('', '')
         self.writer.open(storage_options, converter_options)
-        topic_info_arm = rosbag2_py._storage.TopicMetadata(name=self.subscription_arm.topic_name,type='trajectory_msgs/msg/JointTrajectory',serialization_format='cdr')
-        self.writer.create_topic(topic_info_arm)
-
-        topic_info_swerve = rosbag2_py._storage.TopicMetadata(name=self.subscription_swerve.topic_name,type='geometry_msgs/msg/Twist',serialization_format='cdr')
-        self.writer.create_topic(topic_info_swerve)
-        
-    def swerve_callback(self, msg):
-            self.writer.write(
-                self.subscription_swerve.topic_name,
-                serialize_message(msg),
-                self.get_clock().now().nanoseconds)
-                
-    def arm_callback(self, msg):
-            self.writer.write(
-                self.subscription_arm.topic_name,
-                serialize_message(msg),
-                self.get_clock().now().nanoseconds)
-
-
-    
-def main(args=None):    
+
+        self.subscriptions_ = []
+        for topic in topics:
+            name, msg_type = topic.split(':')
+            subscription = self.create_subscription(get_message(msg_type), name, self.record_callback(name), 10, raw=True)
+            topic_info = rosbag2_py._storage.TopicMetadata(name=subscription.topic_name, type=msg_type, serialization_format='cdr')
+            self.writer.create_topic(topic_info)
+            self.subscriptions_.append(subscription)
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.writer_thread = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer_thread.start()
+
+    def record_callback(self, name):
+        topic_name = self.resolve_topic_name(name)
+
+        def callback(data):
+            try:
+                self.queue.put_nowait((topic_name, data, self.get_clock().now().nanoseconds))
+            except queue.Full:
+                self.dropped += 1
+        return callback
+
+    def write_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            self.writer.write(*item)
+
+    def close(self):
+        # Flush everything still queued, then drop the writer to close the bag
+        self.queue.put(None)
+        self.writer_thread.join()
+        self.writer = None
+
+
+def main(args=None):
     rclpy.init(args=args)
 
     service_writer = StartWriting()
+    executor = MultiThreadedExecutor()
+    executor.add_node(service_writer)
 
-    rclpy.spin(service_writer)
+    executor.spin()
 
+    service_writer.stop_bag_writer()
     service_writer.destroy_node()
     rclpy.shutdown()
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,68 @@
+from time import time
+
+import pytest
+
+pytest.importorskip('rclpy')
+
+from geometry_msgs.msg import Twist  # noqa: E402
+from trajectory_msgs.msg import JointTrajectory, JointTrajectoryPoint  # noqa: E402
+
+from frc_auton.reader import StageSubscriber  # noqa: E402
+from frc_auton.timeline import AutonTimeline  # noqa: E402
+
+
+class Recorder:
+    def __init__(self):
+        self.msgs = []
+
+    def publish(self, msg):
+        self.msgs.append((msg.linear.x, msg.linear.y, msg.angular.z))
+
+
+class Logger:
+    def warn(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+
+def make_reader():
+    # Only the state loopAuton and stopAuton use, without a running ROS context
+    reader = StageSubscriber.__new__(StageSubscriber)
+    reader.get_logger = Logger
+    reader.cmd = Twist()
+    reader.position_cmds = JointTrajectoryPoint(positions=[0.0] * 8)
+    reader.cmds = JointTrajectory()
+    reader.last_twist = None
+    reader.last_positions = None
+    reader.publish_twist = Recorder()
+    reader.publish_trajectory = Recorder()
+    reader.replay = None
+    reader.doAuton = True
+    reader.timeline = AutonTimeline(
+        [{'dur': 1.0, 'task': 'turn', 'arg': 1.57}, {'dur': 0.1, 'task': 'stop'}],
+        {'turn': reader.turnAround, 'stop': reader.stop})
+    return reader
+
+
+def test_late_tick_publishes_stop():
+    reader = make_reader()
+    reader.timeline.reset()
+    reader.startTime = time() - 0.5
+    reader.loopAuton()
+    assert reader.publish_twist.msgs == [(0.0, 0.0, 1.57)]
+
+    # The next tick comes after the whole timeline, the stop still has to go out
+    reader.startTime = time() - (reader.timeline.duration + 1)
+    reader.loopAuton()
+    assert reader.publish_twist.msgs == [(0.0, 0.0, 1.57), (0.0, 0.0, 0.0)]
+
+
+def test_stop_auton_clears_turn():
+    reader = make_reader()
+    reader.turnAround(1.57)
+    reader.cmd.linear.y = 0.5
+    reader.stopAuton()
+    assert reader.publish_twist.msgs == [(0.0, 0.0, 0.0), (0.0, 0.0, 0.0)]
+    assert not reader.doAuton
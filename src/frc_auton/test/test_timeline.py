@@ -0,0 +1,34 @@
+from frc_auton.timeline import AutonTimeline
+
+
+def make_timeline(ran):
+    handlers = {
+        'turn': lambda arg: ran.append(('turn', arg)),
+        'stop': lambda arg: ran.append(('stop', arg)),
+    }
+    tasks = [
+        {'dur': 1.0, 'task': 'turn', 'arg': 1.57},
+        {'dur': 0.1, 'task': 'stop'},
+    ]
+    return AutonTimeline(tasks, handlers)
+
+
+def test_late_tick_runs_remaining_tasks():
+    ran = []
+    timeline = make_timeline(ran)
+    timeline.reset()
+    assert not timeline.update(timeline.duration + 1)
+    assert ran == [('turn', 1.57), ('stop', 0)]
+
+    # Finished tasks don't run again
+    assert not timeline.update(timeline.duration + 2)
+    assert ran == [('turn', 1.57), ('stop', 0)]
+
+
+def test_update_runs_tasks_in_order():
+    ran = []
+    timeline = make_timeline(ran)
+    assert timeline.update(0.5)
+    assert ran == [('turn', 1.57)]
+    assert timeline.update(1.05)
+    assert ran == [('turn', 1.57), ('stop', 0)]
@@ -6,6 +6,43 @@ from sensor_msgs.msg import JointState, Imu
 from rclpy.time import Time, Duration
 from std_msgs.msg import Header, String
 import math
+from isaac_hardware_test.joint_remapper import JointRemapper
+
+# Real joint states come in scaled by 10000
+COMMAND_SCALE = 1.0 / 10000.0
+
+# Real arm joint -> [(isaac joint, scale)], positions are split among the joints isaac drives separately
+ARM_ROUTES = {
+    'arm_roller_bar_joint': [
+        ('arm_roller_bar_joint', 1.0),
+        ('elevator_outer_1_joint', 0.2 / 0.07), # 0.07 on the roller bar is 0.2 on the elevator
+    ],
+    'top_slider_joint': [
+        ('top_slider_joint', 1.0),
+    ],
+    'top_gripper_left_arm_joint': [
+        ('top_gripper_left_arm_joint', 1.0),
+        ('top_gripper_right_arm_joint', 1.0),
+    ],
+    # scale position to be between 0 and 1 (elevator goes from 0.0 to 0.56), then split among 2 joints
+    'elevator_center_joint': [
+        ('elevator_center_joint', 0.5 / 0.56),
+        ('elevator_outer_2_joint', 0.5 / 0.56),
+    ],
+}
+
+def route_drive(names):
+    indices = [i for i, name in enumerate(names) if "wheel" in name or "axle" in name]
+    return [names[i] for i in indices], indices, [COMMAND_SCALE] * len(indices)
+
+def route_arm(names):
+    out_names, indices, scales = [], [], []
+    for i, name in enumerate(names):
+        for isaac_name, scale in ARM_ROUTES.get(name, []):
+            out_names.append(isaac_name)
+            indices.append(i)
+            scales.append(COMMAND_SCALE * scale)
+    return out_names, indices, scales
 
 class IsaacDriveHardware(Node):
     def __init__(self):
@@ -27,14 +64,14 @@ class IsaacDriveHardware(Node):
         self.joint_names2: list[str] = []
         self.joint_state2: JointState = None
         
-        self.arm_joint_names = []
-        self.drive_joint_names = []
-        
-        self.command_effort = []
-        self.command_position = []
+        # Routing tables are only rebuilt when a new joint name layout comes in
+        self.read_remapper = JointRemapper(self.route_read)
+        self.drive_remapper = JointRemapper(route_drive)
+        self.arm_remapper = JointRemapper(route_arm)
         self.empty = []
         
-        self.realtime_isaac_command: JointState = JointState()
+        self.drive_command: JointState = JointState()
+        self.arm_command: JointState = JointState()
         self.joint_state_command: JointState = JointState()
         
         self.header = Header()
@@ -50,7 +87,10 @@ class IsaacDriveHardware(Node):
         self.real_imu_publisher.publish(imu_string)
         
     def real_callback(self, joint_state: JointState):
-        self.joint_names = list(joint_state.name)
+        # read() maps isaac joints into the real joint order, so its tables depend on it
+        if joint_state.name != self.joint_names:
+            self.joint_names = list(joint_state.name)
+            self.read_remapper.clear()
         self.joint_state = joint_state
         self.get_logger().info(self.OKGREEN + "Recieved Real Joint State" + self.ENDC)
         self.write()
@@ -70,82 +110,49 @@ class IsaacDriveHardware(Node):
             return isaac_position + 2.0 * math.pi
         return isaac_position
         
+    def route_read(self, names):
+        # Isaac joint states into the order of the real joint names
+        index = {name: i for i, name in enumerate(names)}
+        out_names = [name for name in self.joint_names if name in index]
+        return out_names, [index[name] for name in out_names], [1.0] * len(out_names)
+
     def read(self):
-        self.joint_state_command.effort = []
-        names = self.joint_state2.name
-        positions = self.joint_state2.position
-        velocities = self.joint_state2.velocity
-        efforts = self.joint_state2.effort
-        
-        for i in range(len(self.joint_names)-1):
-            for j in range(len(names)-1):
-                if names[j] == self.joint_names[i]:
-                    self.joint_state_command.position.append(self.convertToRosPosition(positions[j]))
-                    self.joint_state_command.velocity.append(velocities[j])
-                    self.joint_state_command.effort.append(efforts[j])
-                    break              
+        table = self.read_remapper.table(self.joint_state2.name)
+        self.joint_state_command.name = table.names
+        
+        if self.joint_state2.position:
+            positions = table.fill('position', self.joint_state2.position)
+            for i in range(len(positions)):
+                positions[i] = self.convertToRosPosition(positions[i])
+            self.joint_state_command.position = positions
+        if self.joint_state2.velocity:
+            self.joint_state_command.velocity = table.fill('velocity', self.joint_state2.velocity)
+        if self.joint_state2.effort:
+            self.joint_state_command.effort = table.fill('effort', self.joint_state2.effort)
         # self.joint_state_command.header.stamp = Time(seconds=self._clock.now().seconds_nanoseconds()[0], nanoseconds=self._clock.now().seconds_nanoseconds()[1])
         # self.joint_state_publisher.publish(self.joint_state_command)
                     
     def write(self):
-        self.command_effort = []
-        self.command_position = []
-        self.arm_joint_names.clear()
-        self.drive_joint_names.clear()
-        for j, i in enumerate(self.joint_names):
-            if i.__contains__("wheel") or i.__contains__("axle"):
-                vel = self.joint_state.velocity[j]
-                self.command_effort.append(vel/10000.0)
-                self.drive_joint_names.append(i)
-            else:
-                self.arm_joint_names.append(i)
-                position = self.joint_state.position[j]/10000.0
-                
-                # Elevator
-                if i == "arm_roller_bar_joint":
-                    # split position among 2 joints
-                    self.command_position.append(position)
-                    self.arm_joint_names.append("elevator_outer_1_joint")
-                    if position == 0.07:
-                        self.command_position.append(0.2)
-                    elif position == 0.0:
-                        self.command_position.append(0.0)
-                elif i == "top_slider_joint":
-                    self.command_position.append(position)
-                elif i == "top_gripper_left_arm_joint":
-                    self.command_position.append(position)
-                    self.arm_joint_names.append("top_gripper_right_arm_joint")
-                    self.command_position.append(position)
-                elif i == "elevator_center_joint":
-                    elevator_max = 0.56
-                    elevator_min = 0.0
-                    
-                    #scale position to be between 0 and 1
-                    position = (position - elevator_min)/(elevator_max - elevator_min)
-                    
-                    self.command_position.append(position/2.0)
-                    self.arm_joint_names.append("elevator_outer_2_joint")
-                    self.command_position.append(position/2.0)
+        drive = self.drive_remapper.table(self.joint_names)
+        arm = self.arm_remapper.table(self.joint_names)
                         
         self.header.stamp = self._clock.now().to_msg()
         
-        self.realtime_isaac_command.header = self.header
-        self.realtime_isaac_command.name = self.drive_joint_names
-        self.realtime_isaac_command.velocity = self.command_effort
-        self.realtime_isaac_command.position = self.empty
-        self.realtime_isaac_command.effort = self.empty
+        self.drive_command.header = self.header
+        self.drive_command.name = drive.names
+        self.drive_command.velocity = drive.fill('velocity', self.joint_state.velocity)
+        self.drive_command.position = self.empty
+        self.drive_command.effort = self.empty
         
-        self.realtime_isaac_publisher_drive.publish(self.realtime_isaac_command)
-        
-        self.header.stamp = self._clock.now().to_msg()
+        self.realtime_isaac_publisher_drive.publish(self.drive_command)
         
-        self.realtime_isaac_command.header = self.header
-        self.realtime_isaac_command.name = self.arm_joint_names
-        self.realtime_isaac_command.velocity = self.empty
-        self.realtime_isaac_command.position = self.command_position
-        self.realtime_isaac_command.effort = self.empty
+        self.arm_command.header = self.header
+        self.arm_command.name = arm.names
+        self.arm_command.velocity = self.empty
+        self.arm_command.position = arm.fill('position', self.joint_state.position)
+        self.arm_command.effort = self.empty
         
-        self.realtime_isaac_publisher_arm.publish(self.realtime_isaac_command)
+        self.realtime_isaac_publisher_arm.publish(self.arm_command)
         
         
 def main(args=None):
@@ -0,0 +1,47 @@
+import array
+
+
+class RoutingTable:
+    """Routing from one incoming joint name layout to a fixed list of output joints.
+
+    Every output slot reads one incoming index and multiplies it by a scale. The output
+    arrays are allocated once per field and filled in place on every message.
+    """
+
+    def __init__(self, names, indices, scales):
+        self.names = list(names)
+        self.slots = list(zip(range(len(self.names)), indices, scales))
+        self.buffers = {}
+
+    def fill(self, field, values):
+        buffer = self.buffers.get(field)
+        if buffer is None:
+            buffer = array.array('d', bytes(8 * len(self.names)))
+            self.buffers[field] = buffer
+        for slot, index, scale in self.slots:
+            buffer[slot] = values[index] * scale
+        return buffer
+
+
+class JointRemapper:
+    """Caches a RoutingTable for every incoming joint name layout.
+
+    `route(names)` returns the output joint names and, for each of them, the incoming
+    index and scale. It only runs the first time a layout is seen, after that the table
+    is looked up by the tuple of incoming names.
+    """
+
+    def __init__(self, route):
+        self.route = route
+        self.tables = {}
+
+    def table(self, names) -> RoutingTable:
+        key = tuple(names)
+        table = self.tables.get(key)
+        if table is None:
+            table = RoutingTable(*self.route(key))
+            self.tables[key] = table
+        return table
+
+    def clear(self):
+        self.tables.clear()
@@ -0,0 +1,137 @@
+import argparse
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+import yaml
+from rl_games.algos_torch.torch_ext import load_checkpoint
+from rl_games.algos_torch.network_builder import A2CBuilder
+
+BACKENDS = ('torch', 'quantized', 'onnx')
+
+
+class Actor(nn.Module):
+    # Plain tensor in, mean action out view of an rl_games A2C network so it can be quantized or exported
+    def __init__(self, network):
+        super().__init__()
+        self.network = network
+
+    def forward(self, obs):
+        return self.network({"obs": obs})[0]
+
+
+def load_actor(filepath, config_path, actions_num=10, obs_size=13):
+    config = yaml.load(open(config_path, "r"), Loader=yaml.FullLoader)
+    config = config["params"]
+    state = load_checkpoint(filepath)
+    state_dict = {k.replace('a2c_network.', ''): v for k, v in state['model'].items()}
+    builder = A2CBuilder()
+    builder.load(config["network"])
+    network = builder.build("network", actions_num=actions_num, input_shape=(obs_size,))
+
+    model_state_dict = network.state_dict()
+    state_dict = {k: v for k, v in state_dict.items() if k in model_state_dict}
+
+    network.load_state_dict(state_dict)
+    network.eval()
+    network.train(False)
+
+    return Actor(network)
+
+
+class TorchPolicy:
+    def __init__(self, module):
+        self.module = module.eval()
+
+    def __call__(self, obs):
+        # obs is a float32 (batch, obs_size) array, returns a (batch, actions) array
+        with torch.no_grad():
+            return self.module(torch.from_numpy(obs)).numpy()
+
+
+def quantize(module):
+    # Post training dynamic quantization, Linear weights are stored as int8 and activations are quantized per call
+    return torch.ao.quantization.quantize_dynamic(module, {nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxPolicy:
+    def __init__(self, module, obs_size, path, num_threads=1):
+        # Only needed for this backend
+        import onnxruntime as ort
+
+        torch.onnx.export(
+            module.eval(), torch.zeros(1, obs_size), path,
+            input_names=['obs'], output_names=['actions'],
+            dynamic_axes={'obs': {0: 'batch'}, 'actions': {0: 'batch'}})
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+
+    def __call__(self, obs):
+        return self.session.run(None, {'obs': obs})[0]
+
+
+def make_backend(module, backend='torch', obs_size=13, onnx_path='/tmp/policy.onnx', num_threads=1):
+    # module maps a (batch, obs_size) tensor to actions, the returned policy does the same on numpy arrays
+    torch.set_num_threads(num_threads)
+    if backend == 'torch':
+        return TorchPolicy(module)
+    if backend == 'quantized':
+        return TorchPolicy(quantize(module))
+    if backend == 'onnx':
+        return OnnxPolicy(module, obs_size, onnx_path, num_threads)
+    raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+
+def compare_backends(reference, candidate, observations):
+    # Action error of candidate against the float reference over a set of observations
+    expected = reference(observations)
+    error = np.abs(candidate(observations) - expected)
+    return {
+        'max_abs_error': float(error.max()),
+        'mean_abs_error': float(error.mean()),
+        'max_rel_error': float(error.max() / max(np.abs(expected).max(), 1e-6)),
+    }
+
+
+def time_backend(policy, observations):
+    # Per step latency in ms when feeding one observation at a time like the runner does
+    times = []
+    for obs in observations:
+        start = time.perf_counter()
+        policy(obs[None])
+        times.append(time.perf_counter() - start)
+    times = np.sort(np.array(times) * 1000.0)
+    return {'mean_ms': float(times.mean()), 'p99_ms': float(times[int(len(times) * 0.99) - 1])}
+
+
+def check_main(args=None):
+    # Compares every backend against the float model on observations saved by the runner (record_observations)
+    parser = argparse.ArgumentParser(description='Check accuracy and latency of the policy inference backends')
+    parser.add_argument('checkpoint')
+    parser.add_argument('observations', help='.npy file of (N, obs_size) observations')
+    parser.add_argument('--config', default='/workspaces/roboeagles2024/isaac/Eaglegym/eaglegym/cfg/train/EdnaKPPO.yaml')
+    parser.add_argument('--actions', type=int, default=10)
+    parser.add_argument('--backends', nargs='+', default=['quantized', 'onnx'], choices=BACKENDS)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--tolerance', type=float, default=0.05, help='max allowed absolute action error')
+    parsed_args = parser.parse_args(args)
+
+    observations = np.load(parsed_args.observations).astype(np.float32)
+    obs_size = observations.shape[1]
+    actor = load_actor(parsed_args.checkpoint, parsed_args.config, parsed_args.actions, obs_size)
+    reference = make_backend(actor, 'torch', obs_size, num_threads=parsed_args.threads)
+    print(f"torch: {time_backend(reference, observations)}")
+
+    passed = True
+    for backend in parsed_args.backends:
+        policy = make_backend(actor, backend, obs_size, num_threads=parsed_args.threads)
+        errors = compare_backends(reference, policy, observations)
+        passed = passed and errors['max_abs_error'] <= parsed_args.tolerance
+        print(f"{backend}: {errors} {time_backend(policy, observations)}")
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(check_main())
@@ -1,14 +1,14 @@
 import rclpy
 from rclpy.node import Node
 from nav_msgs.msg import Odometry
-from std_msgs.msg import String
+from edna_interfaces.msg import ObjectTarget
 
 class Odom(Node):
     def __init__(self):
         super().__init__("odom_publisher")
         self.publisher = self.create_publisher(Odometry, '/real/odom', 10)
-        self.obj_publisher = self.create_publisher(String, '/real/obj_det_pose', 10)
-        self.declare_parameter('obj_string',"0.0|0.0|0.0")
+        self.obj_publisher = self.create_publisher(ObjectTarget, '/real/obj_det_pose', 10)
+        self.declare_parameter('obj_position', [0.0, 0.0, 0.0])
         self.declare_parameter("publish_odom", True)
         self.declare_parameter("publish_zed", True)
         self.odom_msg = Odometry()
@@ -22,7 +22,11 @@ class Odom(Node):
             self.publisher.publish(self.odom_msg)
             
         if zed:
-            self.obj_publisher.publish(String(data=self.get_parameter('obj_string').get_parameter_value().string_value))
+            x, y, z = self.get_parameter('obj_position').get_parameter_value().double_array_value
+            target = ObjectTarget(valid=True)
+            target.header.stamp = self.get_clock().now().to_msg()
+            target.position.x, target.position.y, target.position.z = x, y, z
+            self.obj_publisher.publish(target)
             
         if odom and not zed:
             self.get_logger().info("Publishing Odom")
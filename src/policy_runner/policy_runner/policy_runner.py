@@ -3,17 +3,17 @@ from rclpy.node import Node
 from std_msgs.msg import Float32, String
 from nav_msgs.msg import Odometry
 from sensor_msgs.msg import JointState
-from geometry_msgs.msg import Twist
+from geometry_msgs.msg import TwistStamped
 import numpy as np
+import threading
+import time
 import torch
 import torch.nn as nn
 from trajectory_msgs.msg import JointTrajectory, JointTrajectoryPoint
+from edna_interfaces.msg import ObjectTarget
 import math
-from rl_games.algos_torch.models import ModelA2CContinuous
-from rl_games.algos_torch.torch_ext import load_checkpoint
-from rl_games.algos_torch.network_builder import A2CBuilder
-from rl_games.common.a2c_common import ContinuousA2CBase
-import yaml
+from policy_runner.inference import load_actor, make_backend
+from eaglegym.utils.observations.observation_spec import EDNA_OBS
 
 class Reader(Node):
     def __init__(self):
@@ -21,23 +21,31 @@ class Reader(Node):
         # self.robot_ip = robot_ip
         # self.policy = torch.load("/workspaces/roboeagles2024/isaac/Eaglegym/eaglegym/runs/EdnaK/nn/EdnaK.pth")
         
+        self.declare_parameter("inference_backend", "torch")
+        self.declare_parameter("onnx_path", "/tmp/EdnaK.onnx")
+        self.declare_parameter("inference_threads", 1)
+        # Saves every observation the policy saw to this .npy file on shutdown, for checking backends
+        self.declare_parameter("record_observations", "")
         self.policy = self.load_checkpoint("/workspaces/roboeagles2024/isaac/Eaglegym/eaglegym/runs/EdnaK/nn/EdnaK_1050.pth")
         
         self.joint_action_pub = self.create_publisher(String, "/real/cmd_vel", 10)
+        self.stamped_action_pub = self.create_publisher(TwistStamped, "/real/cmd_vel_stamped", 10)
         # self.joint_trajectory_action_pub = self.create_publisher(Twist, "joint_trajectory_message", 10)
         
         self.declare_parameter("odom_topic", "/real/odom")
         self.declare_parameter("target_topic", "/real/obj_det_pose")
+        self.declare_parameter("control_rate", 30.0)
+        self.declare_parameter("stats_period", 5.0)
         
         self.odom_topic = self.get_parameter("odom_topic").get_parameter_value().string_value
         self.target_topic = self.get_parameter("target_topic").get_parameter_value().string_value
         
         self.odom_sub = self.create_subscription(Odometry, self.odom_topic, self.odom_callback, 10)
-        self.target_sub = self.create_subscription(String, self.target_topic, self.target_callback, 10)
+        self.target_sub = self.create_subscription(ObjectTarget, self.target_topic, self.target_callback, 10)
         # self.joint_state_sub = self.create_subscription(Float32, "joint_state", self.joint_state_callback, 10)
         self.odom_msg = Odometry()
         # self.joint_state_msg = JointState()
-        self.twist_msg = Twist()
+        self.twist_msg = TwistStamped()
         # self.cmds = JointTrajectory()
         # self.position_cmds = JointTrajectoryPoint()
         self.episode_reward = 0
@@ -55,70 +63,66 @@ class Reader(Node):
         #     'bottom_intake_joint',
         # ]
         
-        self.target_pos = []
+        self.has_target = False
+        self.obs_builder = EDNA_OBS.numpy_builder()
+
+        # Single slot for the newest observation, odom_callback overwrites it and the inference thread takes it
+        self.obs_lock = threading.Lock()
+        self.slot_obs = np.zeros(EDNA_OBS.size, dtype=np.float32)
+        self.slot_stamp = None
+        self.slot_received = 0.0
+        self.slot_full = False
+        self.overwritten_obs = 0
+        self.infer_obs = np.zeros((1, EDNA_OBS.size), dtype=np.float32)
+
+        self.control_rate = self.get_parameter("control_rate").value
+        self.stats_period = self.get_parameter("stats_period").value
+        self.queue_ages = []
+        self.inference_times = []
+        self.stats_last_report = time.monotonic()
+        self.record_path = self.get_parameter("record_observations").value
+        self.recorded_obs = []
+
+        self.stop_event = threading.Event()
+        self.inference_thread = threading.Thread(target=self.inference_loop, daemon=True)
+        self.inference_thread.start()
 
         self.get_logger().info("\033[92m" + "Policy Runner Started" + "\033[0m")
         
     def load_checkpoint(self, filepath):
-        config = yaml.load(open("/workspaces/roboeagles2024/isaac/Eaglegym/eaglegym/cfg/train/EdnaKPPO.yaml", "r"), Loader=yaml.FullLoader)
-        config = config["params"]
-        state = load_checkpoint(filepath)
-        state_dict = {k.replace('a2c_network.', ''): v for k, v in state['model'].items()}
-        builder = A2CBuilder()
-        builder.load(config["network"])
-        network = builder.build("network", actions_num=10, input_shape=(13,))
-        
-        model_state_dict = network.state_dict()
-        state_dict = {k: v for k, v in state_dict.items() if k in model_state_dict}
-        
-        network.load_state_dict(state_dict)
-        network.eval()
-        network.train(False)
+        actor = load_actor(filepath, "/workspaces/roboeagles2024/isaac/Eaglegym/eaglegym/cfg/train/EdnaKPPO.yaml", actions_num=10, obs_size=EDNA_OBS.size)
+        # torch, quantized (dynamic int8) or onnx, see inference.check_main for comparing them
+        return make_backend(
+            actor,
+            self.get_parameter("inference_backend").value,
+            obs_size=EDNA_OBS.size,
+            onnx_path=self.get_parameter("onnx_path").value,
+            num_threads=self.get_parameter("inference_threads").value)
 
-        return network
-        # model = checkpoint['model']
-        # model.load_state_dict(checkpoint)
-        # for parameter in model.parameters():
-        #     parameter.requires_grad = False
-        # model.eval()
-        # return model
-
-    def get_action(self, msg):
+    def get_action(self, obs):
         '''
-        Gym obs type for EdnaK:
+        Observation layout is eaglegym EDNA_OBS, shared with the sim task:
             [0:3] = ([target_pos] - [robot_pos]) / 3 # x, y, z
-            [3:7] = [robot_rotation_quaternion] # x, y, z, w
+            [3:7] = [robot_rotation_quaternion] # w, x, y, z
             [7:10] = [robot_linear_velocities] / 2 # x, y, z
             [10:13] = [robot_angular_velocities] / M_PI # x, y, z
             
-        Input type String:
-            0,1,2,3,4,5,6,7,8,9,10,11,12,13
+        Input type np.ndarray of shape (1, 13)
         '''
-                
-        # convert string to list
-        input_obs = msg.data.split(",")
-        
-        obs = np.array(input_obs, dtype=np.float32)
-        
-        obs = torch.tensor(obs).float()
         
-        obs = obs.unsqueeze(0)
-        
-        observation = {"obs": obs}
-        
-        action = self.policy(observation)
-
-        vel = action[0].detach().numpy()[0]
-        
-        self.get_logger().info("Full Action: " + np.array_str(vel, precision=2))
+        return self.policy(obs)[0]
+    
+    def publish_action(self, vel, stamp):
+        self.get_logger().info("Full Action: " + np.array_str(vel, precision=2), throttle_duration_sec=1.0)
         
         # vel = [self.limit(i) for i in vel]
     
         # ======================= convert action to twist message ===================================
         
-        self.twist_msg.linear.x = float(vel[0])
-        self.twist_msg.linear.y = float(vel[1])
-        self.twist_msg.linear.z = float(vel[2])
+        self.twist_msg.header.stamp = stamp
+        self.twist_msg.twist.linear.x = float(vel[0])
+        self.twist_msg.twist.linear.y = float(vel[1])
+        self.twist_msg.twist.linear.z = float(vel[2])
         
         # self.position_cmds.positions = [
         #     action[3].detach().numpy(),
@@ -145,11 +149,61 @@ class Reader(Node):
         #     output.data = f"0.0|0.0|0.0"
         #     vel = [0.0, 0.0, 0.0]
         
-        self.print_in_color(f"Action: {str(vel[0:3])}", "blue")
-        
         self.joint_action_pub.publish(output)
+        # Same command stamped with the odometry it was computed from, so stale commands are visible
+        self.stamped_action_pub.publish(self.twist_msg)
         self.step += 1
         
+    def inference_loop(self):
+        # Runs at control_rate on its own thread, always on the newest observation
+        period = 1.0 / self.control_rate
+        next_tick = time.monotonic()
+        while not self.stop_event.is_set():
+            next_tick += period
+            with self.obs_lock:
+                ready = self.slot_full
+                if ready:
+                    np.copyto(self.infer_obs[0], self.slot_obs)
+                    stamp, received = self.slot_stamp, self.slot_received
+                    self.slot_full = False
+            if ready:
+                if self.record_path:
+                    self.recorded_obs.append(self.infer_obs[0].copy())
+                start = time.monotonic()
+                vel = self.get_action(self.infer_obs)
+                self.publish_action(vel, stamp)
+                self.record_stats(start - received, time.monotonic() - start)
+
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                # Overran the period, start counting again instead of bursting to catch up
+                next_tick = time.monotonic()
+
+    def record_stats(self, queue_age, inference_time):
+        self.queue_ages.append(queue_age)
+        self.inference_times.append(inference_time)
+        now = time.monotonic()
+        if now - self.stats_last_report >= self.stats_period:
+            ages = np.array(self.queue_ages) * 1000.0
+            times = np.array(self.inference_times) * 1000.0
+            self.get_logger().info(
+                f'{len(times)} steps: queue age mean {ages.mean():.2f} ms max {ages.max():.2f} ms, '
+                f'inference mean {times.mean():.2f} ms max {times.max():.2f} ms, '
+                f'{self.overwritten_obs} observations overwritten')
+            self.queue_ages = []
+            self.inference_times = []
+            self.overwritten_obs = 0
+            self.stats_last_report = now
+
+    def stop(self):
+        self.stop_event.set()
+        self.inference_thread.join()
+        if self.record_path and self.recorded_obs:
+            np.save(self.record_path, np.stack(self.recorded_obs))
+            self.get_logger().info(f"Saved {len(self.recorded_obs)} observations to {self.record_path}")
+        
     def limit(self, value):
         speed = 0
         if value > 1:
@@ -162,66 +216,40 @@ class Reader(Node):
         return speed / 10
 
     def odom_callback(self, msg: Odometry):
-        if(msg != None and len(self.target_pos) > 0):
+        if(msg != None and self.has_target):
             self.odom_msg = msg
-            obs_string = String()
-            robot_pos = [
-                float(self.odom_msg.pose.pose.position.x),
-                float(self.odom_msg.pose.pose.position.y),
-                float(self.odom_msg.pose.pose.position.z)
-            ]
-            robot_rot_quat = [
-                float(self.odom_msg.pose.pose.orientation.x),
-                float(self.odom_msg.pose.pose.orientation.y),
-                float(self.odom_msg.pose.pose.orientation.z),
-                float(self.odom_msg.pose.pose.orientation.w)
-            ]
-            robot_linear_vel = [
-                float(self.odom_msg.twist.twist.linear.x),
-                float(self.odom_msg.twist.twist.linear.y),
-                float(self.odom_msg.twist.twist.linear.z)
-            ]
-            robot_angular_vel = [
-                float(self.odom_msg.twist.twist.angular.x),
-                float(self.odom_msg.twist.twist.angular.y),
-                float(self.odom_msg.twist.twist.angular.z)
-            ]
+            # Fill the spec sources in place, EDNA_OBS does the relative target and scaling like the sim
+            sources = self.obs_builder.sources
+            position = msg.pose.pose.position
+            orientation = msg.pose.pose.orientation
+            linear = msg.twist.twist.linear
+            angular = msg.twist.twist.angular
+            root_pos, root_quat = sources['root_pos'], sources['root_quat']
+            root_linvel, root_angvel = sources['root_linvel'], sources['root_angvel']
+            root_pos[0], root_pos[1], root_pos[2] = position.x, position.y, position.z
+            root_quat[0], root_quat[1], root_quat[2], root_quat[3] = orientation.w, orientation.x, orientation.y, orientation.z
+            root_linvel[0], root_linvel[1], root_linvel[2] = linear.x, linear.y, linear.z
+            root_angvel[0], root_angvel[1], root_angvel[2] = angular.x, angular.y, angular.z
+            obs = self.obs_builder.build()
             
-            obs_input = [
-                (self.target_pos[0] - robot_pos[0]),
-                (self.target_pos[1] - robot_pos[1]),
-                (self.target_pos[2] - robot_pos[2]),
-                robot_rot_quat[0],
-                robot_rot_quat[1],
-                robot_rot_quat[2],
-                robot_rot_quat[3],
-                robot_linear_vel[0],
-                robot_linear_vel[1],
-                robot_linear_vel[2],
-                robot_angular_vel[0],
-                robot_angular_vel[1],
-                robot_angular_vel[2]
-            ]
-            
-            obs_string.data = ",".join([str(i) for i in obs_input])
-            
-            obs_dict = {
-                "target position": self.target_pos,
-                "robot position": robot_pos,
-                "robot rotation quaternion": robot_rot_quat,
-                "robot linear velocity": robot_linear_vel,
-                "robot angular velocity": robot_angular_vel
-            }
-            
-            self.print_in_color(f"Observation: {obs_dict}", "blue")
-            
-            self.get_action(obs_string)
+            # Only hand the observation over, inference runs on its own thread
+            with self.obs_lock:
+                if self.slot_full:
+                    self.overwritten_obs += 1
+                np.copyto(self.slot_obs, obs)
+                self.slot_stamp = msg.header.stamp
+                self.slot_received = time.monotonic()
+                self.slot_full = True
         return
     
-    def target_callback(self, msg):
-        if(msg != None):
-            self.target_pos = msg.data.split("|")
-            self.target_pos = [float(i) for i in self.target_pos]      
+    def target_callback(self, msg: ObjectTarget):
+        # The target sits at the origin while nothing is tracked, same as before
+        target_pos = self.obs_builder.sources['target_pos']
+        if msg.valid:
+            target_pos[0], target_pos[1], target_pos[2] = msg.position.x, msg.position.y, msg.position.z
+        else:
+            target_pos[:] = 0.0
+        self.has_target = True
         return
 
     def get_reward():
@@ -243,6 +271,8 @@ def main(args=None):
     rclpy.init(args=args)
     reader = Reader()
     rclpy.spin(reader)
+    reader.stop()
+    reader.destroy_node()
     # env.disconnect()
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -11,7 +11,9 @@ setup(
             ['resource/' + package_name]),
         ('share/' + package_name, ['package.xml']),
     ],
-    install_requires=['setuptools', 'rl-games'],
+    # eaglegym has the observation layout shared with the sim tasks (utils/observations/observation_spec.py).
+    # Install it with `pip install --no-deps -e isaac/Eaglegym`, its sim pins would replace the workspace's robotpy
+    install_requires=['setuptools', 'rl-games', 'eaglegym'],
     zip_safe=True,
     maintainer='admin',
     maintainer_email='sarnga.raj@gmail.com',
@@ -21,7 +23,8 @@ setup(
     entry_points={
         'console_scripts': [
             'runner = policy_runner.policy_runner:main',
-            'odom = policy_runner.odom_test:main'
+            'odom = policy_runner.odom_test:main',
+            'check_backends = policy_runner.inference:check_main'
         ],
     },
 )
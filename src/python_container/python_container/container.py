@@ -0,0 +1,72 @@
+import argparse
+import importlib
+import resource
+import sys
+import time
+
+import rclpy
+from rclpy.executors import MultiThreadedExecutor
+
+# Taken as early as possible so the bringup time includes importing rclpy and the nodes
+START_TIME = time.monotonic()
+
+# Node name -> 'module:NodeClass' of the Python nodes that can share this process
+NODES = {
+    'zed_conversion': 'zed_object_hardware_interface.zed_conversion:ZedConversion',
+    'policy_runner': 'policy_runner.policy_runner:Reader',
+    'joint_trajectory_teleop': 'joint_trajectory_teleop.joint_trajectory_teleop:PublishTrajectoryMsg',
+    'isaac_drive': 'isaac_hardware_test.isaac_drive:IsaacDriveHardware',
+    'frc_auton_reader': 'frc_auton.reader:StageSubscriber',
+    'frc_auton_writer': 'frc_auton.writer:StartWriting',
+    'latency_ping': 'python_container.latency_probe:LatencyPing',
+    'latency_pong': 'python_container.latency_probe:LatencyPong',
+}
+
+
+def load_node(name):
+    module_name, class_name = NODES[name].split(':')
+    node_class = getattr(importlib.import_module(module_name), class_name)
+    return node_class()
+
+
+def main(args=None):
+    rclpy.init(args=args)
+    logger = rclpy.logging.get_logger('python_container')
+
+    # Strip off the ROS 2-specific command-line arguments
+    stripped_args = rclpy.utilities.remove_ros_args(args=sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('nodes', nargs='+', choices=list(NODES), help='Nodes to load into this process')
+    parser.add_argument('--threads', type=int, default=None, help='Executor threads, defaults to the cpu count')
+    parsed_args = parser.parse_args(args=stripped_args[1:])
+
+    # Every node shares this executor, so a slow callback in one node no longer
+    # holds up the others and nothing pays for its own interpreter and rclpy startup
+    executor = MultiThreadedExecutor(num_threads=parsed_args.threads)
+    nodes = []
+    for name in parsed_args.nodes:
+        node = load_node(name)
+        executor.add_node(node)
+        nodes.append(node)
+
+    # ru_maxrss is in KB on linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    logger.info(f'Loaded {", ".join(parsed_args.nodes)} in {time.monotonic() - START_TIME:.2f} s, max RSS {rss:.1f} MB')
+
+    try:
+        executor.spin()
+    except KeyboardInterrupt:
+        pass
+
+    executor.shutdown()
+    for node in nodes:
+        # Nodes with worker threads stop them and save their state here, like their own main() does before
+        # destroying them: policy_runner's inference thread, frc_auton_writer's BagWriter finalizing the bag
+        if callable(getattr(node, 'stop', None)):
+            node.stop()
+        node.destroy_node()
+    rclpy.try_shutdown()
+
+
+if __name__ == '__main__':
+    main()
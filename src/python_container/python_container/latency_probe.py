@@ -0,0 +1,62 @@
+import rclpy
+from rclpy.node import Node
+from std_msgs.msg import Header
+
+
+# Round trip latency probe. Run ping and pong in the same container and as separate
+# processes to compare the hop latency of the two layouts.
+class LatencyPing(Node):
+    def __init__(self):
+        super().__init__('latency_ping')
+        self.declare_parameter('rate', 100.0)
+        self.declare_parameter('report_every', 500)
+
+        self.ping_publisher = self.create_publisher(Header, 'latency/ping', 10)
+        self.pong_subscriber = self.create_subscription(Header, 'latency/pong', self.pong_callback, 10)
+        self.timer = self.create_timer(1.0 / self.get_parameter('rate').value, self.timer_callback)
+
+        self.report_every = self.get_parameter('report_every').value
+        self.round_trips = []
+        self.ping = Header()
+
+    def timer_callback(self):
+        self.ping.stamp = self.get_clock().now().to_msg()
+        self.ping_publisher.publish(self.ping)
+
+    def pong_callback(self, msg: Header):
+        sent = msg.stamp.sec * 1e9 + msg.stamp.nanosec
+        self.round_trips.append((self.get_clock().now().nanoseconds - sent) / 1e6)
+        if len(self.round_trips) >= self.report_every:
+            round_trips = sorted(self.round_trips)
+            mean = sum(round_trips) / len(round_trips)
+            p99 = round_trips[int(len(round_trips) * 0.99) - 1]
+            # One hop is half the round trip
+            self.get_logger().info(f'Hop latency over {len(round_trips)} round trips: mean {mean / 2:.3f} ms, '
+                                   f'p99 {p99 / 2:.3f} ms, max {round_trips[-1] / 2:.3f} ms')
+            self.round_trips = []
+
+
+class LatencyPong(Node):
+    def __init__(self):
+        super().__init__('latency_pong')
+        self.pong_publisher = self.create_publisher(Header, 'latency/pong', 10)
+        self.ping_subscriber = self.create_subscription(Header, 'latency/ping', self.pong_publisher.publish, 10)
+
+
+def run(node_class, args=None):
+    rclpy.init(args=args)
+    node = node_class()
+    try:
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        pass
+    node.destroy_node()
+    rclpy.try_shutdown()
+
+
+def ping_main(args=None):
+    run(LatencyPing, args)
+
+
+def pong_main(args=None):
+    run(LatencyPong, args)
@@ -0,0 +1,28 @@
+from setuptools import setup
+
+package_name = 'python_container'
+
+setup(
+    name=package_name,
+    version='0.0.0',
+    packages=[package_name],
+    data_files=[
+        ('share/ament_index/resource_index/packages',
+            ['resource/' + package_name]),
+        ('share/' + package_name, ['package.xml']),
+    ],
+    install_requires=['setuptools'],
+    zip_safe=True,
+    maintainer='admin',
+    maintainer_email='roboeagles4828@gmail.com',
+    description='Runs several of the Python ROS 2 nodes in one process',
+    license='Apache License 2.0',
+    tests_require=['pytest'],
+    entry_points={
+        'console_scripts': [
+            'container = python_container.container:main',
+            'latency_ping = python_container.latency_probe:ping_main',
+            'latency_pong = python_container.latency_probe:pong_main',
+        ],
+    },
+)
@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class ConstantVelocityTracker:
+    """Follows detections over time with one constant velocity Kalman filter per object.
+
+    The state of a track is [x, y, z, vx, vy, vz]. All tracks live in stacked numpy arrays,
+    so predicting and correcting every track is a couple of batched matrix operations.
+    Detections are matched to the closest predicted track within `max_distance`, a track
+    that is not seen for more than `max_misses` frames is dropped.
+    """
+
+    def __init__(self, max_distance=0.5, max_misses=5, min_hits=2, process_noise=1.0, measurement_noise=0.05, switch_margin=0.2):
+        self.max_distance = max_distance
+        self.max_misses = max_misses
+        self.min_hits = min_hits
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        # A new target has to be this much closer before we switch away from the current one
+        self.switch_margin = switch_margin
+
+        self.x = np.zeros((0, 6))
+        self.P = np.zeros((0, 6, 6))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.next_id = 0
+        self.target_id = -1
+
+    def predict(self, dt):
+        if dt <= 0.0 or len(self.ids) == 0:
+            return
+        F = np.eye(6)
+        F[:3, 3:] = dt * np.eye(3)
+        # Piecewise constant acceleration noise
+        q = self.process_noise
+        Q = np.zeros((6, 6))
+        Q[:3, :3] = np.eye(3) * q * dt**4 / 4
+        Q[:3, 3:] = np.eye(3) * q * dt**3 / 2
+        Q[3:, :3] = Q[:3, 3:]
+        Q[3:, 3:] = np.eye(3) * q * dt**2
+        self.x = self.x @ F.T
+        self.P = F @ self.P @ F.T + Q
+
+    def associate(self, positions):
+        # Greedy nearest neighbour matching, returns (track indices, detection indices)
+        if len(self.ids) == 0 or len(positions) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        distances = np.linalg.norm(self.x[:, None, :3] - positions[None, :, :], axis=2)
+        tracks, detections = [], []
+        used_tracks, used_detections = set(), set()
+        for flat in np.argsort(distances, axis=None):
+            t, d = divmod(int(flat), distances.shape[1])
+            if distances[t, d] > self.max_distance:
+                break
+            if t in used_tracks or d in used_detections:
+                continue
+            used_tracks.add(t)
+            used_detections.add(d)
+            tracks.append(t)
+            detections.append(d)
+        return np.array(tracks, dtype=np.int64), np.array(detections, dtype=np.int64)
+
+    def correct(self, tracks, positions):
+        if len(tracks) == 0:
+            return
+        P = self.P[tracks]
+        # H = [I 0], so H P is the top three rows of P and S = H P H^T + R
+        S = P[:, :3, :3] + np.eye(3) * self.measurement_noise
+        K = np.linalg.solve(S, P[:, :3, :]).transpose(0, 2, 1)
+        y = positions - self.x[tracks, :3]
+        self.x[tracks] += (K @ y[:, :, None])[:, :, 0]
+        self.P[tracks] = P - K @ P[:, :3, :]
+
+    def spawn(self, positions):
+        count = len(positions)
+        if count == 0:
+            return
+        x = np.zeros((count, 6))
+        x[:, :3] = positions
+        P = np.tile(np.diag([self.measurement_noise] * 3 + [1.0] * 3), (count, 1, 1))
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, P])
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + count)])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int64)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=np.int64)])
+        self.next_id += count
+
+    def update(self, positions, dt):
+        """Runs one camera frame, positions is an (M, 3) array. Returns the target index or -1."""
+        self.predict(dt)
+        tracks, detections = self.associate(positions)
+        self.correct(tracks, positions[detections])
+
+        seen = np.zeros(len(self.ids), dtype=bool)
+        seen[tracks] = True
+        self.hits[seen] += 1
+        self.misses[seen] = 0
+        self.misses[~seen] += 1
+
+        unmatched = np.ones(len(positions), dtype=bool)
+        unmatched[detections] = False
+        self.spawn(positions[unmatched])
+
+        keep = self.misses <= self.max_misses
+        if not keep.all():
+            self.x, self.P = self.x[keep], self.P[keep]
+            self.ids, self.hits, self.misses = self.ids[keep], self.hits[keep], self.misses[keep]
+        return self.select_target()
+
+    def select_target(self):
+        # Closest confirmed track to the camera, sticking with the current one unless another is clearly closer
+        confirmed = np.flatnonzero(self.hits >= self.min_hits)
+        if len(confirmed) == 0:
+            self.target_id = -1
+            return -1
+        ranges = np.linalg.norm(self.x[confirmed, :3], axis=1)
+        best = confirmed[np.argmin(ranges)]
+        current = np.flatnonzero(self.ids[confirmed] == self.target_id)
+        if len(current) > 0 and ranges[current[0]] <= ranges.min() + self.switch_margin:
+            best = confirmed[current[0]]
+        self.target_id = int(self.ids[best])
+        return int(best)
@@ -1,37 +1,72 @@
+import numpy as np
 import rclpy
 from rclpy.node import Node
-from std_msgs.msg import String
+from rclpy.time import Time
+from geometry_msgs.msg import Pose, PoseArray
 from zed_interfaces.msg import ObjectsStamped
+from edna_interfaces.msg import ObjectTarget
+from zed_object_hardware_interface.tracker import ConstantVelocityTracker
 
 class ZedConversion(Node):
     def __init__(self):
         super().__init__('zed_conversion')
+        self.declare_parameter('max_distance', 0.5)
+        self.declare_parameter('max_misses', 5)
+        self.declare_parameter('min_hits', 2)
+        self.declare_parameter('process_noise', 1.0)
+        self.declare_parameter('measurement_noise', 0.05)
+
+        self.tracker = ConstantVelocityTracker(
+            max_distance=self.get_parameter('max_distance').value,
+            max_misses=self.get_parameter('max_misses').value,
+            min_hits=self.get_parameter('min_hits').value,
+            process_noise=self.get_parameter('process_noise').value,
+            measurement_noise=self.get_parameter('measurement_noise').value)
+        self.last_stamp = None
+
         self.zed_objects_subscriber = self.create_subscription(ObjectsStamped, '/real/zed/obj_det/objects', self.zed_objects_callback, 10)
-        self.pose_publisher = self.create_publisher(String, '/real/obj_det_pose', 10)
+        # Every detection of the frame, and the tracked target picked from them
+        self.poses_publisher = self.create_publisher(PoseArray, '/real/obj_det_poses', 10)
+        self.pose_publisher = self.create_publisher(ObjectTarget, '/real/obj_det_pose', 10)
         
         self.OKGREEN = '\033[92m'
         self.ENDC = '\033[0m'
         
-        self.pose = String()
+        self.poses = PoseArray()
+        self.target = ObjectTarget()
         
         self.get_logger().info(self.OKGREEN + "Configured and Activated Zed Conversion" + self.ENDC)
         
     def zed_objects_callback(self, objects: ObjectsStamped):
-        if objects == None:
-            self.get_logger().warn("Objects message recieved was null")
+        stamp = Time.from_msg(objects.header.stamp).nanoseconds
+        dt = 0.0 if self.last_stamp is None else (stamp - self.last_stamp) / 1e9
+        self.last_stamp = stamp
+
+        positions = np.array([obj.position for obj in objects.objects], dtype=np.float64).reshape(-1, 3)
+        if len(positions) == 0:
+            self.get_logger().warn("NO OBJECTS DETECTED", throttle_duration_sec=1.0)
+
+        self.poses.header = objects.header
+        self.poses.poses = [self.to_pose(position) for position in positions]
+        self.poses_publisher.publish(self.poses)
+
+        index = self.tracker.update(positions, dt)
+        self.target.header = objects.header
+        self.target.valid = index >= 0
+        self.target.id = self.tracker.target_id
+        if index >= 0:
+            x, y, z, vx, vy, vz = self.tracker.x[index].tolist()
         else:
-            if len(objects.objects) <= 0:
-                self.get_logger().warn("NO OBJECTS DETECTED")
-                empty = String()
-                empty.data = "0.0|0.0|0.0"
-                self.pose_publisher.publish(empty)
-            else:
-                x = objects.objects[0].position[0]
-                y = objects.objects[0].position[1]
-                z = objects.objects[0].position[2]
-                self.pose.data = f"{float(x)}|{float(y)}|{float(z)}"
-                print(self.pose)
-                self.pose_publisher.publish(self.pose)
+            x, y, z, vx, vy, vz = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        self.target.position.x, self.target.position.y, self.target.position.z = x, y, z
+        self.target.velocity.x, self.target.velocity.y, self.target.velocity.z = vx, vy, vz
+        self.pose_publisher.publish(self.target)
+
+    def to_pose(self, position):
+        pose = Pose()
+        pose.position.x, pose.position.y, pose.position.z = position.tolist()
+        pose.orientation.w = 1.0
+        return pose
             
 def main(args=None):
     rclpy.init(args=args)
@@ -43,4 +78,4 @@ def main(args=None):
     rclpy.shutdown()
     
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()